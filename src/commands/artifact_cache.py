@@ -0,0 +1,77 @@
+"""Artifact cache of project builds configured by project settings."""
+
+from __future__ import annotations
+
+import os
+import shutil
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.background import run_in_background
+    from Automatons.src.commands.update_src import get_project_settings
+    from Automatons.src.lib.artifact_cache import ArtifactCache
+    from Automatons.src.lib.gen_template import BuildTemplate
+except ImportError:
+    from src.commands.background import run_in_background
+    from src.commands.update_src import get_project_settings
+    from src.lib.artifact_cache import ArtifactCache
+    from src.lib.gen_template import BuildTemplate
+
+
+def create_artifact_cache(window: sublime.Window) -> ArtifactCache | None:
+    """
+    Create artifact cache from "artifact_cache" setting, None if the cache is disabled.
+
+    The setting is true or a dict with "dir" (~/.automatons/artifact_cache by default, shared by projects),
+    "max_size_mb" and "artifacts" (globs relative to the build dir).
+    """
+    settings = get_project_settings(window).get("artifact_cache", False)
+    if not settings:
+        return None
+    if not isinstance(settings, dict):
+        settings = {}
+
+    return ArtifactCache(
+        os.path.expanduser(settings.get("dir", os.path.join("~", ".automatons", "artifact_cache"))),
+        max_size=int(settings.get("max_size_mb", 4096)) << 20,
+        artifacts=settings.get("artifacts", ArtifactCache.ARTIFACTS),
+    )
+
+
+def get_build_key(cache: ArtifactCache, settings: dict, path2prj: str, path2script: str) -> str:
+    """Get key of the project build. Settings: "part" (part of generated scripts by default) and "vivado"."""
+    part = settings.get("part", BuildTemplate().part)
+    tool_version = cache.tool_version(settings.get("vivado", "vivado"))
+
+    return cache.project_key(path2prj, path2script, part, tool_version)
+
+
+class ClearArtifactCacheCommand(sublime_plugin.WindowCommand):
+    """Command to remove all entries of the artifact cache."""
+
+    def run(self) -> None:
+        """Command body."""
+        cache = create_artifact_cache(self.window)
+        if cache is None:
+            sublime.message_dialog("Artifact cache is disabled in project settings")
+            return
+
+        if not sublime.ok_cancel_dialog("Remove all entries of artifact cache " + cache.dir_cache + "?"):
+            return
+
+        def done(_: None) -> None:
+            msg = "Artifact cache is cleared: " + cache.dir_cache
+            logger.info(msg)
+            self.window.status_message(msg)
+
+        run_in_background(
+            self.window, "Clearing artifact cache", lambda _: shutil.rmtree(cache.dir_cache, ignore_errors=True), done,
+        )
@@ -0,0 +1,114 @@
+"""Background execution of commands: shared pool of workers, progress in the status bar and cancellation."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.lib.task_pool import Task, TaskCancelledError, TaskPool
+except ImportError:
+    from src.lib.task_pool import Task, TaskCancelledError, TaskPool
+
+STATUS_KEY = "automatons_tasks"
+SPINNER = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+INTERVAL = 100
+
+# callbacks of tasks run in the UI thread
+_pool = TaskPool(workers=4, dispatch=sublime.set_timeout)
+
+# window id -> view showing progress of tasks of the window
+_progress: dict[int, sublime.View | None] = {}
+
+
+def run_in_background(
+    window: sublime.Window,
+    name: str,
+    func: Callable[[Task], Any],
+    on_done: Callable[[Any], None] | None = None,
+    on_error: Callable[[BaseException], None] | None = None,
+) -> Task:
+    """
+    Run func(task) by the pool of workers, then on_done(result) in the UI thread.
+
+    The task is shown in the status bar until it is finished and is cancelled by "Automaton: Cancel Background
+    Tasks" (func stops at its next task.check() or task.advance()). Errors go to on_error in the UI thread, by
+    default they are shown in a dialog.
+    """
+
+    def report(err: BaseException) -> None:
+        if isinstance(err, TaskCancelledError):
+            window.status_message(name + " is cancelled")
+        elif on_error is not None:
+            on_error(err)
+        else:
+            sublime.message_dialog(name + " is failed: " + str(err))
+
+    task = _pool.submit(name, func, on_done, report, key=window.id())
+
+    if window.id() not in _progress:
+        _progress[window.id()] = None
+        _show_progress(window, 0)
+
+    return task
+
+
+def cancel_background_tasks(window: sublime.Window | None = None) -> list[Task]:
+    """Cancel tasks of the window (of all windows if not given). Return them."""
+    return _pool.cancel(None if window is None else window.id())
+
+
+def stop_background_tasks() -> None:
+    """Cancel all tasks and stop workers."""
+    _pool.shutdown()
+
+
+def _show_progress(window: sublime.Window, tick: int) -> None:
+    """Show progress of tasks of the window in the status bar of the active view until they are finished."""
+    view = window.active_view()
+    shown = _progress.get(window.id())
+    if shown is not None and shown != view:
+        shown.erase_status(STATUS_KEY)
+
+    tasks = _pool.tasks(window.id())
+    if not tasks or not window.is_valid():
+        if view is not None:
+            view.erase_status(STATUS_KEY)
+        _progress.pop(window.id(), None)
+        return
+
+    _progress[window.id()] = view
+    if view is not None:
+        running = [task for task in tasks if task.state == Task.RUNNING] or tasks[:1]
+        text = SPINNER[tick % len(SPINNER)] + " " + ", ".join(
+            (task.name + " " + task.progress).rstrip() for task in running
+        )
+        if len(tasks) > len(running):
+            text += " (+" + str(len(tasks) - len(running)) + " queued)"
+        view.set_status(STATUS_KEY, text)
+
+    sublime.set_timeout(lambda: _show_progress(window, tick + 1), INTERVAL)
+
+
+class CancelBackgroundTasksCommand(sublime_plugin.WindowCommand):
+    """Command to cancel background tasks of the window."""
+
+    def run(self) -> None:
+        """Command body."""
+        tasks = cancel_background_tasks(self.window)
+
+        msg = "Background tasks cancelled: " + str(len(tasks))
+        logger.info(msg)
+        self.window.status_message(msg)
+
+    def is_enabled(self) -> bool:
+        """There are tasks to cancel."""
+        return bool(_pool.tasks(self.window.id()))
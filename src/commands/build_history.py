@@ -0,0 +1,85 @@
+"""Command to show per-phase regressions of the last build."""
+
+from __future__ import annotations
+
+import os
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.update_src import get_project_settings
+    from Automatons.src.lib.build_history import BuildHistory, compare_builds
+except ImportError:
+    from src.commands.update_src import get_project_settings
+    from src.lib.build_history import BuildHistory, compare_builds
+
+PANEL_NAME = "automatons_build_history"
+
+
+def format_seconds(seconds: float) -> str:
+    """Format seconds as `h:mm:ss`."""
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return str(hours) + ":" + str(minutes).zfill(2) + ":" + str(seconds).zfill(2)
+
+
+class ShowBuildRegressionsCommand(sublime_plugin.WindowCommand):
+    """
+    Command to compare the last build with the median of previous successful builds by phases.
+
+    Settings: "history_window" (count of previous builds, 5), "regression_threshold" (relative slowdown, 0.2) and
+    "regression_min_seconds" (absolute slowdown, 60).
+    """
+
+    def __init__(self, window: sublime.Window) -> None:
+        """Init."""
+        super().__init__(window)
+
+        self.dir_script = "script"
+
+    def run(self) -> None:
+        """Command body."""
+        path2prj = self.window.project_file_name()
+        if path2prj is None:
+            sublime.message_dialog("Project file is not found. Please check that the project is open")
+            return
+        path2prj = os.path.dirname(path2prj)
+
+        settings = get_project_settings(self.window)
+        window = settings.get("history_window", 5)
+
+        history = BuildHistory(os.path.join(path2prj, self.dir_script, BuildHistory.FILE_NAME))
+        records = history.load(last=window * 4 + 1)
+        if not records:
+            sublime.message_dialog("Build history is empty: builds are recorded by Python Runner")
+            return
+
+        rows = compare_builds(
+            records,
+            window=window,
+            threshold=settings.get("regression_threshold", 0.2),
+            min_seconds=settings.get("regression_min_seconds", 60),
+        )
+
+        last = records[-1]
+        txt = "Last build: " + last["time"] + " " + (last.get("commit") or "-") + " " + last["script"]
+        txt += ", code " + str(last["returncode"]) + ", jobs " + str(last.get("jobs")) + ", total "
+        txt += format_seconds(last["elapsed"]) + "\n\n"
+
+        txt += f"{'phase':<18}{'baseline':>12}{'last':>12}{'change':>10}{'peak MB':>12}\n"
+        for phase, baseline, elapsed, regression in rows:
+            change = f"{elapsed / baseline - 1:+.0%}" if baseline else "-"
+            txt += "{:<18}{:>12}{:>12}{:>10}{:>12.0f}".format(
+                phase, format_seconds(baseline) if baseline else "-", format_seconds(elapsed), change,
+                last["phases"][phase]["peak_mb"],
+            )
+            txt += "  <-- regression\n" if regression else "\n"
+
+        regressions = [row[0] for row in rows if row[3]]
+        txt += "\nRegressions: " + (", ".join(regressions) if regressions else "none") + "\n"
+
+        panel = self.window.create_output_panel(PANEL_NAME)
+        panel.run_command("append", {"characters": txt})
+        self.window.run_command("show_panel", {"panel": "output." + PANEL_NAME})
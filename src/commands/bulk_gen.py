@@ -0,0 +1,96 @@
+"""Command to generate modules and testbenches from a spec file."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.background import run_in_background
+    from Automatons.src.commands.update_src import create_updater, get_project_settings
+    from Automatons.src.lib.bulk_gen import BulkGenerator, load_spec
+except ImportError:
+    from src.commands.background import run_in_background
+    from src.commands.update_src import create_updater, get_project_settings
+    from src.lib.bulk_gen import BulkGenerator, load_spec
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.task_pool import Task
+    except ImportError:
+        from src.lib.task_pool import Task
+
+
+class GenerateFromSpecCommand(sublime_plugin.WindowCommand):
+    """
+    Command to generate sources and testbenches of modules listed in a JSON or CSV spec.
+
+    The spec of the active view is used if path is not given. Files are generated in background, new sources are
+    registered in the source list by one update of get_list_sources.tcl. Settings: "src_ext" (".v") and
+    "generate_tb" (true).
+    """
+
+    def __init__(self, window: sublime.Window) -> None:
+        """Init."""
+        super().__init__(window)
+
+        self.dir_script = "script"
+        self.dir_src = "src"
+        self.dir_tb = "tb"
+
+    def run(self, path: str = "", *, overwrite: bool = False) -> None:
+        """Command body."""
+        path2prj = self.window.project_file_name()
+        if path2prj is None:
+            sublime.message_dialog("Project file is not found. Please check that the project is open")
+            return
+        path2prj = os.path.dirname(path2prj)
+
+        view = self.window.active_view()
+        if not path and view is not None:
+            path = view.file_name() or ""
+        if not path.lower().endswith((".json", ".csv")):
+            sublime.message_dialog("Spec is not found: open a JSON or CSV spec of modules")
+            return
+
+        try:
+            modules = load_spec(path)
+        except (OSError, ValueError, KeyError) as err:
+            sublime.message_dialog("Wrong spec " + path + ": " + str(err))
+            return
+
+        settings = get_project_settings(self.window)
+        generator = BulkGenerator(
+            path2prj,
+            dir_src=self.dir_src,
+            dir_tb=self.dir_tb,
+            ext=settings.get("src_ext", ".v"),
+            tb=settings.get("generate_tb", True),
+            overwrite=overwrite,
+        )
+        updater = create_updater(self.window, path2prj, dir_src=self.dir_src, dir_script=self.dir_script)
+
+        def generate(_: Task) -> tuple[list[str], list[str]]:
+            sources, written = generator.generate(modules)
+            updater.register(sources)
+
+            return sources, written
+
+        def done(result: tuple[list[str], list[str]]) -> None:
+            sources, written = result
+
+            msg = "Modules: " + str(len(modules)) + ", files written: " + str(len(written))
+            msg += ", sources registered: " + str(len(sources))
+            logger.info(msg)
+            self.window.status_message(msg)
+
+        run_in_background(self.window, "Generating " + str(len(modules)) + " modules", generate, done)
@@ -1,6 +1,7 @@
 """Command to create a sample project."""
 
 import os
+import stat
 import subprocess
 
 try:
@@ -13,6 +14,7 @@ import sublime
 import sublime_plugin
 
 try:
+    from Automatons.src.commands.background import run_in_background
     from Automatons.src.lib.gen_template import (
         BuildTemplate,
         ChangelogTemplate,
@@ -22,7 +24,9 @@ try:
         TbTemplate,
     )
     from Automatons.src.lib.manager_src import SrcListGenerator
+    from Automatons.src.lib.task_pool import Task
 except ImportError:
+    from src.commands.background import run_in_background
     from src.lib.gen_template import (
         BuildTemplate,
         ChangelogTemplate,
@@ -32,10 +36,11 @@ except ImportError:
         TbTemplate,
     )
     from src.lib.manager_src import SrcListGenerator
+    from src.lib.task_pool import Task
 
 
 class CreateStructProjectCommand(sublime_plugin.WindowCommand):
-    """Command to generate the structure of hdl-project."""
+    """Command to generate the structure of hdl-project. Files are written and git is initialized in background."""
 
     def __init__(self, window: sublime.Window) -> None:
         """Init."""
@@ -66,12 +71,23 @@ class CreateStructProjectCommand(sublime_plugin.WindowCommand):
                 sublime.message_dialog("Project is not empty")
                 return
 
-        self.create_folder_structure(self.path2prj)
         self.add_folder_to_prj(self.path2prj)
-        self.add_files(self.path2prj)
 
+        run_in_background(self.window, "Creating project", self.create, self.done)
+
+    def create(self, task: Task) -> None:
+        """Create folders and files, then initialize git (worker)."""
+        task.advance(0, total=3)
+        self.create_folder_structure(self.path2prj)
+        task.advance()
+        self.add_files(self.path2prj)
+        task.advance()
         self.init_git_repository()
 
+    def done(self, _: None) -> None:
+        """Report the created project."""
+        self.window.status_message("Project is created: " + self.path2prj)
+
     def create_folder_structure(self, path: str) -> None:
         """Form folders structure."""
         os.makedirs(os.path.join(path, self.dir_doc), exist_ok=True)
@@ -126,6 +142,30 @@ class CreateStructProjectCommand(sublime_plugin.WindowCommand):
         with open(os.path.join(path, self.dir_script, "build_run.bat"), "w") as f:
             f.write(build_script.insert(file_type=build_script.BAT))
 
+        for name, file_type in (("build_run.sh", build_script.SH), ("build_incr_run.sh", build_script.SH_INCR)):
+            path2sh = os.path.join(path, self.dir_script, name)
+            with open(path2sh, "w", newline="\n") as f:
+                f.write(build_script.insert(file_type=file_type))
+            os.chmod(path2sh, os.stat(path2sh).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+        with open(os.path.join(path, self.dir_script, "build_incr.tcl"), "w") as f:
+            f.write(build_script.insert(file_type=build_script.TCL_INCR))
+
+        with open(os.path.join(path, self.dir_script, "build_incr_run.bat"), "w") as f:
+            f.write(build_script.insert(file_type=build_script.BAT_INCR))
+
+        with open(os.path.join(path, self.dir_script, "build_ooc.tcl"), "w") as f:
+            f.write(build_script.insert(file_type=build_script.TCL_OOC))
+
+        with open(os.path.join(path, self.dir_script, "build_ooc_run.bat"), "w") as f:
+            f.write(build_script.insert(file_type=build_script.BAT_OOC))
+
+        with open(os.path.join(path, self.dir_script, "sweep_synth.tcl"), "w") as f:
+            f.write(build_script.insert(file_type=build_script.TCL_SWEEP_SYNTH))
+
+        with open(os.path.join(path, self.dir_script, "sweep_impl.tcl"), "w") as f:
+            f.write(build_script.insert(file_type=build_script.TCL_SWEEP_IMPL))
+
         with open(os.path.join(path, self.dir_script, "get_list_sources.tcl"), "w") as f:
             src_list_script = SrcListGenerator()
             src_list_script.add_auto_src(os.path.join(path, self.dir_src, "main.v"))
@@ -1,7 +1,9 @@
 """Command to delete project. Mainly for debugging."""
 
+from __future__ import annotations
+
 import os
-import shutil
+from typing import TYPE_CHECKING
 
 try:
     from loguru import logger
@@ -12,9 +14,29 @@ except ImportError:
 import sublime
 import sublime_plugin
 
+try:
+    from Automatons.src.commands.background import run_in_background
+    from Automatons.src.lib.project_trash import ProjectTrash
+except ImportError:
+    from src.commands.background import run_in_background
+    from src.lib.project_trash import ProjectTrash
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.task_pool import Task
+    except ImportError:
+        from src.lib.task_pool import Task
+
+PANEL_NAME = "automatons_delete"
+
 
 class DeleteStructProjectCommand(sublime_plugin.WindowCommand):
-    """Command to delete the project files. Only for debug."""
+    """
+    Command to delete the project files. Only for debug.
+
+    Entries are moved to a trash dir of the project at once, then the trash is deleted in background by parallel
+    workers. dry_run only lists entries to delete.
+    """
 
     def __init__(self, window: sublime.Window) -> None:
         """Init."""
@@ -25,7 +47,7 @@ class DeleteStructProjectCommand(sublime_plugin.WindowCommand):
 
         self.exclude = (self.__SUBLIME_PROJECT_EXT__, self.__SUBLIME_WORKSPACE_EXT__)
 
-    def run(self) -> None:
+    def run(self, *, dry_run: bool = False) -> None:
         """Delete all files in the specified directory except those with .sublime-* extensions."""
         path2prj = self.window.project_file_name()
 
@@ -34,10 +56,45 @@ class DeleteStructProjectCommand(sublime_plugin.WindowCommand):
             return
         path2prj = os.path.dirname(path2prj)
 
-        for filename in os.listdir(path2prj):
-            file_path = os.path.join(path2prj, filename)
+        trash = ProjectTrash(path2prj, self.exclude)
+        doomed = trash.doomed()
+
+        if dry_run:
+            self.show_doomed(path2prj, doomed, trash.trashes())
+            return
+
+        try:
+            _, failed = trash.move(doomed)
+        except OSError as err:
+            sublime.message_dialog("Can't create trash dir in " + path2prj + ": " + str(err))
+            return
+        if failed:
+            sublime.message_dialog("Entries are not deleted (opened by another process?):\n" + "\n".join(failed))
+
+        def purge(task: Task) -> int:
+            return trash.purge(lambda count, total: task.advance(count - task.done, total))
+
+        def done(_: int) -> None:
+            msg = "Project is deleted: " + path2prj + ", entries: " + str(len(doomed) - len(failed))
+            logger.info(msg)
+            self.window.status_message(msg)
+
+        run_in_background(self.window, "Deleting project", purge, done)
+
+    def show_doomed(self, path2prj: str, doomed: list[str], trashes: list[str]) -> None:
+        """Show entries to delete in the panel."""
+        txt = "Project: " + path2prj + "\nTo be deleted:\n"
+        for name in doomed:
+            path = os.path.join(path2prj, name)
+            txt += "    " + name + ("/" if os.path.isdir(path) and not os.path.islink(path) else "") + "\n"
+        for path in trashes:
+            txt += "    " + os.path.basename(path) + "/ (trash of interrupted deletion)\n"
+
+        kept = sorted(set(os.listdir(path2prj)) - set(doomed) - {os.path.basename(path) for path in trashes})
+        txt += "Kept: " + (", ".join(kept) or "nothing") + "\n"
 
-            if os.path.isfile(file_path) and not filename.endswith(self.exclude):
-                os.remove(file_path)
-            elif os.path.isdir(file_path):
-                shutil.rmtree(file_path)
+        panel = self.window.create_output_panel(PANEL_NAME)
+        # the panel is read-only since the previous dry run
+        panel.run_command("append", {"characters": txt, "force": True})
+        panel.set_read_only(True)
+        self.window.run_command("show_panel", {"panel": "output." + PANEL_NAME})
@@ -0,0 +1,49 @@
+"""Commands based on the dependency index of the project."""
+
+from __future__ import annotations
+
+import os
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.update_src import get_include_dirs
+    from Automatons.src.lib.dep_index import DependencyIndex
+except ImportError:
+    from src.commands.update_src import get_include_dirs
+    from src.lib.dep_index import DependencyIndex
+
+
+class ShowAffectedSourcesCommand(sublime_plugin.WindowCommand):
+    """Command to show files affected by the change of the current file (includes and package imports)."""
+
+    def __init__(self, window: sublime.Window) -> None:
+        """Init."""
+        super().__init__(window)
+
+        self.dir_script = "script"
+
+    def run(self) -> None:
+        """Command body."""
+        path2prj = self.window.project_file_name()
+        view = self.window.active_view()
+
+        if path2prj is None or view is None or view.file_name() is None:
+            sublime.message_dialog("Project or file is not found. Please check that the project and file are open")
+            return
+        path2prj = os.path.dirname(path2prj)
+
+        index = DependencyIndex(os.path.join(path2prj, path) for path in get_include_dirs(self.window) or [])
+        if not index.load(os.path.join(path2prj, self.dir_script, DependencyIndex.FILE_NAME)):
+            sublime.message_dialog('Dependency index is not found. Enable "dep_index" setting and update sources')
+            return
+
+        affected = index.affected([view.file_name()])
+        items = [os.path.relpath(path, path2prj) for path in affected]
+
+        def on_done(item: int) -> None:
+            if item >= 0:
+                self.window.open_file(affected[item])
+
+        self.window.show_quick_panel(items, on_done)
@@ -0,0 +1,87 @@
+"""Command to run parallel sweep of implementation strategies."""
+
+from __future__ import annotations
+
+import os
+import threading
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.update_src import get_project_settings
+    from Automatons.src.lib.impl_sweep import ImplSweep, SweepRun
+except ImportError:
+    from src.commands.update_src import get_project_settings
+    from src.lib.impl_sweep import ImplSweep, SweepRun
+
+# window id -> running sweep
+_sweeps: dict[int, ImplSweep] = {}
+
+
+def create_sweep(window: sublime.Window, path2prj: str) -> ImplSweep:
+    """Create sweep configured by "impl_sweep" section of project settings."""
+    settings = get_project_settings(window).get("impl_sweep", {})
+    runs = settings.get("runs")
+
+    return ImplSweep(
+        path2prj,
+        runs=[SweepRun.from_dict(run) for run in runs] if runs else None,
+        vivado=settings.get("vivado", "vivado"),
+        cpus_per_run=settings.get("cpus_per_run", 2),
+        mem_budget=settings.get("mem_budget"),
+        mem_per_run=settings.get("mem_per_run", 4096),
+    )
+
+
+class RunImplSweepCommand(sublime_plugin.WindowCommand):
+    """Command to run implementation sweep in background or cancel the running one."""
+
+    def run(self, *, cancel: bool = False, synth: bool = True) -> None:
+        """Command body."""
+        sweep = _sweeps.get(self.window.id())
+
+        if cancel:
+            if sweep is not None:
+                sweep.cancel()
+                self.window.status_message("Implementation sweep is cancelled")
+            return
+
+        if sweep is not None:
+            sublime.message_dialog("Implementation sweep is already running")
+            return
+
+        path2prj = self.window.project_file_name()
+        if path2prj is None:
+            sublime.message_dialog("Project file is not found. Please check that the project is open")
+            return
+
+        sweep = create_sweep(self.window, os.path.dirname(path2prj))
+        _sweeps[self.window.id()] = sweep
+
+        msg = "Implementation sweep: " + str(len(sweep.runs)) + " runs, " + str(sweep.parallel()) + " in parallel"
+        self.window.status_message(msg)
+
+        threading.Thread(target=self._sweep, args=(sweep,), kwargs={"synth": synth}, daemon=True).start()
+
+    def _sweep(self, sweep: ImplSweep, *, synth: bool) -> None:
+        """Run sweep and report the best run."""
+        try:
+            best = sweep.run(synth=synth)
+        finally:
+            _sweeps.pop(self.window.id(), None)
+
+        if best is None:
+            msg = "Implementation sweep: no successful run"
+        else:
+            msg = "Implementation sweep: best run " + best.name + ", WNS " + str(best.timing.wns) + ", TNS "
+            msg += str(best.timing.tns) + ", bitstream " + os.path.join(sweep.path2sweep, "best.bit")
+        logger.info(msg)
+
+        sublime.set_timeout(lambda: self.window.status_message(msg))
@@ -0,0 +1,93 @@
+"""Trend of timing and utilization of project builds."""
+
+from __future__ import annotations
+
+import os
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.update_src import get_project_settings
+    from Automatons.src.lib.build_history import BuildHistory
+    from Automatons.src.lib.report_trend import ReportTrend
+except ImportError:
+    from src.commands.update_src import get_project_settings
+    from src.lib.build_history import BuildHistory
+    from src.lib.report_trend import ReportTrend
+
+PANEL_NAME = "automatons_report_trend"
+
+
+def record_reports(path2prj: str, path2build: str, script: str, since: float, dir_script: str = "script") -> None:
+    """Parse reports of the finished build into the report trend of the project (build thread)."""
+    record = ReportTrend.collect(path2build, script, BuildHistory.commit(path2prj), since)
+    if record is None:
+        return
+
+    trend = ReportTrend(os.path.join(path2prj, dir_script, ReportTrend.FILE_NAME))
+    try:
+        trend.add(record)
+    finally:
+        trend.close()
+
+    msg = "Build reports are recorded: WNS " + str(record.get("wns")) + ", LUT " + str(record.get("lut"))
+    logger.info(msg)
+
+
+def format_trend(records: list[dict]) -> str:
+    """Form table of records, a change against the previous build is marked."""
+    columns = ("wns", "tns", "tns_failing", "whs", "ths_failing", "lut", "ff", "bram", "dsp")
+    txt = f"{'time':<27}{'commit':<10}" + "".join(f"{column:>12}" for column in columns) + "\n"
+
+    previous: dict = {}
+    for record in records:
+        txt += "{:<27}{:<10}".format(record["time"], record["commit_id"] or "-")
+        for column in columns:
+            value = record[column]
+            text = "-" if value is None else f"{value:g}"
+            if previous.get(column) is not None and value is not None and value != previous[column]:
+                text += "^" if value > previous[column] else "v"
+            txt += f"{text:>12}"
+        txt += "  " + record["script"] + "\n"
+        previous = record
+
+    return txt
+
+
+class ShowReportTrendCommand(sublime_plugin.WindowCommand):
+    """Command to compare timing and utilization of the last builds ("trend_builds" setting, 10 by default)."""
+
+    def __init__(self, window: sublime.Window) -> None:
+        """Init."""
+        super().__init__(window)
+
+        self.dir_script = "script"
+
+    def run(self, script: str | None = None) -> None:
+        """Command body."""
+        path2prj = self.window.project_file_name()
+        if path2prj is None:
+            sublime.message_dialog("Project file is not found. Please check that the project is open")
+            return
+
+        path2db = os.path.join(os.path.dirname(path2prj), self.dir_script, ReportTrend.FILE_NAME)
+        if not os.path.exists(path2db):
+            sublime.message_dialog("Report trend is empty: reports are recorded after builds")
+            return
+
+        trend = ReportTrend(path2db)
+        try:
+            records = trend.last(get_project_settings(self.window).get("trend_builds", 10), script)
+        finally:
+            trend.close()
+
+        panel = self.window.create_output_panel(PANEL_NAME)
+        panel.run_command("append", {"characters": format_trend(records)})
+        self.window.run_command("show_panel", {"panel": "output." + PANEL_NAME})
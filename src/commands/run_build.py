@@ -0,0 +1,210 @@
+"""Cross-platform build of the project driven from python."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+from typing import TYPE_CHECKING
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.artifact_cache import create_artifact_cache, get_build_key
+    from Automatons.src.commands.report_trend import record_reports
+    from Automatons.src.commands.update_src import get_project_settings
+    from Automatons.src.commands.vivado_server import get_output_panel
+    from Automatons.src.lib.build_history import BuildHistory, PhaseRecorder
+    from Automatons.src.lib.build_runner import BuildRunner, PhaseTracker
+except ImportError:
+    from src.commands.artifact_cache import create_artifact_cache, get_build_key
+    from src.commands.report_trend import record_reports
+    from src.commands.update_src import get_project_settings
+    from src.commands.vivado_server import get_output_panel
+    from src.lib.build_history import BuildHistory, PhaseRecorder
+    from src.lib.build_runner import BuildRunner, PhaseTracker
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.artifact_cache import ArtifactCache
+    except ImportError:
+        from src.lib.artifact_cache import ArtifactCache
+
+STATUS_KEY = "automatons_build"
+
+# window id -> running build
+_builds: dict[int, BuildRunner] = {}
+
+
+class PanelWriter:
+    """Appends lines to the panel in batches, so a chatty build doesn't flood the UI thread with callbacks."""
+
+    def __init__(self, panel: sublime.View, interval: int = 50) -> None:
+        """Init. interval is the delay of a batch in ms."""
+        self.panel = panel
+        self.interval = interval
+
+        self._lines: list[str] = []
+        self._lock = threading.Lock()
+
+    def write(self, line: str) -> None:
+        """Queue line (any thread)."""
+        with self._lock:
+            self._lines.append(line)
+            if len(self._lines) == 1:
+                sublime.set_timeout(self._flush, self.interval)
+
+    def _flush(self) -> None:
+        """Append queued lines (UI thread)."""
+        with self._lock:
+            text = "\n".join(self._lines) + "\n"
+            self._lines = []
+
+        self.panel.run_command("append", {"characters": text, "force": True, "scroll_to_end": True})
+
+
+class RunBuildCommand(sublime_plugin.WindowCommand):
+    """
+    Command to build the project by Vivado in batch mode, started and watched from python on any platform.
+
+    Output is streamed to the Vivado panel, the phase of the build is shown in the status bar. The command is a
+    target of the build system: kill cancels the running build. A full build clears the build dir (as
+    build_run.bat), an incremental one keeps checkpoints. Per-phase time and peak memory of finished builds are
+    appended to the build history of the project, timing and utilization reports to the report trend.
+    """
+
+    def __init__(self, window: sublime.Window) -> None:
+        """Init."""
+        super().__init__(window)
+
+        self.dir_script = "script"
+        self.dir_tmp = "build"
+
+    def run(self, script: str = "", *, incremental: bool = False, kill: bool = False, **_: dict) -> None:
+        """Command body."""
+        runner = _builds.get(self.window.id())
+
+        if kill:
+            if runner is not None:
+                runner.cancel()
+                self.window.status_message("Build is cancelled")
+            return
+
+        if runner is not None:
+            sublime.message_dialog("Build is already running")
+            return
+
+        path2prj = self.window.project_file_name()
+        if path2prj is None:
+            sublime.message_dialog("Project file is not found. Please check that the project is open")
+            return
+        path2prj = os.path.dirname(path2prj)
+
+        script = script or ("build_incr.tcl" if incremental else "build.tcl")
+        settings = get_project_settings(self.window)
+        vivado = settings.get("vivado", "vivado")
+
+        writer = PanelWriter(get_output_panel(self.window, clear=True))
+        recorder = PhaseRecorder()
+
+        def output(line: str) -> None:
+            writer.write(line)
+            recorder.feed(line)
+
+        runner = BuildRunner(
+            [shutil.which(vivado) or vivado, "-mode", "batch", "-nolog", "-nojournal", "-notrace", "-source",
+             os.path.join(path2prj, self.dir_script, script)],
+            os.path.join(path2prj, self.dir_tmp),
+            on_output=output,
+            on_phase=self._phase,
+        )
+        _builds[self.window.id()] = runner
+
+        threading.Thread(
+            target=self._build,
+            args=(runner, create_artifact_cache(self.window), settings, path2prj, script, writer, recorder),
+            kwargs={"incremental": incremental},
+            daemon=True,
+        ).start()
+
+    def _build(
+        self,
+        runner: BuildRunner,
+        cache: ArtifactCache | None,
+        settings: dict,
+        path2prj: str,
+        script: str,
+        writer: PanelWriter,
+        recorder: PhaseRecorder,
+        *,
+        incremental: bool,
+    ) -> None:
+        """Prepare the build dir, restore the build from the cache or run it, then report it."""
+        try:
+            if not incremental:
+                shutil.rmtree(runner.cwd, ignore_errors=True)
+            os.makedirs(runner.cwd, exist_ok=True)
+
+            key = get_build_key(cache, settings, path2prj, runner.command[-1]) if cache is not None else None
+            restored = cache.restore(key, runner.cwd) if key is not None else None
+            if restored is not None:
+                msg = "Build is restored from artifact cache: " + str(len(restored)) + " files"
+                writer.write(msg)
+                logger.info(msg)
+                sublime.set_timeout(lambda: self.window.status_message(msg))
+                return
+
+            start = time.time()
+            self._phase(runner.tracker)
+            runner.start()
+            code = runner.wait()
+        finally:
+            _builds.pop(self.window.id(), None)
+
+        # phases of a cancelled build are cut short, they would spoil the baseline of regressions
+        if not runner.cancelled:
+            recorder.feed_runs(runner.cwd)
+            history = BuildHistory(os.path.join(path2prj, self.dir_script, BuildHistory.FILE_NAME))
+            history.append(BuildHistory.record(recorder, script, code, time.time() - start, path2prj))
+
+        counts = runner.tracker.counts
+        if runner.cancelled:
+            msg = "Build is cancelled: " + script
+        elif code == 0:
+            msg = "Build is done: " + script
+            record_reports(path2prj, runner.cwd, script, since=start, dir_script=self.dir_script)
+            if key is not None:
+                cache.store(key, runner.cwd, since=start)
+        else:
+            msg = "Build is failed (code " + str(code) + "): " + script
+        msg += ", errors: " + str(counts["ERROR"]) + ", critical warnings: " + str(counts["CRITICAL WARNING"])
+
+        writer.write(msg)
+        logger.info(msg)
+
+        def report() -> None:
+            view = self.window.active_view()
+            if view is not None:
+                view.erase_status(STATUS_KEY)
+            self.window.status_message(msg)
+
+        sublime.set_timeout(report)
+
+    def _phase(self, tracker: PhaseTracker) -> None:
+        """Show the phase of the build in the status bar."""
+        text = "Vivado: " + tracker.progress
+
+        def show() -> None:
+            view = self.window.active_view()
+            if view is not None:
+                view.set_status(STATUS_KEY, text)
+
+        sublime.set_timeout(show)
@@ -0,0 +1,122 @@
+"""Commands and completions based on the symbol index of the project."""
+
+from __future__ import annotations
+
+import os
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.lib.symbol_index import SymbolIndex
+except ImportError:
+    from src.lib.symbol_index import SymbolIndex
+
+# path to database -> opened index
+_indexes: dict[str, SymbolIndex] = {}
+
+
+def get_symbol_index(window: sublime.Window | None, dir_script: str = "script") -> SymbolIndex | None:
+    """Get symbol index of the project of the window. Return None if there is no project or no index yet."""
+    if window is None or window.project_file_name() is None:
+        return None
+
+    path2db = os.path.join(os.path.dirname(window.project_file_name()), dir_script, SymbolIndex.FILE_NAME)
+    if path2db not in _indexes:
+        if not os.path.exists(path2db):
+            return None
+        _indexes[path2db] = SymbolIndex(path2db)
+
+    return _indexes[path2db]
+
+
+def close_symbol_indexes() -> None:
+    """Close all opened indexes."""
+    for index in _indexes.values():
+        index.close()
+    _indexes.clear()
+
+
+def _snippet_escape(text: str) -> str:
+    """Escape text of snippet field: `$clog2(W)` is not a snippet variable."""
+    return text.replace("\\", "\\\\").replace("$", "\\$").replace("}", "\\}")
+
+
+def instance_snippet(index: SymbolIndex, module: str) -> str:
+    """Form snippet of module instance with its parameters and ports."""
+    field = 1
+    txt = module
+
+    parameters = index.parameters(module)
+    if parameters:
+        lines = []
+        for name, default in parameters:
+            lines.append("    ." + name + "(${" + str(field) + ":" + _snippet_escape(default or name) + "})")
+            field += 1
+        txt += " #(\n" + ",\n".join(lines) + "\n)"
+
+    txt += " ${" + str(field) + ":u_" + module + "} (\n"
+    field += 1
+
+    lines = []
+    for name, _ in index.ports(module):
+        lines.append("    ." + name + "(${" + str(field) + ":" + name + "})")
+        field += 1
+    txt += ",\n".join(lines) + "\n);"
+
+    return txt
+
+
+class GotoHdlModuleCommand(sublime_plugin.WindowCommand):
+    """Command to jump to the declaration of module."""
+
+    def run(self) -> None:
+        """Command body."""
+        index = get_symbol_index(self.window)
+        if index is None:
+            sublime.message_dialog('Symbol index is not found. Enable "symbol_index" setting and update sources')
+            return
+
+        modules = index.modules()
+        items = [sublime.QuickPanelItem(name, annotation=os.path.basename(path)) for name, path, _ in modules]
+
+        def on_done(item: int) -> None:
+            if item < 0:
+                return
+            _, path, line = modules[item]
+            self.window.open_file(path + ":" + str(line), sublime.ENCODED_POSITION)
+
+        self.window.show_quick_panel(items, on_done)
+
+
+class HdlCompletionListener(sublime_plugin.ViewEventListener):
+    """Completions of module instances from the symbol index."""
+
+    LIMIT = 50
+
+    @classmethod
+    def is_applicable(cls, settings: sublime.Settings) -> bool:
+        """Listen Verilog and SystemVerilog views only."""
+        syntax = settings.get("syntax", "")
+        return "Verilog" in syntax
+
+    def on_query_completions(self, prefix: str, locations: list[int]) -> sublime.CompletionList | None:  # noqa: ARG002
+        """Complete module names by prefix with instance snippets."""
+        if not prefix:
+            return None
+
+        index = get_symbol_index(self.view.window())
+        if index is None:
+            return None
+
+        items = [
+            sublime.CompletionItem.snippet_completion(
+                name,
+                instance_snippet(index, name),
+                annotation=os.path.basename(path),
+                kind=sublime.KIND_TYPE,
+            )
+            for name, path, _ in index.modules(prefix, self.LIMIT)
+        ]
+
+        return sublime.CompletionList(items)
@@ -0,0 +1,128 @@
+"""Commands to generate port-aware testbenches of existing modules."""
+
+from __future__ import annotations
+
+import os
+import shutil
+from typing import TYPE_CHECKING
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.background import run_in_background
+    from Automatons.src.commands.update_src import get_discovery, get_project_settings
+    from Automatons.src.lib.bulk_gen import write_batch
+    from Automatons.src.lib.hdl_parser import VerilogHeaderParser
+    from Automatons.src.lib.src_snapshot import DirSnapshot
+    from Automatons.src.lib.tb_gen import TbGenerator, render_tb
+except ImportError:
+    from src.commands.background import run_in_background
+    from src.commands.update_src import get_discovery, get_project_settings
+    from src.lib.bulk_gen import write_batch
+    from src.lib.hdl_parser import VerilogHeaderParser
+    from src.lib.src_snapshot import DirSnapshot
+    from src.lib.tb_gen import TbGenerator, render_tb
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.task_pool import Task
+    except ImportError:
+        from src.lib.task_pool import Task
+
+VERILOG_EXTENSIONS = (".v", ".sv")
+
+
+class GenerateTbCommand(sublime_plugin.WindowCommand):
+    """Command to generate testbench of the module under the cursor (its parameters, ports and UUT are filled)."""
+
+    def __init__(self, window: sublime.Window) -> None:
+        """Init."""
+        super().__init__(window)
+
+        self.dir_src = "src"
+        self.dir_tb = "tb"
+
+    def run(self) -> None:
+        """Command body."""
+        path2prj = self.window.project_file_name()
+        view = self.window.active_view()
+        if path2prj is None or view is None or not view.file_name():
+            sublime.message_dialog("Open a source of the project")
+            return
+        path2prj = os.path.dirname(path2prj)
+
+        modules, _ = VerilogHeaderParser().parse(view.substr(sublime.Region(0, view.size())))
+        if not modules:
+            sublime.message_dialog("Module is not found")
+            return
+
+        row = view.rowcol(view.sel()[0].begin())[0] + 1 if len(view.sel()) else 1
+        above = [module for module in modules if module.line <= row]
+        module = above[-1] if above else modules[0]
+
+        path2src = os.path.join(path2prj, self.dir_src)
+        subdir = os.path.relpath(os.path.dirname(view.file_name()), path2src)
+        if subdir.startswith(os.pardir):
+            subdir = ""
+        ext = os.path.splitext(view.file_name())[1]
+        path2tb = os.path.normpath(os.path.join(path2prj, self.dir_tb, subdir, module.name + "_tb" + ext))
+
+        if not os.path.exists(path2tb):
+            write_batch([(path2tb, render_tb(module))])
+
+            msg = "Testbench is generated: " + path2tb
+            logger.info(msg)
+
+        self.window.open_file(path2tb)
+
+
+class GenerateMissingTbsCommand(sublime_plugin.WindowCommand):
+    """
+    Command to generate testbenches of all modules of the source tree that have none.
+
+    Sources are parsed in background by a pool of processes started by "python" setting (python found in PATH by
+    default) and cached by hash in script/.tb_parse_cache.json, so the next run parses only changed files.
+    """
+
+    def __init__(self, window: sublime.Window) -> None:
+        """Init."""
+        super().__init__(window)
+
+        self.dir_script = "script"
+        self.dir_src = "src"
+        self.dir_tb = "tb"
+
+    def run(self) -> None:
+        """Command body."""
+        path2prj = self.window.project_file_name()
+        if path2prj is None:
+            sublime.message_dialog("Project file is not found. Please check that the project is open")
+            return
+        path2prj = os.path.dirname(path2prj)
+
+        python = get_project_settings(self.window).get("python") or shutil.which("python3") or shutil.which("python")
+        generator = TbGenerator(path2prj, self.dir_src, self.dir_tb, self.dir_script, python=python)
+        snapshot = DirSnapshot(get_discovery(self.window))
+
+        def generate(task: Task) -> tuple[int, list[str]]:
+            snapshot.rescan(generator.path2src)
+            files = [path for path in snapshot.files() if path.lower().endswith(VERILOG_EXTENSIONS)]
+            task.check()
+
+            return len(files), generator.generate(files)
+
+        def done(result: tuple[int, list[str]]) -> None:
+            count, written = result
+
+            msg = "Sources: " + str(count) + ", testbenches generated: " + str(len(written))
+            logger.info(msg)
+            self.window.status_message(msg)
+
+        run_in_background(self.window, "Generating missing testbenches", generate, done)
@@ -1,5 +1,7 @@
 """Command to create a sample project."""
 
+from __future__ import annotations
+
 import os
 
 try:
@@ -12,9 +14,73 @@ import sublime
 import sublime_plugin
 
 try:
-    from Automatons.src.lib.manager_src import SrcListGenerator
+    from Automatons.src.commands.background import run_in_background
+    from Automatons.src.lib.src_discovery import SrcDiscovery
+    from Automatons.src.lib.src_update import SrcUpdater
 except ImportError:
-    from src.lib.manager_src import SrcListGenerator
+    from src.commands.background import run_in_background
+    from src.lib.src_discovery import SrcDiscovery
+    from src.lib.src_update import SrcUpdater
+
+
+def get_project_settings(window: sublime.Window) -> dict:
+    """Get "automatons" section of project settings."""
+    project_data = window.project_data() or {}
+
+    return project_data.get("settings", {}).get("automatons", {})
+
+
+def get_discovery(window: sublime.Window) -> SrcDiscovery:
+    """
+    Create source discovery from project settings.
+
+    Settings: "src_extensions", "src_include" and "src_exclude" (globs relative to src folder).
+    """
+    settings = get_project_settings(window)
+
+    return SrcDiscovery(
+        extensions=settings.get("src_extensions", SrcDiscovery.EXTENSIONS),
+        include=settings.get("src_include", ()),
+        exclude=settings.get("src_exclude", ()),
+    )
+
+
+def get_top(window: sublime.Window, hierarchy_only: bool | None = None) -> str | None:
+    """Get top module for hierarchy-based pruning of sources, None if pruning is disabled."""
+    settings = get_project_settings(window)
+
+    if hierarchy_only is None:
+        hierarchy_only = settings.get("src_hierarchy_only", False)
+
+    return settings.get("source_top", "main") if hierarchy_only else None
+
+
+def get_include_dirs(window: sublime.Window) -> list[str] | None:
+    """Get include dirs for the dependency index, None if the index is disabled."""
+    settings = get_project_settings(window)
+
+    return settings.get("include_dirs", []) if settings.get("dep_index", False) else None
+
+
+def create_updater(
+    window: sublime.Window,
+    path2prj: str,
+    hierarchy_only: bool | None = None,
+    dir_src: str = "src",
+    dir_script: str = "script",
+) -> SrcUpdater:
+    """Create updater of the source list configured by project settings."""
+    return SrcUpdater(
+        path2prj,
+        get_discovery(window),
+        dir_src=dir_src,
+        dir_script=dir_script,
+        top=get_top(window, hierarchy_only),
+        symbols=get_project_settings(window).get("symbol_index", False),
+        include_dirs=get_include_dirs(window),
+        resolved=get_project_settings(window).get("src_resolved", False),
+        ooc_modules=get_project_settings(window).get("ooc_modules", []),
+    )
 
 
 class UpdateSrcCommand(sublime_plugin.WindowCommand):
@@ -29,8 +95,13 @@ class UpdateSrcCommand(sublime_plugin.WindowCommand):
 
         self.path2prj = ""
 
-    def run(self) -> None:
-        """Command body."""
+    def run(self, hierarchy_only: bool | None = None) -> None:
+        """
+        Command body.
+
+        With hierarchy_only only sources reachable from the top module ("source_top" setting, "main" by default)
+        are listed. If not given, "src_hierarchy_only" setting is used.
+        """
         self.path2prj = self.window.project_file_name()
 
         if self.path2prj is None:
@@ -38,14 +109,16 @@ class UpdateSrcCommand(sublime_plugin.WindowCommand):
             return
         self.path2prj = os.path.dirname(self.path2prj)
 
-        path2script = os.path.join(self.path2prj, self.dir_script, "get_list_sources.tcl")
+        updater = create_updater(self.window, self.path2prj, hierarchy_only, self.dir_src, self.dir_script)
+
+        def done(result: tuple[list[str], list[str], bool]) -> None:
+            added, removed, written = result
 
-        src_list_script = SrcListGenerator()
-        src_list_script.read_tcl_script(path2script)
+            msg = "Sources added: " + str(len(added)) + ", removed: " + str(len(removed))
+            logger.info(msg)
+            self.window.status_message(msg)
 
-        for root, _, files in os.walk(os.path.join(self.path2prj, self.dir_src)):
-            for file in files:
-                if file.endswith((".v", ".sv", ".vhd")):
-                    src_list_script.add_auto_src(os.path.join(root, file))
+            if not written:
+                logger.info("Source list is up to date")
 
-        src_list_script.write_tcl_script(path2script)
+        run_in_background(self.window, "Updating sources", lambda _: updater.update(), done)
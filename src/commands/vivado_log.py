@@ -0,0 +1,159 @@
+"""Summary-first viewer of Vivado logs."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.background import run_in_background
+    from Automatons.src.lib.vivado_log import SEVERITIES, LogAnalyzer, read_region
+except ImportError:
+    from src.commands.background import run_in_background
+    from src.lib.vivado_log import SEVERITIES, LogAnalyzer, read_region
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.task_pool import Task
+    except ImportError:
+        from src.lib.task_pool import Task
+
+PANEL_NAME = "automatons_log"
+SYNTAX = "Packages/Automatons/vivado_log.sublime-syntax"
+
+# path to log -> analyzer, a log growing during a build is analyzed incrementally by next calls
+_analyzers: dict[str, LogAnalyzer] = {}
+
+
+def find_logs(window: sublime.Window, dir_tmp: str = "build") -> list[str]:
+    """Find logs of the build dir of the project, the latest first."""
+    path2prj = window.project_file_name()
+    if path2prj is None:
+        return []
+
+    logs = []
+    for root, _, files in os.walk(os.path.join(os.path.dirname(path2prj), dir_tmp)):
+        logs.extend(os.path.join(root, name) for name in files if name.endswith(".log"))
+
+    return sorted(logs, key=lambda path: -os.path.getmtime(path))
+
+
+def format_summary(analyzer: LogAnalyzer, limit: int = 50, limit_issues: int = 1000) -> str:
+    """Form summary of the analyzed log: counts per severity and message ID, list of issues."""
+    txt = analyzer.file_path + " (" + str(analyzer.offset >> 10) + " KB analyzed)\n\n"
+    txt += ", ".join(severity + ": " + str(analyzer.counts[severity]) for severity in SEVERITIES) + "\n\n"
+
+    messages = analyzer.sorted_messages()
+    for message in messages[:limit]:
+        txt += f"{message.count:>8}  {message.severity:<16} [{message.msg_id}] {message.text[:80]}\n"
+    if len(messages) > limit:
+        txt += "... " + str(len(messages) - limit) + " more message IDs\n"
+
+    if analyzer.issues:
+        txt += "\nErrors and critical warnings (double click jumps to the source):\n"
+    for issue in analyzer.issues[:limit_issues]:
+        txt += issue.severity + ": [" + issue.msg_id + "] " + issue.text + "\n"
+
+    return txt
+
+
+class ShowVivadoLogCommand(sublime_plugin.WindowCommand):
+    """
+    Command to show summary of a Vivado log instead of opening the whole log.
+
+    The log is analyzed in background (mapped to memory, single pass), the summary goes to the output panel and
+    errors with critical warnings go to the jump list: a message opens the region of the log around it. Only the
+    region is loaded into a view, so the editor stays responsive with logs of hundreds of MB. A log of the active
+    view or of the build dir is taken if path is not given; a repeated call analyzes only the appended part.
+    """
+
+    def run(self, path: str = "") -> None:
+        """Command body."""
+        if path:
+            self._show(path)
+            return
+
+        view = self.window.active_view()
+        if view is not None and (view.file_name() or "").endswith(".log"):
+            self._show(view.file_name())
+            return
+
+        logs = find_logs(self.window)
+        if not logs:
+            sublime.message_dialog("Logs are not found in the build dir")
+            return
+
+        def on_done(item: int) -> None:
+            if item >= 0:
+                self._show(logs[item])
+
+        self.window.show_quick_panel([sublime.QuickPanelItem(os.path.basename(log), annotation=log) for log in logs],
+                                     on_done)
+
+    def _show(self, path: str) -> None:
+        """Analyze log in background, then show it."""
+        path = os.path.abspath(path)
+        analyzer = _analyzers.setdefault(path, LogAnalyzer(path))
+
+        def analyze(_: Task) -> LogAnalyzer:
+            analyzer.update()
+
+            return analyzer
+
+        run_in_background(self.window, "Analyzing " + os.path.basename(path), analyze, self._summary)
+
+    def _summary(self, analyzer: LogAnalyzer) -> None:
+        """Show summary panel and jump list of issues."""
+        panel = self.window.create_output_panel(PANEL_NAME)
+        panel.settings().set("result_file_regex", r"\[([^\[\]]+):(\d+)\]\s*$")
+        panel.assign_syntax(SYNTAX)
+        # the panel is created again to register the regex of results (as Default/exec.py does)
+        panel = self.window.create_output_panel(PANEL_NAME)
+        # the panel is read-only since the previous summary
+        panel.run_command("append", {"characters": format_summary(analyzer), "force": True})
+        panel.set_read_only(True)
+        self.window.run_command("show_panel", {"panel": "output." + PANEL_NAME})
+
+        issues = list(analyzer.issues)
+        if not issues:
+            return
+
+        items = []
+        for issue in issues:
+            location = issue.location
+            details = os.path.basename(location[0]) + ":" + str(location[1]) if location is not None else ""
+            items.append(sublime.QuickPanelItem(issue.severity + ": [" + issue.msg_id + "] " + issue.text, details))
+
+        def on_done(item: int) -> None:
+            if item >= 0:
+                self.window.run_command("show_vivado_log_region", {"path": analyzer.file_path,
+                                                                   "offset": issues[item].offset})
+
+        self.window.show_quick_panel(items, on_done)
+
+
+class ShowVivadoLogRegionCommand(sublime_plugin.WindowCommand):
+    """Command to load lines of the log around offset into a read-only view."""
+
+    def run(self, path: str, offset: int, before: int = 50, after: int = 200) -> None:
+        """Command body."""
+        try:
+            start, text, position = read_region(path, offset, before, after)
+        except (OSError, ValueError):
+            sublime.message_dialog("Can't read log: " + path)
+            return
+
+        view = self.window.new_file()
+        view.set_name(os.path.basename(path) + " @" + str(start))
+        view.set_scratch(True)
+        view.assign_syntax(SYNTAX)
+        view.run_command("append", {"characters": text})
+        view.set_read_only(True)
+
+        line = view.line(position)
+        view.sel().clear()
+        view.sel().add(line)
+        view.show_at_center(line)
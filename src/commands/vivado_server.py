@@ -0,0 +1,171 @@
+"""Build through a persistent Vivado process of the project."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.artifact_cache import create_artifact_cache, get_build_key
+    from Automatons.src.commands.report_trend import record_reports
+    from Automatons.src.commands.update_src import get_project_settings
+    from Automatons.src.lib.vivado_server import VivadoServer
+except ImportError:
+    from src.commands.artifact_cache import create_artifact_cache, get_build_key
+    from src.commands.report_trend import record_reports
+    from src.commands.update_src import get_project_settings
+    from src.lib.vivado_server import VivadoServer
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.artifact_cache import ArtifactCache
+    except ImportError:
+        from src.lib.artifact_cache import ArtifactCache
+
+PANEL_NAME = "automatons_vivado"
+
+# window id -> server
+_servers: dict[int, VivadoServer] = {}
+
+
+def get_vivado_server(window: sublime.Window, path2build: str) -> VivadoServer:
+    """Get server of the window, create it if there is none. "vivado" setting is the executable."""
+    server = _servers.get(window.id())
+    if server is None:
+        vivado = get_project_settings(window).get("vivado", "vivado")
+        command = [shutil.which(vivado) or vivado, *VivadoServer.COMMAND[1:]]
+
+        server = VivadoServer(command, cwd=path2build)
+        _servers[window.id()] = server
+
+    return server
+
+
+def stop_vivado_servers() -> None:
+    """Stop all servers."""
+    for server in _servers.values():
+        server.stop()
+    _servers.clear()
+
+
+def get_output_panel(window: sublime.Window, *, clear: bool = False) -> sublime.View:
+    """Get output panel of Vivado, show it."""
+    panel = window.find_output_panel(PANEL_NAME) if not clear else None
+    if panel is None:
+        panel = window.create_output_panel(PANEL_NAME)
+        panel.assign_syntax("Packages/Automatons/vivado_log.sublime-syntax")
+        panel.settings().update({"word_wrap": True})
+
+    window.run_command("show_panel", {"panel": "output." + PANEL_NAME})
+
+    return panel
+
+
+class VivadoServerBuildCommand(sublime_plugin.WindowCommand):
+    """
+    Command to run build script in the persistent Vivado process of the project.
+
+    Vivado is started by the first build and kept alive, so next builds don't pay for its startup. The command
+    is also a target of the build system: kill cancels queued builds and kills the process (it is restarted by
+    the next build), stop exits Vivado. With the artifact cache enabled, a build with known inputs restores
+    artifacts instead of running Vivado, a successful build stores them.
+    """
+
+    def __init__(self, window: sublime.Window) -> None:
+        """Init."""
+        super().__init__(window)
+
+        self.dir_script = "script"
+        self.dir_tmp = "build"
+
+    def run(self, script: str = "build_incr.tcl", *, stop: bool = False, kill: bool = False, **_: dict) -> None:
+        """Command body."""
+        if stop or kill:
+            server = _servers.pop(self.window.id(), None) if stop else _servers.get(self.window.id())
+            if server is not None:
+                server.cancel_pending()
+                if stop:
+                    server.stop()
+                    self.window.status_message("Vivado is stopped")
+                else:
+                    server.kill()
+                    self.window.status_message("Vivado build is cancelled")
+            return
+
+        path2prj = self.window.project_file_name()
+        if path2prj is None:
+            sublime.message_dialog("Project file is not found. Please check that the project is open")
+            return
+        path2prj = os.path.dirname(path2prj)
+
+        path2build = os.path.join(path2prj, self.dir_tmp)
+        os.makedirs(path2build, exist_ok=True)
+
+        server = get_vivado_server(self.window, path2build)
+        panel = get_output_panel(self.window, clear=True)
+
+        def output(line: str) -> None:
+            sublime.set_timeout(lambda: panel.run_command("append", {"characters": line + "\n", "scroll_to_end": True}))
+
+        msg = "Vivado build is queued: " + script
+        if server.pending:
+            msg += ", builds ahead: " + str(server.pending)
+        self.window.status_message(msg)
+
+        threading.Thread(
+            target=self._build,
+            args=(server, create_artifact_cache(self.window), get_project_settings(self.window), path2prj, script,
+                  output),
+            daemon=True,
+        ).start()
+
+    def _build(
+        self,
+        server: VivadoServer,
+        cache: ArtifactCache | None,
+        settings: dict,
+        path2prj: str,
+        script: str,
+        output: Callable[[str], None],
+    ) -> None:
+        """Restore the build from the cache or run it, then report it."""
+        path2script = os.path.join(path2prj, self.dir_script, script)
+        path2build = os.path.join(path2prj, self.dir_tmp)
+
+        key = get_build_key(cache, settings, path2prj, path2script) if cache is not None else None
+        restored = cache.restore(key, path2build) if key is not None else None
+
+        if restored is not None:
+            msg = "Vivado build is restored from artifact cache: " + str(len(restored)) + " files"
+            output(msg)
+            logger.info(msg)
+            sublime.set_timeout(lambda: self.window.status_message(msg))
+            return
+
+        start = time.time()
+        request = server.source(path2script, path2build, output)
+        request.wait()
+
+        if request.rc == 0:
+            msg = "Vivado build is done: " + script
+            logger.info(msg)
+            record_reports(path2prj, path2build, script, since=start, dir_script=self.dir_script)
+            if key is not None:
+                cache.store(key, path2build, since=start)
+        else:
+            msg = "Vivado build is failed: " + script + ": " + request.result
+            logger.error(msg)
+
+        sublime.set_timeout(lambda: self.window.status_message(msg))
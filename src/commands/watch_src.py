@@ -0,0 +1,109 @@
+"""Background watcher that keeps the source list of the project updated."""
+
+from __future__ import annotations
+
+import os
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+import sublime
+import sublime_plugin
+
+try:
+    from Automatons.src.commands.update_src import create_updater, get_project_settings
+    from Automatons.src.lib.src_watcher import SrcWatcher
+except ImportError:
+    from src.commands.update_src import create_updater, get_project_settings
+    from src.lib.src_watcher import SrcWatcher
+
+# window id -> watcher
+_watchers: dict[int, SrcWatcher] = {}
+
+
+def start_src_watcher(window: sublime.Window) -> bool:
+    """Start watcher for the project of the window. Return False if there is no project."""
+    path2prj = window.project_file_name()
+    if path2prj is None:
+        return False
+    path2prj = os.path.dirname(path2prj)
+
+    stop_src_watcher(window)
+
+    settings = get_project_settings(window)
+    updater = create_updater(window, path2prj)
+
+    def update() -> None:
+        added, removed, written = updater.update()
+
+        if written:
+            msg = "Source list updated, added: " + str(len(added)) + ", removed: " + str(len(removed))
+            logger.info(msg)
+            sublime.set_timeout(lambda: window.status_message(msg))
+
+    watcher = SrcWatcher(
+        updater.path2src,
+        update,
+        discovery=updater.snapshot.discovery,
+        debounce=settings.get("watch_src_debounce", 0.5),
+        poll_interval=settings.get("watch_src_poll_interval", 2.0),
+        content=updater.indexes_content,
+    )
+    watcher.start()
+
+    _watchers[window.id()] = watcher
+
+    return True
+
+
+def stop_src_watcher(window: sublime.Window) -> bool:
+    """Stop watcher of the window. Return False if there was no watcher."""
+    watcher = _watchers.pop(window.id(), None)
+    if watcher is None:
+        return False
+
+    watcher.stop()
+    return True
+
+
+def start_src_watchers() -> None:
+    """Start watchers for already opened projects."""
+    for window in sublime.windows():
+        if get_project_settings(window).get("watch_src", False):
+            start_src_watcher(window)
+
+
+def stop_src_watchers() -> None:
+    """Stop all watchers."""
+    for watcher in _watchers.values():
+        watcher.stop()
+    _watchers.clear()
+
+
+class SrcWatcherListener(sublime_plugin.EventListener):
+    """Start and stop watcher with the project. Watcher is enabled by "watch_src" project setting."""
+
+    def on_load_project_async(self, window: sublime.Window) -> None:
+        """Start watcher for the opened project."""
+        if get_project_settings(window).get("watch_src", False):
+            start_src_watcher(window)
+
+    def on_pre_close_project(self, window: sublime.Window) -> None:
+        """Stop watcher of the closed project."""
+        stop_src_watcher(window)
+
+
+class ToggleSrcWatcherCommand(sublime_plugin.WindowCommand):
+    """Command to start or stop the source watcher for the current session."""
+
+    def run(self) -> None:
+        """Command body."""
+        if stop_src_watcher(self.window):
+            self.window.status_message("Source watcher stopped")
+        elif start_src_watcher(self.window):
+            self.window.status_message("Source watcher started")
+        else:
+            sublime.message_dialog("Project file is not found. Please check that the project is open")
@@ -0,0 +1,256 @@
+"""Content-addressed cache of build artifacts."""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Iterable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+try:
+    from Automatons.src.lib.manager_src import SrcListGenerator, normalize_path
+    from Automatons.src.lib.ooc_cache import FileHasher
+except ImportError:
+    from src.lib.manager_src import SrcListGenerator, normalize_path
+    from src.lib.ooc_cache import FileHasher
+
+
+class ArtifactCache:
+    """
+    Cache of build artifacts (bitstreams, checkpoints, reports) keyed by sha256 of build inputs.
+
+    An entry is a directory <cache>/<key> with the artifacts at their paths relative to the build dir and
+    manifest.json. Entries are written to a temporary directory and renamed, so a concurrent build never sees a
+    partial entry. Restore touches the manifest, eviction removes entries with the oldest manifest first until the
+    cache fits max_size.
+    """
+
+    MANIFEST_NAME = "manifest.json"
+    HASHES_NAME = ".hashes.json"
+    VERSIONS_NAME = ".tool_versions.json"
+
+    ARTIFACTS = ("*.bit", "*.bin", "*.ltx", "*.xsa", "*post_route.dcp", "*_routed.dcp", "*.rpt")
+
+    def __init__(self, dir_cache: str, max_size: int = 4 << 30, artifacts: Iterable[str] = ARTIFACTS) -> None:
+        """Init. max_size is in bytes, artifacts are globs matched against paths relative to the build dir."""
+        self.dir_cache = dir_cache
+        self.max_size = max_size
+        self.artifacts = list(artifacts)
+
+        self.hasher = FileHasher()
+
+    def key(self, files: Iterable[str], values: Iterable[str] = (), root: str | None = None) -> str:
+        """
+        Get key: sha256 of the names and contents of files (order doesn't matter) and of values.
+
+        Names of files under root are relative to it, so checkouts of the project in different dirs share keys.
+        """
+        os.makedirs(self.dir_cache, exist_ok=True)
+        path2hashes = os.path.join(self.dir_cache, self.HASHES_NAME)
+        self.hasher.load(path2hashes)
+
+        names = {}
+        for file_path in files:
+            path = os.path.abspath(file_path)
+            name = os.path.relpath(path, root) if root and self._is_under(path, root) else path
+            names[normalize_path(name)] = path
+
+        sha = hashlib.sha256()
+        for value in values:
+            sha.update(value.encode() + b"\0")
+        for name in sorted(names):
+            sha.update(name.encode() + b"\0" + self.hasher.digest(names[name]).encode() + b"\0")
+
+        self.hasher.save(path2hashes)
+
+        return sha.hexdigest()
+
+    def project_key(
+        self,
+        path2prj: str,
+        path2script: str,
+        part: str,
+        tool_version: str,
+        dir_script: str = "script",
+        dir_build: str = "build",
+        path2constrain: str = "xdc/main.xdc",
+        path2block_design: str = "pcore_bd.tcl",
+    ) -> str:
+        """
+        Get key of the project build.
+
+        Inputs are contents of the resolved source list, constraints, block design and the build script, the part
+        and the tool version. Relative sources are resolved from the build dir.
+        """
+        src_list_script = SrcListGenerator()
+        src_list_script.read_tcl_script(os.path.join(path2prj, dir_script, "get_list_sources.tcl"))
+        path2build = os.path.join(path2prj, dir_build)
+
+        files = [os.path.join(path2build, path) for path in src_list_script.resolve_src_list()]
+        files += [
+            os.path.join(path2prj, path2constrain),
+            os.path.join(path2prj, dir_script, path2block_design),
+            path2script,
+        ]
+
+        return self.key(files, ("part=" + part, "tool=" + tool_version), root=path2prj)
+
+    def restore(self, key: str, path2build: str) -> list[str] | None:
+        """Copy artifacts of the entry to the build dir. Return restored paths or None on miss."""
+        path2entry = os.path.join(self.dir_cache, key)
+        path2manifest = os.path.join(path2entry, self.MANIFEST_NAME)
+
+        try:
+            with open(path2manifest) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        restored = []
+        for rel_path in manifest["files"]:
+            path = os.path.join(path2build, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            shutil.copy2(os.path.join(path2entry, rel_path), path)
+            restored.append(path)
+
+        now = time.time()
+        os.utime(path2manifest, (now, now))
+
+        return restored
+
+    def store(self, key: str, path2build: str, since: float = 0.0) -> list[str]:
+        """
+        Store artifacts of the build dir modified since the time (start of the build), evict old entries.
+
+        Return stored relative paths.
+        """
+        files = self.find_artifacts(path2build, since)
+        if not files:
+            return []
+
+        path2entry = os.path.join(self.dir_cache, key)
+        if os.path.exists(path2entry):
+            return files
+
+        os.makedirs(self.dir_cache, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=self.dir_cache, prefix=".tmp_")
+        try:
+            size = 0
+            for rel_path in files:
+                path = os.path.join(tmp_dir, rel_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                shutil.copy2(os.path.join(path2build, rel_path), path)
+                size += os.path.getsize(path)
+
+            with open(os.path.join(tmp_dir, self.MANIFEST_NAME), "w") as file:
+                json.dump({"files": files, "size": size, "created": time.time()}, file, indent=4)
+
+            os.replace(tmp_dir, path2entry)
+        except OSError:
+            # the entry is stored by a concurrent build or the cache is not writable
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return files
+
+        self.evict()
+
+        return files
+
+    def find_artifacts(self, path2build: str, since: float = 0.0) -> list[str]:
+        """Get sorted paths (relative to the build dir) of files matching artifact globs modified since the time."""
+        found = []
+        for root, _, names in os.walk(path2build):
+            for name in names:
+                path = os.path.join(root, name)
+                rel_path = normalize_path(os.path.relpath(path, path2build))
+                if not any(fnmatch.fnmatch(rel_path, pattern) for pattern in self.artifacts):
+                    continue
+                if os.path.getmtime(path) >= since:
+                    found.append(rel_path)
+
+        return sorted(found)
+
+    def evict(self) -> int:
+        """Remove least recently used entries beyond max_size. Return count of removed entries."""
+        entries = []
+        for entry in os.scandir(self.dir_cache):
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+
+            path2manifest = os.path.join(entry.path, self.MANIFEST_NAME)
+            try:
+                with open(path2manifest) as file:
+                    size = json.load(file)["size"]
+                entries.append((os.path.getmtime(path2manifest), size, entry.path))
+            except (OSError, ValueError, KeyError):
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            msg = "Artifact cache: evicted " + str(removed) + " entries"
+            logger.info(msg)
+
+        return removed
+
+    @staticmethod
+    def _is_under(path: str, root: str) -> bool:
+        """Check that the path is in the root dir."""
+        try:
+            return os.path.commonpath([path, os.path.abspath(root)]) == os.path.abspath(root)
+        except ValueError:
+            return False
+
+    def tool_version(self, vivado: str) -> str:
+        """Get version of Vivado (first line of `vivado -version`), cached by the path and mtime of executable."""
+        executable = shutil.which(vivado) or vivado
+        try:
+            stamp = normalize_path(executable) + " " + str(os.stat(executable).st_mtime_ns)
+        except OSError:
+            return "unknown"
+
+        os.makedirs(self.dir_cache, exist_ok=True)
+        path2versions = os.path.join(self.dir_cache, self.VERSIONS_NAME)
+        try:
+            with open(path2versions) as file:
+                versions = json.load(file)
+        except (OSError, ValueError):
+            versions = {}
+
+        if stamp not in versions:
+            try:
+                proc = subprocess.run(
+                    [executable, "-version"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                    text=True, timeout=300, check=False,
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                return "unknown"
+            if proc.returncode:
+                return "unknown"
+
+            versions[stamp] = next((line.strip() for line in proc.stdout.splitlines() if line.strip()), "unknown")
+            try:
+                with open(path2versions, "w") as file:
+                    json.dump(versions, file, indent=4)
+            except OSError:
+                pass
+
+        return versions[stamp]
@@ -0,0 +1,191 @@
+"""Per-phase timing of builds and their append-only history."""
+
+from __future__ import annotations
+
+import datetime
+import glob
+import json
+import os
+import re
+import statistics
+import subprocess
+from typing import Iterable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+
+class PhaseRecorder:
+    """
+    Collector of per-phase wall-clock, CPU time and peak memory from Vivado output.
+
+    Vivado ends every step by `<command>: Time (s): cpu = 00:01:02 ; elapsed = 00:01:05 . Memory (MB): peak = ...`.
+    Repeated steps are summed (peak memory is the maximum). Jobs are taken from the `Jobs:` line of generated flows.
+    """
+
+    PHASES = ("synth_design", "opt_design", "place_design", "phys_opt_design", "route_design", "write_bitstream")
+
+    _SUMMARY = re.compile(
+        r"^(\w+): Time \(s\): cpu = ([\d:]+) ; elapsed = ([\d:]+) \. Memory \(MB\): peak = ([\d.]+)",
+    )
+    _JOBS = re.compile(r"\[Automatons[^\]]*\] Jobs: (\d+)")
+
+    def __init__(self) -> None:
+        """Init."""
+        self.phases: dict[str, dict[str, float]] = {}
+        self.jobs: int | None = None
+
+    def feed(self, line: str) -> None:
+        """Parse output line."""
+        if not line.startswith(self.PHASES):
+            match = self._JOBS.search(line)
+            if match is not None:
+                self.jobs = int(match.group(1))
+            return
+
+        match = self._SUMMARY.match(line)
+        if match is None or match.group(1) not in self.PHASES:
+            return
+
+        phase = self.phases.setdefault(match.group(1), {"elapsed": 0.0, "cpu": 0.0, "peak_mb": 0.0})
+        phase["elapsed"] += self.seconds(match.group(3))
+        phase["cpu"] += self.seconds(match.group(2))
+        phase["peak_mb"] = max(phase["peak_mb"], float(match.group(4)))
+
+    def feed_file(self, file_path: str) -> None:
+        """Parse log file (e.g. runme.log of a run of project flow)."""
+        try:
+            with open(file_path, encoding="utf-8", errors="replace") as file:
+                for line in file:
+                    self.feed(line)
+        except OSError:
+            pass
+
+    def feed_runs(self, path2build: str) -> None:
+        """Parse logs of synthesis and implementation runs of project flow found in the build dir."""
+        for run in ("synth_1", "impl_1"):
+            for file_path in glob.glob(os.path.join(path2build, "*.runs", run, "runme.log")):
+                self.feed_file(file_path)
+
+    @staticmethod
+    def seconds(text: str) -> float:
+        """Convert `hh:mm:ss` to seconds."""
+        total = 0.0
+        for part in text.split(":"):
+            total = total * 60 + float(part)
+
+        return total
+
+
+class BuildHistory:
+    """
+    Append-only JSONL history of builds of the project: one record per build with per-phase statistics.
+
+    A record is a single line written at once, so a reader never sees a partial record (broken lines are skipped).
+    """
+
+    FILE_NAME = ".build_history.jsonl"
+
+    def __init__(self, file_path: str) -> None:
+        """Init."""
+        self.file_path = file_path
+
+    def append(self, record: dict) -> None:
+        """Append record."""
+        try:
+            with open(self.file_path, "a") as file:
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        except OSError:
+            msg = "Can't save build history: " + self.file_path
+            logger.warning(msg)
+
+    def load(self, last: int | None = None) -> list[dict]:
+        """Get records, the last ones if last is given."""
+        try:
+            with open(self.file_path) as file:
+                records = [record for record in map(_parse_record, file) if record is not None]
+        except OSError:
+            return []
+
+        return records[-last:] if last else records
+
+    @staticmethod
+    def record(
+        recorder: PhaseRecorder,
+        script: str,
+        returncode: int | None,
+        elapsed: float,
+        path2prj: str,
+        jobs: int | None = None,
+    ) -> dict:
+        """Form record of the build."""
+        return {
+            "time": datetime.datetime.now(datetime.timezone.utc).astimezone().isoformat(timespec="seconds"),
+            "commit": BuildHistory.commit(path2prj),
+            "script": script,
+            "returncode": returncode,
+            "elapsed": round(elapsed, 1),
+            "jobs": recorder.jobs if recorder.jobs is not None else jobs,
+            "phases": recorder.phases,
+        }
+
+    @staticmethod
+    def commit(path2prj: str) -> str:
+        """Get short hash of HEAD of the project repository, empty if it is not a repository."""
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], cwd=path2prj, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, text=True, timeout=10, check=False,
+            ).stdout.strip()
+        except (OSError, subprocess.TimeoutExpired):
+            return ""
+
+
+def _parse_record(line: str) -> dict | None:
+    """Parse record line, None if it is broken (e.g. by an interrupted write)."""
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def compare_builds(
+    records: list[dict],
+    window: int = 5,
+    threshold: float = 0.2,
+    min_seconds: float = 60.0,
+) -> list[tuple[str, float, float, bool]]:
+    """
+    Compare the last build with the median of up to `window` previous successful builds of the same script.
+
+    Return rows (phase, baseline elapsed, last elapsed, regression) for phases of the last build. A phase regresses
+    if it is slower by more than threshold (relative) and min_seconds (absolute).
+    """
+    if not records:
+        return []
+
+    last = records[-1]
+    previous = [
+        record for record in records[:-1]
+        if record.get("returncode") == 0 and record.get("script") == last.get("script")
+    ][-window:]
+
+    rows = []
+    for phase, stats in _ordered(last.get("phases", {})):
+        history = [record["phases"][phase]["elapsed"] for record in previous if phase in record.get("phases", {})]
+        baseline = statistics.median(history) if history else 0.0
+        delta = stats["elapsed"] - baseline
+        regression = bool(history) and delta > min_seconds and delta > baseline * threshold
+        rows.append((phase, baseline, stats["elapsed"], regression))
+
+    return rows
+
+
+def _ordered(phases: dict[str, dict]) -> Iterable[tuple[str, dict]]:
+    """Order phases by the flow."""
+    order = {name: index for index, name in enumerate(PhaseRecorder.PHASES)}
+
+    return sorted(phases.items(), key=lambda item: order.get(item[0], len(order)))
@@ -0,0 +1,209 @@
+"""Asynchronous runner of Vivado builds with streaming output and progress of build phases."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import re
+import signal
+import subprocess
+import threading
+from typing import Callable, ClassVar
+
+
+class PhaseTracker:
+    """
+    Progress of the build by phases found in Vivado output.
+
+    Non-project flow prints `Command: <command>` at start of every step, project flow prints `Launched <run>`.
+    Phases only go forward: a step repeated later (e.g. opt_design of the next run) doesn't move progress back.
+    """
+
+    PHASES = ("Synthesis", "Optimization", "Placement", "Physical optimization", "Routing", "Bitstream")
+
+    _COMMANDS: ClassVar[dict[str, int]] = {
+        "synth_design": 0,
+        "opt_design": 1,
+        "place_design": 2,
+        "phys_opt_design": 3,
+        "route_design": 4,
+        "write_bitstream": 5,
+    }
+    _RUNS: ClassVar[dict[str, int]] = {"synth_1": 0, "impl_1": 2}
+
+    _COMMAND = re.compile(r"^Command: (\w+)")
+    _LAUNCHED = re.compile(r"Launched (\w+)")
+    _SEVERITY = re.compile(r"^(ERROR|CRITICAL WARNING|WARNING):")
+
+    def __init__(self) -> None:
+        """Init."""
+        self.index = -1
+        self.counts = {"ERROR": 0, "CRITICAL WARNING": 0, "WARNING": 0}
+
+    @property
+    def phase(self) -> str:
+        """Name of the current phase, empty before the first one."""
+        return self.PHASES[self.index] if self.index >= 0 else ""
+
+    @property
+    def progress(self) -> str:
+        """Progress text: `Placement [3/6]`."""
+        if self.index < 0:
+            return "Starting"
+
+        return self.phase + " [" + str(self.index + 1) + "/" + str(len(self.PHASES)) + "]"
+
+    def feed(self, line: str) -> bool:
+        """Parse output line. Return True if the phase is changed."""
+        match = self._SEVERITY.match(line)
+        if match is not None:
+            self.counts[match.group(1)] += 1
+            return False
+
+        match = self._COMMAND.match(line)
+        index = self._COMMANDS.get(match.group(1), -1) if match else -1
+        if index < 0:
+            match = self._LAUNCHED.search(line)
+            index = self._RUNS.get(match.group(1), -1) if match else -1
+
+        if index > self.index:
+            self.index = index
+            return True
+
+        return False
+
+
+class BuildRunner:
+    """
+    Build process driven by asyncio in a thread with its own event loop.
+
+    Output lines are passed to on_output, changes of phase to on_phase, the return code to on_done (all are called
+    in the runner thread). Cancel terminates the whole process tree: Vivado is started by a wrapper script.
+    """
+
+    def __init__(
+        self,
+        command: list[str],
+        cwd: str,
+        on_output: Callable[[str], None] | None = None,
+        on_phase: Callable[[PhaseTracker], None] | None = None,
+        on_done: Callable[[int], None] | None = None,
+    ) -> None:
+        """Init."""
+        self.command = command
+        self.cwd = cwd
+        self.on_output = on_output
+        self.on_phase = on_phase
+        self.on_done = on_done
+
+        self.tracker = PhaseTracker()
+        self.returncode: int | None = None
+        self.cancelled = False
+
+        self._proc: asyncio.subprocess.Process | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._done = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Build is started and not finished."""
+        return self._thread is not None and not self._done.is_set()
+
+    def start(self) -> None:
+        """Start the build in background."""
+        self._thread = threading.Thread(target=self._main, daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float | None = None) -> int | None:
+        """Wait for the build. Return the return code (None on timeout)."""
+        self._done.wait(timeout)
+
+        return self.returncode
+
+    def cancel(self) -> None:
+        """Cancel the build: terminate the process tree."""
+        self.cancelled = True
+        if self._loop is not None and not self._done.is_set():
+            self._loop.call_soon_threadsafe(self._terminate)
+
+    def _main(self) -> None:
+        """Thread body: run event loop until the build is finished."""
+        if os.name == "nt":
+            self._loop = asyncio.ProactorEventLoop()
+        else:
+            self._loop = asyncio.new_event_loop()
+
+        try:
+            self.returncode = self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+            self._done.set()
+
+        if self.on_done is not None:
+            self.on_done(self.returncode)
+
+    async def _run(self) -> int:
+        """Run the process and stream its output."""
+        try:
+            self._proc = await asyncio.create_subprocess_exec(
+                *self.command, cwd=self.cwd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+                stdin=asyncio.subprocess.DEVNULL, limit=1 << 20, **process_group_kwargs(),
+            )
+        except OSError as err:
+            self._output("ERROR: can't run " + " ".join(self.command) + ": " + str(err))
+            return -1
+
+        if self.cancelled:
+            self._terminate()
+
+        while True:
+            line = await self._proc.stdout.readline()
+            if not line:
+                break
+
+            self._output(line.decode("utf-8", errors="replace").rstrip("\r\n"))
+
+        return await self._proc.wait()
+
+    def _output(self, line: str) -> None:
+        """Pass line to callbacks."""
+        if self.on_output is not None:
+            self.on_output(line)
+
+        if self.tracker.feed(line) and self.on_phase is not None:
+            self.on_phase(self.tracker)
+
+    def _terminate(self) -> None:
+        """Terminate the process tree."""
+        if self._proc is None or self._proc.returncode is not None:
+            return
+
+        terminate_tree(self._proc)
+
+
+def process_group_kwargs() -> dict:
+    """
+    Get arguments of Popen starting the process in its own process group.
+
+    Vivado is started through a wrapper script (vivado.bat, the launcher shell script), so only the group reaches
+    the real Vivado: see terminate_tree().
+    """
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+
+    return {"start_new_session": True}
+
+
+def terminate_tree(proc: subprocess.Popen | asyncio.subprocess.Process, *, force: bool = False) -> None:
+    """Terminate (kill if force) the process started with process_group_kwargs() and all its children."""
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL if force else signal.SIGTERM)
+    except OSError:
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
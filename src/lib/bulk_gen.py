@@ -0,0 +1,272 @@
+"""Bulk generation of modules and testbenches from a spec file."""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+try:
+    from Automatons.src.lib.gen_template import SrcTemplate, TbTemplate
+    from Automatons.src.lib.hdl_parser import HdlModule, HdlParameter, HdlPort
+except ImportError:
+    from src.lib.gen_template import SrcTemplate, TbTemplate
+    from src.lib.hdl_parser import HdlModule, HdlParameter, HdlPort
+
+# direction, kind (reg, logic, signed...), packed dimensions, name
+_PORT = re.compile(r"^\s*(?:(input|output|inout)\s+)?(.*?)\s*((?:\[[^\]]*\]\s*)*)(\w+)\s*$")
+_NAME = re.compile(r"^[A-Za-z_]\w*$")
+
+DIRECTIONS = ("input", "output", "inout")
+# words of a declaration that can't be names
+_KEYWORDS = frozenset((*DIRECTIONS, "wire", "reg", "logic", "signed", "unsigned"))
+
+
+class SpecError(ValueError):
+    """Wrong spec: unexpected structure, names or directions."""
+
+
+class ModuleSpec(HdlModule):
+    """Module to generate: declaration and the subdir of sources and testbenches."""
+
+    __slots__ = ("subdir",)
+
+    def __init__(self, name: str, subdir: str = "") -> None:
+        """Init."""
+        super().__init__(name, 0)
+        self.subdir = subdir
+
+
+def load_spec(file_path: str) -> list[ModuleSpec]:
+    """
+    Load modules from JSON or CSV spec.
+
+    JSON is a list of modules (or {"modules": [...]}): {"name": "fifo", "dir": "mem", "parameters": {"W": "8"},
+    "ports": ["input clk", "input [W-1:0] din", {"name": "dout", "direction": "output", "width": "[W-1:0]"}]}.
+    CSV has columns module, kind (port, parameter or empty), name, direction, width, default; a module is formed
+    by its rows in order. A wrong spec raises SpecError.
+    """
+    if file_path.lower().endswith(".csv"):
+        return _load_csv(file_path)
+
+    with open(file_path) as file:
+        data = json.load(file)
+
+    if isinstance(data, dict):
+        data = data.get("modules", [])
+    if not isinstance(data, list):
+        msg = "Modules must be a list"
+        raise SpecError(msg)
+
+    return [_module_from_dict(entry) for entry in data]
+
+
+def _module_from_dict(entry: dict) -> ModuleSpec:
+    """Form module of JSON spec."""
+    if not isinstance(entry, dict):
+        msg = "Module must be an object: " + json.dumps(entry)
+        raise SpecError(msg)
+
+    module = ModuleSpec(_check_name(entry.get("name"), "module"), str(entry.get("dir", "")))
+
+    parameters = entry.get("parameters", {})
+    if isinstance(parameters, dict):
+        parameters = [{"name": name, "default": default} for name, default in parameters.items()]
+    module.parameters = [_parameter_from_dict(parameter) for parameter in _check_list(parameters, "parameters")]
+    module.ports = [_port_from_dict(port) for port in _check_list(entry.get("ports", []), "ports")]
+
+    return module
+
+
+def _parameter_from_dict(parameter: dict) -> HdlParameter:
+    """Form parameter of JSON spec."""
+    if not isinstance(parameter, dict):
+        msg = "Parameter must be an object: " + json.dumps(parameter)
+        raise SpecError(msg)
+
+    return HdlParameter(_check_name(parameter.get("name"), "parameter"), str(parameter.get("default", "")))
+
+
+def _port_from_dict(port: str | dict) -> HdlPort:
+    """Form port of JSON spec: short declaration or object."""
+    if isinstance(port, str):
+        return parse_port(port)
+    if not isinstance(port, dict):
+        msg = "Port must be a declaration or an object: " + json.dumps(port)
+        raise SpecError(msg)
+
+    return HdlPort(
+        _check_name(port.get("name"), "port"),
+        _check_direction(port.get("direction", "input")),
+        str(port.get("kind", "")),
+        str(port.get("width", "")),
+    )
+
+
+def _check_list(value: list, what: str) -> list:
+    """Check that value of the spec is a list."""
+    if not isinstance(value, list):
+        msg = what.capitalize() + " must be a list: " + json.dumps(value)
+        raise SpecError(msg)
+
+    return value
+
+
+def _check_name(name: str | None, what: str) -> str:
+    """Check that name of the spec is an identifier, not a keyword of declarations."""
+    if not isinstance(name, str) or not _NAME.match(name) or name in _KEYWORDS:
+        msg = "Wrong name of " + what + ": " + json.dumps(name)
+        raise SpecError(msg)
+
+    return name
+
+
+def _check_direction(direction: str) -> str:
+    """Check direction of port."""
+    if direction not in DIRECTIONS:
+        msg = "Wrong direction of port: " + json.dumps(direction)
+        raise SpecError(msg)
+
+    return direction
+
+
+def _load_csv(file_path: str) -> list[ModuleSpec]:
+    """Load modules of CSV spec."""
+    modules: dict[str, ModuleSpec] = {}
+
+    with open(file_path, newline="") as file:
+        for row in csv.DictReader(file):
+            name = (row.get("module") or "").strip()
+            if not name:
+                continue
+
+            module = modules.get(name)
+            if module is None:
+                module = modules[name] = ModuleSpec(_check_name(name, "module"), (row.get("dir") or "").strip())
+
+            kind = (row.get("kind") or "").strip()
+            if kind == "parameter":
+                module.parameters.append(HdlParameter(
+                    _check_name((row.get("name") or "").strip(), "parameter"), (row.get("default") or "").strip(),
+                ))
+            elif kind == "port":
+                module.ports.append(HdlPort(
+                    _check_name((row.get("name") or "").strip(), "port"),
+                    _check_direction((row.get("direction") or "input").strip()),
+                    "",
+                    (row.get("width") or "").strip(),
+                ))
+
+    return list(modules.values())
+
+
+def parse_port(text: str) -> HdlPort:
+    """Parse short declaration of port: `output reg [7:0] data` (input by default)."""
+    match = _PORT.match(text)
+    if match is None:
+        msg = "Wrong declaration of port: " + text
+        raise SpecError(msg)
+
+    direction, kind, width, name = match.groups()
+    if name in _KEYWORDS:
+        msg = "Name of port is missing: " + text
+        raise SpecError(msg)
+
+    return HdlPort(name, direction or "input", kind, width.replace(" ", ""))
+
+
+class BulkGenerator:
+    """
+    Generator of sources and testbenches of many modules.
+
+    Modules are rendered from cached skeletons of the templates by parallel workers, each worker writes its batch
+    at once: all files of the batch go to temporary files first, then replace targets. Existing files are kept
+    unless overwrite is set.
+    """
+
+    def __init__(
+        self,
+        path2prj: str,
+        dir_src: str = "src",
+        dir_tb: str = "tb",
+        ext: str = ".v",
+        *,
+        tb: bool = True,
+        overwrite: bool = False,
+        workers: int = 0,
+        batch: int = 64,
+    ) -> None:
+        """Init."""
+        self.path2src = os.path.join(path2prj, dir_src)
+        self.path2tb = os.path.join(path2prj, dir_tb)
+        self.ext = ext
+        self.tb = tb
+        self.overwrite = overwrite
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.batch = batch
+
+    def generate(self, modules: Iterable[ModuleSpec]) -> tuple[list[str], list[str]]:
+        """Generate files of modules. Return written sources and all written files."""
+        modules = list(modules)
+        batches = [modules[i:i + self.batch] for i in range(0, len(modules), self.batch)]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            written = [path for paths in pool.map(self._generate_batch, batches) for path in paths]
+
+        sources = [path for path in written if path.startswith(self.path2src + os.sep)]
+
+        return sources, written
+
+    def render(self, module: ModuleSpec) -> list[tuple[str, str]]:
+        """Render files of module: paths and texts."""
+        src = SrcTemplate()
+        src.name = module.name
+        src.set_header(module.parameters, module.ports)
+        files = [(os.path.join(self.path2src, module.subdir, module.name + self.ext), src.insert())]
+
+        if self.tb:
+            tb = TbTemplate()
+            tb.name = module.name
+            tb.set_uut(module.parameters, module.ports)
+            files.append((os.path.join(self.path2tb, module.subdir, module.name + "_tb" + self.ext), tb.insert()))
+
+        return files
+
+    def _generate_batch(self, modules: list[ModuleSpec]) -> list[str]:
+        """Render batch of modules and write it."""
+        files = [
+            (path, text) for module in modules for path, text in self.render(module)
+            if self.overwrite or not os.path.exists(path)
+        ]
+
+        return write_batch(files)
+
+
+def write_batch(files: list[tuple[str, str]]) -> list[str]:
+    """Write files atomically: temporary files are written first, then all of them replace targets. Return paths."""
+    staged = []
+    try:
+        for path, text in files:
+            dir_path = os.path.dirname(path)
+            os.makedirs(dir_path, exist_ok=True)
+
+            # not an HDL extension: the source watcher must not pick up temporary files
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".tmp", dir=dir_path)
+            staged.append((tmp_path, path))
+            with os.fdopen(fd, "w") as file:
+                file.write(text)
+            os.chmod(tmp_path, 0o644)
+
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+    except OSError:
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+
+    return [path for _, path in staged]
@@ -0,0 +1,207 @@
+"""Include and package import dependencies of HDL sources."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Iterable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+
+class DependencyIndex:
+    """
+    Index of dependency edges: `include of files and import of packages (SystemVerilog `pkg::`, VHDL `use`).
+
+    Scan results are cached per file by mtime and size and stored in json file next to the source list. Included
+    headers are indexed too, even if they are not sources, so a change of header is mapped to the sources
+    including it through any depth.
+    """
+
+    VERSION = 1
+    FILE_NAME = ".dep_index.json"
+
+    _V_COMMENTS = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+    _V_INCLUDE = re.compile(r'`include\s+"([^"]+)"')
+    _V_PACKAGE = re.compile(r"\bpackage\s+(\w+)\s*;")
+    _V_IMPORT = re.compile(r"\b(\w+)\s*::")
+
+    _VHDL_COMMENTS = re.compile(r"--[^\n]*")
+    _VHDL_PACKAGE = re.compile(r"\bpackage\s+(\w+)\s+is\b")
+    _VHDL_USE = re.compile(r"\buse\s+\w+\.(\w+)\.")
+
+    VHDL_EXTENSIONS = (".vhd", ".vhdl")
+
+    def __init__(self, include_dirs: Iterable[str] = ()) -> None:
+        """Init empty index. Includes are searched in the dir of including file, then in include_dirs."""
+        self.include_dirs = list(include_dirs)
+
+        # file path -> (mtime_ns, size, defined packages, resolved includes, imported packages)
+        self.files: dict[str, tuple[int, int, list[str], list[str], list[str]]] = {}
+        self._reverse: dict[str, list[str]] | None = None
+
+    def load(self, file_path: str) -> bool:
+        """Load index from json file. Return False if the file is absent or not compatible."""
+        try:
+            with open(file_path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError):
+            msg = "Broken dependency index, full re-index: " + file_path
+            logger.warning(msg)
+            return False
+
+        if data.get("version") != self.VERSION or data.get("include_dirs") != self.include_dirs:
+            return False
+
+        self.files = {path: tuple(entry) for path, entry in data["files"].items()}
+        self._reverse = None
+
+        return True
+
+    def save(self, file_path: str) -> None:
+        """Save index to json file."""
+        data = {
+            "version": self.VERSION,
+            "include_dirs": self.include_dirs,
+            "files": {path: list(entry) for path, entry in self.files.items()},
+        }
+
+        tmp_path = file_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(data, file, separators=(",", ":"))
+            os.replace(tmp_path, file_path)
+        except OSError:
+            msg = "Can't save dependency index: " + file_path
+            logger.warning(msg)
+
+    def update(self, paths: Iterable[str]) -> int:
+        """Index sources and headers included by them, drop other files. Return count of (re)scanned files."""
+        files: dict[str, tuple[int, int, list[str], list[str], list[str]]] = {}
+        scanned = 0
+
+        stack = [os.path.normpath(path) for path in paths]
+        while stack:
+            path = stack.pop()
+            if path in files:
+                continue
+
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            entry = self.files.get(path)
+            if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+                try:
+                    packages, includes, imports = self._scan(path)
+                except OSError:
+                    continue
+
+                entry = (stat.st_mtime_ns, stat.st_size, packages, includes, imports)
+                scanned += 1
+
+            files[path] = entry
+            stack.extend(entry[3])
+
+        self.files = files
+        self._reverse = None
+
+        return scanned
+
+    def dependencies(self, path: str) -> list[str]:
+        """Get files the file depends on directly: included headers and files defining imported packages."""
+        path = os.path.normpath(path)
+        entry = self.files.get(path)
+        if entry is None:
+            return []
+
+        return sorted(self._direct(path, entry, self._packages()))
+
+    def affected(self, changed: Iterable[str]) -> list[str]:
+        """Get sorted transitive set of files affected by the change of files (changed files included)."""
+        reverse = self._reverse_graph()
+
+        stack = [os.path.normpath(path) for path in changed]
+        found = set(stack)
+        while stack:
+            for dependent in reverse.get(stack.pop(), ()):
+                if dependent not in found:
+                    found.add(dependent)
+                    stack.append(dependent)
+
+        return sorted(found)
+
+    def _scan(self, path: str) -> tuple[list[str], list[str], list[str]]:
+        """Scan file. Return defined packages, resolved includes and imported packages."""
+        with open(path, encoding="utf-8", errors="replace") as file:
+            text = file.read()
+
+        if path.lower().endswith(self.VHDL_EXTENSIONS):
+            text = self._VHDL_COMMENTS.sub(" ", text).lower()
+            packages = set(self._VHDL_PACKAGE.findall(text))
+            imports = set(self._VHDL_USE.findall(text))
+            return sorted(packages), [], sorted(imports - packages)
+
+        text = self._V_COMMENTS.sub(" ", text)
+        packages = set(self._V_PACKAGE.findall(text))
+        imports = set(self._V_IMPORT.findall(text))
+        includes = {
+            resolved for resolved in (self._resolve(path, target) for target in self._V_INCLUDE.findall(text))
+            if resolved
+        }
+
+        return sorted(packages), sorted(includes), sorted(imports - packages)
+
+    def _resolve(self, path: str, target: str) -> str | None:
+        """Find included file."""
+        for dir_path in [os.path.dirname(path), *self.include_dirs]:
+            candidate = os.path.normpath(os.path.join(dir_path, target))
+            if os.path.isfile(candidate):
+                return candidate
+
+        return None
+
+    def _packages(self) -> dict[str, list[str]]:
+        """Get index: package -> defining files. VHDL names are lowered."""
+        packages: dict[str, list[str]] = {}
+        for path, entry in self.files.items():
+            for name in entry[2]:
+                packages.setdefault(name, []).append(path)
+
+        return packages
+
+    @staticmethod
+    def _direct(
+        path: str,
+        entry: tuple[int, int, list[str], list[str], list[str]],
+        packages: dict[str, list[str]],
+    ) -> set[str]:
+        """Get direct dependencies of the file."""
+        deps = set(entry[3])
+        for name in entry[4]:
+            deps.update(packages.get(name) or packages.get(name.lower(), ()))
+        deps.discard(path)
+
+        return deps
+
+    def _reverse_graph(self) -> dict[str, list[str]]:
+        """Get reverse graph: file -> files depending on it directly."""
+        if self._reverse is None:
+            packages = self._packages()
+            reverse: dict[str, list[str]] = {}
+
+            for path, entry in self.files.items():
+                for dep in self._direct(path, entry, packages):
+                    reverse.setdefault(dep, []).append(path)
+
+            self._reverse = reverse
+
+        return self._reverse
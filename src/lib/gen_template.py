@@ -1,14 +1,66 @@
 """Collection of file generators."""
 
+from __future__ import annotations
+
 import datetime
+import re
+from typing import TYPE_CHECKING, ClassVar, Iterable
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.hdl_parser import HdlParameter, HdlPort
+    except ImportError:
+        from src.lib.hdl_parser import HdlParameter, HdlPort
+
+
+class Skeleton:
+    """
+    Static text of a template compiled once: chunks of text between fields.
+
+    Fields are marked in the text by names wrapped in NUL characters; rendering only joins the chunks with values.
+    """
+
+    __slots__ = ("parts",)
+
+    _FIELD = re.compile("\0(\\w+)\0")
+
+    def __init__(self, text: str) -> None:
+        """Init. Odd parts are names of fields."""
+        self.parts = self._FIELD.split(text)
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        return "Skeleton(fields=" + str(self.parts[1::2]) + ")"
+
+    @staticmethod
+    def field(name: str) -> str:
+        """Marker of field."""
+        return "\0" + name + "\0"
+
+    def render(self, values: dict[str, str]) -> str:
+        """Substitute fields."""
+        parts = self.parts[:]
+        parts[1::2] = [values[name] for name in parts[1::2]]
+
+        return "".join(parts)
 
 
 class BaseTemplate:
-    """Base template. Contain general patterns."""
+    """
+    Base template. Contain general patterns.
+
+    The body is built by a list of parts joined on read. A template forms its text by compose() once per class and
+    config (attributes except fields), insert() renders the cached skeleton with values of FIELDS.
+    """
+
+    FIELDS: tuple[str, ...] = ("date",)
+
+    # (class, config) -> compiled skeleton
+    _skeletons: ClassVar[dict[tuple, Skeleton]] = {}
 
     def __init__(self) -> None:
         """Init, set base patterns."""
-        self.body = ""
+        self._parts: list[str] = []
         self.date = ""
 
         self.comm_sym = "//"
@@ -18,8 +70,53 @@ class BaseTemplate:
 
         self.get_date()
 
-    def insert(self) -> None:
-        """Form full template."""
+    @property
+    def body(self) -> str:
+        """Formed text."""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+
+        return self._parts[0] if self._parts else ""
+
+    @body.setter
+    def body(self, txt: str) -> None:
+        """Replace formed text."""
+        self._parts = [txt] if txt else []
+
+    def insert(self) -> str:
+        """Form full template: render the skeleton with fields."""
+        self.body = self.skeleton().render({name: getattr(self, name) for name in self.FIELDS})
+
+        return self.body
+
+    def compose(self) -> None:
+        """Form the text of the template into the body (fields are markers while the skeleton is compiled)."""
+
+    def config(self) -> tuple:
+        """Attributes the static text depends on."""
+        return tuple(sorted(
+            (name, value) for name, value in vars(self).items() if not name.startswith("_") and name not in self.FIELDS
+        ))
+
+    def skeleton(self) -> Skeleton:
+        """Get compiled skeleton of the template."""
+        key = (type(self), self.config())
+        skeleton = self._skeletons.get(key)
+        if skeleton is not None:
+            return skeleton
+
+        values = {name: getattr(self, name) for name in self.FIELDS}
+        try:
+            for name in self.FIELDS:
+                setattr(self, name, Skeleton.field(name))
+            self.body = ""
+            self.compose()
+            skeleton = self._skeletons[key] = Skeleton(self.body)
+        finally:
+            for name, value in values.items():
+                setattr(self, name, value)
+
+        return skeleton
 
     def get_date(self) -> None:
         """Get date."""
@@ -29,7 +126,10 @@ class BaseTemplate:
 
     def add_new_line(self, txt: str, pad_h: int = 0, pad_v: int = 0) -> None:
         """Add new line of text."""
-        self.body += (" " * pad_h) + txt + "\n" + ("\n" * pad_v)
+        if pad_h:
+            self._parts.append(" " * pad_h)
+        self._parts.append(txt)
+        self._parts.append("\n" * (pad_v + 1))
 
     def sep_line(self, pattern: str, end: str = "\n") -> str:
         """Generate dividing line."""
@@ -47,6 +147,8 @@ class BaseTemplate:
 class SrcTemplate(BaseTemplate):
     """Template of verilog source."""
 
+    FIELDS = ("date", "name", "parameters", "ports")
+
     SECT_DESCRIPTION = "Description"
     SECT_CHECKING = "Checking parameters"
     SECT_VARS = "Vars and genvar signals"
@@ -63,7 +165,24 @@ class SrcTemplate(BaseTemplate):
 
         self.name = "__name__"
 
-    def insert(self) -> str:
+        # declarations of the header, set by set_header()
+        self.parameters = "    parameter SIM = 0\n"
+        self.ports = "    input                        RST,\n    input                        CLK\n"
+
+    def set_header(self, parameters: Iterable[HdlParameter], ports: Iterable[HdlPort]) -> None:
+        """Set parameters and ports of the module."""
+        self.parameters = ",\n".join(
+            "    parameter " + parameter.name + " = " + (parameter.default or "0") for parameter in parameters
+        )
+        self.parameters += "\n" if self.parameters else ""
+
+        self.ports = ",\n".join(
+            "    " + " ".join(filter(None, (port.direction or "input", port.kind, port.width))).ljust(29) + port.name
+            for port in ports
+        )
+        self.ports += "\n" if self.ports else ""
+
+    def compose(self) -> None:
         """Form full template."""
         self.add_new_line("`timescale 1ns / 1ps", pad_v=1)
         self.add_new_line(self.wrap_section(self.SECT_DESCRIPTION, end=""))
@@ -87,15 +206,12 @@ class SrcTemplate(BaseTemplate):
 
         self.add_new_line("endmodule")
 
-        return self.body
-
     def get_module(self) -> str:
         """Form base module entity."""
         txt = "module " + self.name + " #(\n"
-        txt += "    parameter SIM = 0\n"
+        txt += self.parameters
         txt += ")(\n"
-        txt += "    input                        RST,\n"
-        txt += "    input                        CLK\n"
+        txt += self.ports
         txt += ");\n"
 
         return txt
@@ -104,6 +220,13 @@ class SrcTemplate(BaseTemplate):
 class TbTemplate(BaseTemplate):
     """Template of testbench verilog source."""
 
+    FIELDS = ("date", "name", "uut_parameters", "inputs", "outputs", "uut")
+
+    _CLK = re.compile(r"(?i)^a?(clk|clock)|_(clk|clock)$")
+    _RST = re.compile(r"(?i)^a?(rst|reset)|_(rst|reset)(_?n)?$")
+    _ACTIVE_LOW = re.compile(r"(?i)(_n|rstn|resetn)$")
+    _NET_TYPES = frozenset(("wire", "reg", "logic", "bit", "var", "tri", "wand", "wor", "signed", "unsigned"))
+
     SECT_DESCRIPTION = "Description"
     SECT_PARAMETERS = "Parameters of UUT"
     SECT_IN = "Inputs"
@@ -123,8 +246,74 @@ class TbTemplate(BaseTemplate):
         self.name = "__name__"
 
         self.name_clk_period = "PERIOD"
-
-    def insert(self) -> str:
+        self.name_clk = "CLK"
+        self.name_rst = "RST"
+        self.rst_active_low = False
+
+        # declarations of the UUT, set by set_uut()
+        self.uut_parameters = ""
+        self.inputs = ""
+        self.outputs = ""
+        self.uut = ""
+
+    def set_uut(
+        self,
+        parameters: Iterable[HdlParameter],
+        ports: Iterable[HdlPort],
+        localparams: Iterable[HdlParameter] = (),
+    ) -> None:
+        """
+        Declare parameters and ports of the module under test and instantiate it.
+
+        Inputs are driven by regs, other ports are wires, interface ports are left to the user with a comment.
+        Localparams of the header are declared too, widths of ports may use them. The first inputs named as a clock
+        and a reset are driven by the clock scheme and the initial block, without them the stimulus is omitted.
+        """
+        parameters = list(parameters)
+        ports = list(ports)
+
+        self.uut_parameters = "".join(
+            "parameter " + parameter.name + " = " + (parameter.default or "0") + ";\n" for parameter in parameters
+        ) + "".join(
+            "localparam " + parameter.name + " = " + (parameter.default or "0") + ";\n" for parameter in localparams
+        )
+
+        inputs = [port for port in ports if port.direction == "input"]
+        self.inputs = "".join(self._declare("reg", port) for port in inputs)
+        self.outputs = "".join(
+            self._declare_interface(port) if self._is_interface(port) else self._declare("wire", port)
+            for port in ports if port.direction != "input"
+        )
+
+        clocks = [port.name for port in inputs if self._CLK.search(port.name)]
+        resets = [port.name for port in inputs if self._RST.search(port.name)]
+        self.name_clk = clocks[0] if clocks else ""
+        self.name_rst = resets[0] if resets else ""
+        self.rst_active_low = bool(self._ACTIVE_LOW.search(self.name_rst))
+
+        txt = self.name
+        if parameters:
+            txt += " #(\n" + ",\n".join("    ." + parameter.name + "(" + parameter.name + ")"
+                                         for parameter in parameters) + "\n)"
+        txt += " uut (\n" + ",\n".join("    ." + port.name + "(" + port.name + ")" for port in ports) + "\n);\n"
+        self.uut = txt
+
+    @staticmethod
+    def _declare(kind: str, port: HdlPort) -> str:
+        """Declare signal of port."""
+        return kind + " " + (port.width + " " if port.width else "") + port.name + ";\n"
+
+    @classmethod
+    def _is_interface(cls, port: HdlPort) -> bool:
+        """Port without direction typed by an interface (`axi_if.master bus`), not by a net or a variable."""
+        return not port.direction and bool(port.kind) and port.kind.split()[0].split(".")[0] not in cls._NET_TYPES
+
+    @staticmethod
+    def _declare_interface(port: HdlPort) -> str:
+        """Leave interface port to the user: its instance depends on ports of the interface."""
+        return "// " + port.kind + " " + port.name + ": declare an instance of " + port.kind.split(".")[0] + "\n"
+
+    def compose(self) -> None:
         """Form full testbench template."""
         self.add_new_line("`timescale 1ns / 1ps", pad_v=1)
         self.add_new_line(self.wrap_section(self.SECT_DESCRIPTION, end=""))
@@ -138,15 +327,15 @@ class TbTemplate(BaseTemplate):
 
         self.add_new_line(txt, pad_v=1)
 
-        self.add_new_line(self.wrap_section(self.SECT_PARAMETERS), pad_v=2)
-        self.add_new_line(self.wrap_section(self.SECT_IN), pad_v=2)
-        self.add_new_line(self.wrap_section(self.SECT_OUT), pad_v=2)
+        self.add_new_line(self.wrap_section(self.SECT_PARAMETERS) + self.uut_parameters, pad_v=2)
+        self.add_new_line(self.wrap_section(self.SECT_IN) + self.inputs, pad_v=2)
+        self.add_new_line(self.wrap_section(self.SECT_OUT) + self.outputs, pad_v=2)
         self.add_new_line(self.wrap_section(self.SECT_PARSIM))
         self.add_new_line(self.get_parameters(), pad_v=1)
 
         self.add_new_line(self.wrap_section(self.SECT_VARS), pad_v=2)
         self.add_new_line(self.wrap_section(self.SECT_INCLUDE), pad_v=2)
-        self.add_new_line(self.wrap_section(self.SECT_UUT), pad_v=2)
+        self.add_new_line(self.wrap_section(self.SECT_UUT) + self.uut, pad_v=2)
 
         self.add_new_line(self.wrap_section(self.SECT_INIT))
         self.add_new_line(self.get_initial())
@@ -158,19 +347,18 @@ class TbTemplate(BaseTemplate):
 
         self.add_new_line("endmodule")
 
-        return self.body
-
     def get_parameters(self) -> str:
         """Form parameters template."""
         return "parameter " + self.name_clk_period + " = 10000;"
 
     def get_initial(self) -> str:
-        """Form initial entity."""
+        """Form initial entity. The reset is released after 15 periods if there is one."""
         txt = "initial begin\n"
-        txt += "    RST = 1;\n"
-        txt += "    #(" + self.name_clk_period + "/2);\n"
-        txt += "    #(" + self.name_clk_period + "*15);\n"
-        txt += "    RST = 0;\n"
+        if self.name_rst:
+            txt += "    " + self.name_rst + " = " + ("0" if self.rst_active_low else "1") + ";\n"
+            txt += "    #(" + self.name_clk_period + "/2);\n"
+            txt += "    #(" + self.name_clk_period + "*15);\n"
+            txt += "    " + self.name_rst + " = " + ("1" if self.rst_active_low else "0") + ";\n"
         txt += "    #(" + self.name_clk_period + "*50);\n\n\n"
         txt += "    // user code\n"
         txt += "end\n"
@@ -178,11 +366,14 @@ class TbTemplate(BaseTemplate):
         return txt
 
     def get_clk(self) -> str:
-        """Form clock scheme."""
+        """Form clock scheme, empty if there is no clock."""
+        if not self.name_clk:
+            return ""
+
         txt = "always begin\n"
-        txt += "    CLK = 1'b1;\n"
+        txt += "    " + self.name_clk + " = 1'b1;\n"
         txt += "    #(" + self.name_clk_period + "/2);\n"
-        txt += "    CLK = 1'b0;\n"
+        txt += "    " + self.name_clk + " = 1'b0;\n"
         txt += "    #(" + self.name_clk_period + "/2);\n"
         txt += "end\n"
 
@@ -195,6 +386,7 @@ class GitignoreTemplate(BaseTemplate):
     SEC_USER = "User Section"
     SEC_SUBL = "Sublime Text Section"
     SEC_FOLDERS = "Folder Section"
+    SEC_CACHE = "Cache Section"
     SEC_EXT = "Extensions Section"
 
     def __init__(self) -> None:
@@ -204,7 +396,7 @@ class GitignoreTemplate(BaseTemplate):
         self.comm_sym = "#"
         self.max_length = 60
 
-    def insert(self) -> str:
+    def compose(self) -> None:
         """Form base .gitignore file."""
         self.add_new_line(self.wrap_section(self.SEC_USER), pad_v=2)
 
@@ -212,12 +404,21 @@ class GitignoreTemplate(BaseTemplate):
         self.add_new_line("*.sublime-workspace", pad_v=1)
 
         self.add_new_line(self.wrap_section(self.SEC_FOLDERS))
-        self.add_new_line("build", pad_v=1)
+        self.add_new_line("build")
+        self.add_new_line("ooc_cache", pad_v=1)
+
+        self.add_new_line(self.wrap_section(self.SEC_CACHE))
+        self.add_new_line("script/.src_snapshot.json")
+        self.add_new_line("script/.module_index.json")
+        self.add_new_line("script/.symbol_index.db*")
+        self.add_new_line("script/.dep_index.json")
+        self.add_new_line("script/ooc_modules.tcl")
+        self.add_new_line("script/.build_history.jsonl")
+        self.add_new_line("script/.report_trend.db*")
+        self.add_new_line("script/.tb_parse_cache.json", pad_v=1)
 
         self.add_new_line(self.wrap_section(self.SEC_EXT))
 
-        return self.body
-
 
 class ReadmeTemplate(BaseTemplate):
     """Form readme.md file."""
@@ -226,12 +427,10 @@ class ReadmeTemplate(BaseTemplate):
         """Init and change some patterns."""
         super().__init__()
 
-    def insert(self) -> str:
-        """Form base .gitignore file."""
+    def compose(self) -> None:
+        """Form base readme.md file."""
         self.add_new_line("Readme.")
 
-        return self.body
-
 
 class ChangelogTemplate(BaseTemplate):
     """Form changelog.md file."""
@@ -240,8 +439,8 @@ class ChangelogTemplate(BaseTemplate):
         """Init and change some patterns."""
         super().__init__()
 
-    def insert(self) -> str:
-        """Form base .gitignore file."""
+    def compose(self) -> None:
+        """Form base changelog.md file."""
         txt = "# Changelog\n\n"
         txt += "All notable changes to this project will be documented in this file.\n\n"
         txt += "The format is based on [Keep a Changelog](https://keepachangelog.com/en/1.1.0/), "
@@ -257,14 +456,20 @@ class ChangelogTemplate(BaseTemplate):
 
         self.add_new_line(txt)
 
-        return self.body
-
 
 class BuildTemplate(BaseTemplate):
     """Form build.tcl file."""
 
     TCL = 0
     BAT = 1
+    TCL_INCR = 2
+    BAT_INCR = 3
+    TCL_OOC = 4
+    BAT_OOC = 5
+    TCL_SWEEP_SYNTH = 6
+    TCL_SWEEP_IMPL = 7
+    SH = 8
+    SH_INCR = 9
 
     def __init__(self) -> None:
         """Init and change some patterns."""
@@ -281,17 +486,35 @@ class BuildTemplate(BaseTemplate):
 
         self.dir_tmp = "build"
         self.path2build = "..\\script\\build.tcl"
+        self.path2build_incr = "..\\script\\build_incr.tcl"
+        self.path2build_ooc = "..\\script\\build_ooc.tcl"
+
+        # incremental flow: checkpoints dir (in dir_tmp), read xdc in synthesis (xdc change restarts synthesis)
+        self.dir_ckpt = "incr"
+        self.xdc_in_synth = False
+        self.synth_directive = "Default"
+        self.impl_directive = "Default"
 
     def insert(self, file_type: int = TCL) -> str:
         """Form base .gitignore file."""
         self.body = ""
 
-        if file_type == self.TCL:
-            self.add_new_line(self.build_tcl())
-        elif file_type == self.BAT:
-            self.add_new_line(self.build_bat())
-        else:
-            pass
+        builders = {
+            self.TCL: self.build_tcl,
+            self.BAT: self.build_bat,
+            self.TCL_INCR: self.build_incr_tcl,
+            self.BAT_INCR: lambda: self.build_bat(incremental=True),
+            self.TCL_OOC: self.build_ooc_tcl,
+            self.BAT_OOC: lambda: self.build_bat(path2build=self.path2build_ooc),
+            self.TCL_SWEEP_SYNTH: self.build_sweep_synth_tcl,
+            self.TCL_SWEEP_IMPL: self.build_sweep_impl_tcl,
+            self.SH: self.build_sh,
+            self.SH_INCR: lambda: self.build_sh(incremental=True),
+        }
+
+        builder = builders.get(file_type)
+        if builder is not None:
+            self.add_new_line(builder())
 
         return self.body
 
@@ -330,16 +553,366 @@ class BuildTemplate(BaseTemplate):
 
         txt += "# ---------------------------------------------------------\n\n"
 
+        txt += 'puts "INFO: \\[Automatons\\] Jobs: ' + str(self.jobs) + '"\n'
         txt += "launch_runs synth_1 -jobs " + str(self.jobs) + "\n"
         txt += "wait_on_run synth_1\n\n"
 
         txt += "launch_runs impl_1 -to_step write_bitstream -jobs " + str(self.jobs) + "\n"
         txt += "wait_on_run impl_1\n"
 
+        txt += "\nopen_run impl_1\n"
+        txt += self.build_reports_tcl()
+
+        return txt
+
+    def build_incr_tcl(self) -> str:
+        """
+        Generate build_incr.tcl file: non-project flow with checkpoint reuse.
+
+        Synthesis is keyed on sources, block design, part, top and synthesis settings; implementation is keyed on
+        the synthesis key, constraints and implementation settings. A key is a list of path, mtime and size of
+        inputs, so it is computed without reading files. Unchanged synthesis reuses post_synth.dcp, changed one runs
+        incremental synthesis from the previous checkpoint; implementation is incremental from post_route.dcp.
+        """
+        return (
+            self._incr_procs_tcl() + self._incr_settings_tcl() + self._incr_keys_tcl() + self._incr_synth_tcl()
+            + self._incr_impl_tcl()
+        )
+
+    @staticmethod
+    def _incr_procs_tcl() -> str:
+        """Generate procs of build_incr.tcl: sources and keys of inputs."""
+        txt = ""
+
+        txt += "proc add_sources {source_list} {\n"
+        txt += "    foreach j $source_list {\n"
+        txt += "        add_files $j\n"
+        txt += "    }\n"
+        txt += "}\n\n"
+
+        txt += "proc inputs_key {files settings} {\n"
+        txt += "    set key $settings\n"
+        txt += "    foreach path $files {\n"
+        txt += "        if {[file exists $path]} {\n"
+        txt += '            append key "\\n$path [file mtime $path] [file size $path]"\n'
+        txt += "        } else {\n"
+        txt += '            append key "\\n$path -"\n'
+        txt += "        }\n"
+        txt += "    }\n"
+        txt += "    return $key\n"
+        txt += "}\n\n"
+
+        txt += "proc read_key {path} {\n"
+        txt += '    if {![file exists $path]} { return "" }\n'
+        txt += "    set fd [open $path r]\n"
+        txt += "    set key [read $fd]\n"
+        txt += "    close $fd\n"
+        txt += "    return $key\n"
+        txt += "}\n\n"
+
+        txt += "proc write_key {path key} {\n"
+        txt += "    set fd [open $path w]\n"
+        txt += "    puts -nonewline $fd $key\n"
+        txt += "    close $fd\n"
+        txt += "}\n\n"
+
+        return txt
+
+    def _incr_settings_tcl(self) -> str:
+        """Generate settings of build_incr.tcl and read the source list."""
+        txt = ""
+
+        txt += 'set glob_dir_build_scripts "../script"\n'
+        txt += 'set path2constrain "../xdc/main.xdc"\n'
+        txt += 'set path2block_design "$glob_dir_build_scripts/' + self.path2block_design + '"\n'
+        txt += "set source_top main\n"
+        txt += "set part " + self.part + "\n"
+        txt += "set prj_name " + self.prj_name + "\n"
+        txt += "set jobs " + str(self.jobs) + "\n"
+        txt += "set xdc_in_synth " + ("1" if self.xdc_in_synth else "0") + "\n"
+        txt += "set synth_directive " + self.synth_directive + "\n"
+        txt += "set impl_directive " + self.impl_directive + "\n"
+        txt += "set dir_ckpt " + self.dir_ckpt + "\n\n"
+
+        txt += 'source "$glob_dir_build_scripts/get_list_sources.tcl"\n'
+        txt += "set list_sources [get_final_src_list]\n\n"
+
+        txt += "set_param general.maxThreads $jobs\n"
+        txt += 'puts "INFO: \\[Automatons\\] Jobs: $jobs"\n'
+        txt += "file mkdir $dir_ckpt\n\n"
+
+        return txt
+
+    @staticmethod
+    def _incr_keys_tcl() -> str:
+        """Generate keys of synthesis and implementation inputs of build_incr.tcl."""
+        txt = ""
+
+        txt += "# ---------------------------------------------------------\n"
+        txt += "# keys of inputs\n\n"
+
+        txt += "set synth_inputs [concat $list_sources [list $path2block_design]]\n"
+        txt += "if {$xdc_in_synth} { lappend synth_inputs $path2constrain }\n"
+        txt += 'set synth_key [inputs_key $synth_inputs "part=$part top=$source_top synth=$synth_directive"]\n'
+        txt += 'set impl_key "$synth_key\\n[inputs_key [list $path2constrain] "impl=$impl_directive"]"\n\n'
+
+        txt += "set post_synth $dir_ckpt/post_synth.dcp\n"
+        txt += "set post_route $dir_ckpt/post_route.dcp\n"
+        txt += "set bitstream $dir_ckpt/$prj_name.bit\n\n"
+
+        return txt
+
+    @staticmethod
+    def _incr_synth_tcl() -> str:
+        """Generate synthesis of build_incr.tcl: reuse of the checkpoint or incremental synthesis."""
+        txt = ""
+
+        txt += "# ---------------------------------------------------------\n"
+        txt += "# synthesis\n\n"
+
+        txt += "if {$synth_key eq [read_key $dir_ckpt/synth.key] && [file exists $post_synth]} {\n"
+        txt += '    puts "INFO: \\[Automatons\\] Synthesis inputs are unchanged, reuse $post_synth"\n'
+        txt += "    open_checkpoint $post_synth\n"
+        txt += "} else {\n"
+        txt += "    file delete -force $dir_ckpt/synth.key $dir_ckpt/impl.key\n\n"
+
+        txt += "    create_project -in_memory -part $part\n"
+        txt += "    add_sources $list_sources\n"
+        txt += "    source $path2block_design\n"
+        txt += "    if {$xdc_in_synth} { read_xdc $path2constrain }\n\n"
+
+        txt += "    if {[file exists $post_synth]} {\n"
+        txt += "        read_checkpoint -incremental $post_synth\n"
+        txt += "        synth_design -top $source_top -part $part -directive $synth_directive "
+        txt += "-incremental_mode default\n"
+        txt += "    } else {\n"
+        txt += "        synth_design -top $source_top -part $part -directive $synth_directive\n"
+        txt += "    }\n\n"
+
+        txt += "    write_checkpoint -force $post_synth\n"
+        txt += "    write_key $dir_ckpt/synth.key $synth_key\n"
+        txt += "}\n\n"
+
+        return txt
+
+    def _incr_impl_tcl(self) -> str:
+        """Generate implementation of build_incr.tcl: incremental from the routed checkpoint."""
+        txt = ""
+
+        txt += "# ---------------------------------------------------------\n"
+        txt += "# implementation\n\n"
+
+        txt += "if {$impl_key eq [read_key $dir_ckpt/impl.key] && [file exists $post_route] "
+        txt += "&& [file exists $bitstream]} {\n"
+        txt += '    puts "INFO: \\[Automatons\\] Implementation inputs are unchanged, $bitstream is up to date"\n'
+        txt += "} else {\n"
+        txt += "    file delete -force $dir_ckpt/impl.key\n\n"
+
+        txt += "    if {!$xdc_in_synth} { read_xdc $path2constrain }\n\n"
+
+        txt += "    opt_design\n"
+        txt += "    if {[file exists $post_route]} { read_checkpoint -incremental $post_route }\n"
+        txt += "    place_design -directive $impl_directive\n"
+        txt += "    phys_opt_design\n"
+        txt += "    route_design -directive $impl_directive\n\n"
+
+        txt += "    write_checkpoint -force $post_route\n"
+        txt += "    write_bitstream -force $bitstream\n"
+        txt += self.build_reports_tcl("    ")
+        txt += "    write_key $dir_ckpt/impl.key $impl_key\n"
+        txt += "}\n"
+
+        return txt
+
+    def build_ooc_tcl(self) -> str:
+        """
+        Generate build_ooc.tcl file: non-project flow with out-of-context synthesis of selected modules.
+
+        Modules, their keys and sources come from ooc_modules.tcl (written by the source update). A module is
+        synthesized out of context only if the checkpoint of its key is absent in the cache, then the top is
+        synthesized with stubs of OOC modules and their checkpoints are linked into the cells.
+        """
+        return self._ooc_settings_tcl() + self._ooc_modules_tcl() + self._ooc_top_tcl() + self._ooc_impl_tcl()
+
+    def _ooc_settings_tcl(self) -> str:
+        """Generate settings of build_ooc.tcl and read ooc_modules.tcl."""
+        txt = ""
+
+        txt += "proc add_sources {source_list} {\n"
+        txt += "    foreach j $source_list {\n"
+        txt += "        add_files $j\n"
+        txt += "    }\n"
+        txt += "}\n\n"
+
+        txt += 'set glob_dir_build_scripts "../script"\n'
+        txt += 'set path2constrain "../xdc/main.xdc"\n'
+        txt += 'set path2block_design "$glob_dir_build_scripts/' + self.path2block_design + '"\n'
+        txt += "set source_top main\n"
+        txt += "set part " + self.part + "\n"
+        txt += "set prj_name " + self.prj_name + "\n"
+        txt += "set jobs " + str(self.jobs) + "\n"
+        txt += "set synth_directive " + self.synth_directive + "\n"
+        txt += "set impl_directive " + self.impl_directive + "\n\n"
+
+        txt += 'if {![file exists "$glob_dir_build_scripts/ooc_modules.tcl"]} {\n'
+        txt += '    error "ooc_modules.tcl is not found, set ooc_modules in project settings and update sources"\n'
+        txt += "}\n"
+        txt += 'source "$glob_dir_build_scripts/ooc_modules.tcl"\n'
+        txt += "set ooc_cache [get_ooc_cache_dir]\n\n"
+
+        txt += "set_param general.maxThreads $jobs\n"
+        txt += 'puts "INFO: \\[Automatons\\] Jobs: $jobs"\n\n'
+
+        return txt
+
+    @staticmethod
+    def _ooc_modules_tcl() -> str:
+        """Generate out-of-context synthesis of build_ooc.tcl for modules missing in the cache."""
+        txt = ""
+
+        txt += "# ---------------------------------------------------------\n"
+        txt += "# out-of-context synthesis of modules missing in the cache\n\n"
+
+        txt += "set ooc_cells {}\n"
+        txt += "foreach entry [get_ooc_modules] {\n"
+        txt += "    lassign $entry module key sources\n"
+        txt += '    set dcp "$ooc_cache/$module/${key}_$part.dcp"\n'
+        txt += '    set stub "$ooc_cache/$module/${key}_${part}_stub.v"\n\n'
+
+        txt += "    if {[file exists $dcp] && [file exists $stub]} {\n"
+        txt += '        puts "INFO: \\[Automatons\\] OOC module $module is cached, reuse $dcp"\n'
+        txt += "        file mtime $dcp [clock seconds]\n"
+        txt += "    } else {\n"
+        txt += "        create_project -in_memory -part $part\n"
+        txt += "        add_sources $sources\n"
+        txt += "        synth_design -mode out_of_context -top $module -part $part -directive $synth_directive\n\n"
+
+        txt += '        file mkdir "$ooc_cache/$module"\n'
+        txt += "        write_checkpoint -force $dcp\n"
+        txt += "        write_verilog -force -mode synth_stub $stub\n"
+        txt += "        close_project\n"
+        txt += "    }\n\n"
+
+        txt += "    lappend ooc_cells [list $module $dcp $stub]\n"
+        txt += "}\n\n"
+
+        return txt
+
+    @staticmethod
+    def _ooc_top_tcl() -> str:
+        """Generate synthesis of the top of build_ooc.tcl: stubs of OOC modules are linked to their checkpoints."""
+        txt = ""
+
+        txt += "# ---------------------------------------------------------\n"
+        txt += "# synthesis of the top with stubs of OOC modules\n\n"
+
+        txt += "create_project -in_memory -part $part\n"
+        txt += "add_sources [get_ooc_top_src_list]\n"
+        txt += "foreach cell $ooc_cells { add_files [lindex $cell 2] }\n"
+        txt += "source $path2block_design\n\n"
+
+        txt += "synth_design -top $source_top -part $part -directive $synth_directive\n\n"
+
+        txt += "foreach cell $ooc_cells {\n"
+        txt += "    lassign $cell module dcp stub\n"
+        txt += '    foreach inst [get_cells -hierarchical -filter "REF_NAME == $module"] {\n'
+        txt += "        read_checkpoint -cell $inst $dcp\n"
+        txt += "    }\n"
+        txt += "}\n\n"
+
+        return txt
+
+    def _ooc_impl_tcl(self) -> str:
+        """Generate implementation of build_ooc.tcl."""
+        txt = ""
+
+        txt += "# ---------------------------------------------------------\n"
+        txt += "# implementation\n\n"
+
+        txt += "read_xdc $path2constrain\n\n"
+
+        txt += "opt_design\n"
+        txt += "place_design -directive $impl_directive\n"
+        txt += "phys_opt_design\n"
+        txt += "route_design -directive $impl_directive\n\n"
+
+        txt += "write_checkpoint -force post_route.dcp\n"
+        txt += "write_bitstream -force $prj_name.bit\n"
+        txt += self.build_reports_tcl()
+
         return txt
 
-    def build_bat(self) -> str:
-        """Generate build_run.bat file."""
+    def build_reports_tcl(self, indent: str = "") -> str:
+        """Generate reports of the implemented design parsed into the report trend after the build."""
+        txt = ""
+
+        txt += indent + "file mkdir reports\n"
+        txt += indent + "report_timing_summary -file reports/timing_summary.rpt\n"
+        txt += indent + "report_utilization -file reports/utilization.rpt\n"
+
+        return txt
+
+    def build_sweep_synth_tcl(self) -> str:
+        """Generate sweep_synth.tcl file: synthesis to the checkpoint shared by runs of implementation sweep."""
+        txt = ""
+
+        txt += "# arguments: dir of build scripts, post-synthesis checkpoint, jobs\n"
+        txt += "lassign $argv glob_dir_build_scripts post_synth jobs\n\n"
+
+        txt += "proc add_sources {source_list} {\n"
+        txt += "    foreach j $source_list {\n"
+        txt += "        add_files $j\n"
+        txt += "    }\n"
+        txt += "}\n\n"
+
+        txt += "set source_top main\n"
+        txt += "set part " + self.part + "\n"
+        txt += "set synth_directive " + self.synth_directive + "\n\n"
+
+        txt += 'source "$glob_dir_build_scripts/get_list_sources.tcl"\n'
+        txt += "set list_sources [get_final_src_list]\n\n"
+
+        txt += "set_param general.maxThreads $jobs\n\n"
+
+        txt += "create_project -in_memory -part $part\n"
+        txt += "add_sources $list_sources\n"
+        txt += 'source "$glob_dir_build_scripts/' + self.path2block_design + '"\n\n'
+
+        txt += "synth_design -top $source_top -part $part -directive $synth_directive\n"
+        txt += "write_checkpoint -force $post_synth\n"
+
+        return txt
+
+    def build_sweep_impl_tcl(self) -> str:
+        """Generate sweep_impl.tcl file: one run of implementation sweep, directives are given by arguments."""
+        txt = ""
+
+        txt += "# arguments: post-synthesis checkpoint, constraints, run dir, jobs, directives of steps\n"
+        txt += "lassign $argv post_synth path2constrain run_dir jobs opt_directive place_directive "
+        txt += "phys_opt_directive route_directive\n\n"
+
+        txt += "set_param general.maxThreads $jobs\n\n"
+
+        txt += "open_checkpoint $post_synth\n"
+        txt += "read_xdc $path2constrain\n\n"
+
+        txt += "opt_design -directive $opt_directive\n"
+        txt += "place_design -directive $place_directive\n"
+        txt += "phys_opt_design -directive $phys_opt_directive\n"
+        txt += "route_design -directive $route_directive\n\n"
+
+        txt += "report_timing_summary -file $run_dir/timing_summary.rpt\n"
+        txt += "write_checkpoint -force $run_dir/post_route.dcp\n"
+        txt += "write_bitstream -force $run_dir/impl.bit\n"
+
+        return txt
+
+    def build_bat(self, *, incremental: bool = False, path2build: str | None = None) -> str:
+        """
+        Generate build_run.bat file. Incremental build keeps the build directory with checkpoints.
+
+        path2build overrides the build script (build.tcl or build_incr.tcl for incremental build).
+        """
         txt = ""
 
         txt += "chcp 65001\n"
@@ -349,18 +922,28 @@ class BuildTemplate(BaseTemplate):
         txt += "@rem declare constants (paths)\n\n"
 
         txt += f'set "dir_tmp={self.dir_tmp}"\n'
-        txt += f'set "path2build={self.path2build}"\n\n'
+        if path2build is None:
+            path2build = self.path2build_incr if incremental else self.path2build
+        txt += f'set "path2build={path2build}"\n\n'
 
-        txt += "@rem --------------------------------------------------------------------------\n"
-        txt += "@rem remove directory with built project\n\n"
+        if incremental:
+            txt += "@rem --------------------------------------------------------------------------\n"
+            txt += "@rem keep directory with checkpoints of previous build\n\n"
 
-        txt += "if not exist %dir_tmp% (\n"
-        txt += "    md %dir_tmp%\n"
-        txt += ") else (\n"
-        txt += "    echo Found %dir_tmp%. Clear content.\n"
-        txt += "    rmdir /s /q %dir_tmp%\n"
-        txt += "    md %dir_tmp%\n"
-        txt += ")\n\n"
+            txt += "if not exist %dir_tmp% (\n"
+            txt += "    md %dir_tmp%\n"
+            txt += ")\n\n"
+        else:
+            txt += "@rem --------------------------------------------------------------------------\n"
+            txt += "@rem remove directory with built project\n\n"
+
+            txt += "if not exist %dir_tmp% (\n"
+            txt += "    md %dir_tmp%\n"
+            txt += ") else (\n"
+            txt += "    echo Found %dir_tmp%. Clear content.\n"
+            txt += "    rmdir /s /q %dir_tmp%\n"
+            txt += "    md %dir_tmp%\n"
+            txt += ")\n\n"
 
         txt += "@rem --------------------------------------------------------------------------\n"
         txt += "@rem run build script\n\n"
@@ -384,3 +967,56 @@ class BuildTemplate(BaseTemplate):
 
         return txt
 
+    def build_sh(self, *, incremental: bool = False, path2build: str | None = None) -> str:
+        """Generate build_run.sh file: POSIX shell version of build_run.bat, run from the project dir."""
+        if path2build is None:
+            path2build = self.path2build_incr if incremental else self.path2build
+
+        txt = ""
+
+        txt += "#!/bin/sh\n\n"
+
+        txt += "# --------------------------------------------------------------------------\n"
+        txt += "# declare constants (paths)\n\n"
+
+        txt += 'dir_tmp="' + self.dir_tmp + '"\n'
+        txt += 'path2build="' + path2build.replace("\\", "/") + '"\n\n'
+
+        if incremental:
+            txt += "# --------------------------------------------------------------------------\n"
+            txt += "# keep directory with checkpoints of previous build\n\n"
+
+            txt += 'mkdir -p "$dir_tmp"\n\n'
+        else:
+            txt += "# --------------------------------------------------------------------------\n"
+            txt += "# remove directory with built project\n\n"
+
+            txt += 'if [ -d "$dir_tmp" ]; then\n'
+            txt += '    echo "Found $dir_tmp. Clear content."\n'
+            txt += '    rm -rf "$dir_tmp"\n'
+            txt += "fi\n"
+            txt += 'mkdir -p "$dir_tmp"\n\n'
+
+        txt += "# --------------------------------------------------------------------------\n"
+        txt += "# run build script\n\n"
+
+        txt += 'cd "$dir_tmp" || exit 1\n\n'
+
+        txt += 'if [ -n "$XILINX_VIVADO" ] && [ -f "$XILINX_VIVADO/settings64.sh" ]; then\n'
+        txt += '    . "$XILINX_VIVADO/settings64.sh"\n'
+        txt += "fi\n\n"
+
+        txt += "if ! command -v vivado > /dev/null 2>&1; then\n"
+        txt += ("    echo \"don't found vivado. Please set environment variable XILINX_VIVADO - path to Vivado, where "
+                'placed settings64.sh, or add Vivado to PATH."\n')
+        txt += "    exit 1\n"
+        txt += "fi\n\n"
+
+        txt += 'vivado -mode batch -nolog -nojournal -source "$path2build" -notrace\n'
+        txt += "status=$?\n\n"
+
+        txt += "echo Build done. Exit from Vivado.\n\n"
+
+        txt += "exit $status\n"
+
+        return txt
@@ -0,0 +1,259 @@
+"""Parser of Verilog/SystemVerilog module headers."""
+
+from __future__ import annotations
+
+import re
+
+
+class HdlPort:
+    """Port of module."""
+
+    __slots__ = ("direction", "kind", "name", "width")
+
+    def __init__(self, name: str, direction: str = "", kind: str = "", width: str = "") -> None:
+        """Init."""
+        self.name = name
+        self.direction = direction
+        self.kind = kind
+        self.width = width
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        return "HdlPort(" + " ".join(filter(None, (self.direction, self.kind, self.width, self.name))) + ")"
+
+
+class HdlParameter:
+    """Parameter of module."""
+
+    __slots__ = ("default", "name")
+
+    def __init__(self, name: str, default: str = "") -> None:
+        """Init."""
+        self.name = name
+        self.default = default
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        return "HdlParameter(" + self.name + " = " + self.default + ")"
+
+
+class HdlModule:
+    """Declaration of module: name, line of declaration, parameters, localparams of the header and ports."""
+
+    __slots__ = ("line", "localparams", "name", "parameters", "ports")
+
+    def __init__(self, name: str, line: int) -> None:
+        """Init."""
+        self.name = name
+        self.line = line
+        self.parameters: list[HdlParameter] = []
+        self.localparams: list[HdlParameter] = []
+        self.ports: list[HdlPort] = []
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        return "HdlModule(" + self.name + ", " + repr(self.parameters) + ", " + repr(self.ports) + ")"
+
+
+class VerilogHeaderParser:
+    """
+    Parser of module headers: ANSI and non-ANSI ports, parameters from the header and the body, includes.
+
+    Only headers and declarations are parsed, not the behavior, so it is fast enough for thousands of files.
+    """
+
+    DIRECTIONS = ("input", "output", "inout", "ref")
+
+    _COMMENTS = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"', re.DOTALL)
+    _MODULE = re.compile(r"\b(?:module|macromodule|interface|program)\s+(?:(?:automatic|static)\s+)?(\w+)")
+    _END = re.compile(r"\bend(?:module|interface|program)\b")
+    _IMPORT = re.compile(r"\s*import\b[^;]*;")
+    _INCLUDE = re.compile(r'`include\s+"([^"]+)"')
+    _BODY_PORTS = re.compile(r"\b(input|output|inout)\b([^;]*);")
+    _BODY_PARAMS = re.compile(r"\bparameter\b([^;]*);")
+    _IDENT = re.compile(r"[A-Za-z_]\w*")
+    _WIDTH = re.compile(r"(?:\[[^\]]*\]\s*)+")
+
+    def parse(self, text: str) -> tuple[list[HdlModule], list[tuple[str, int]]]:
+        """Parse text. Return modules and includes (target, line)."""
+        includes = [
+            (match.group(1), text.count("\n", 0, match.start()) + 1) for match in self._INCLUDE.finditer(text)
+        ]
+
+        # comments and strings are replaced by spaces of the same length to keep positions
+        text = self._COMMENTS.sub(lambda match: re.sub(r"[^\n]", " ", match.group(0)), text)
+
+        modules = []
+        pos = 0
+        while True:
+            match = self._MODULE.search(text, pos)
+            if match is None:
+                break
+
+            module = HdlModule(match.group(1), text.count("\n", 0, match.start()) + 1)
+            pos = self._parse_header(text, match.end(), module)
+
+            end = self._END.search(text, pos)
+            body_end = end.start() if end else len(text)
+            self._parse_body(text[pos:body_end], module)
+
+            modules.append(module)
+            pos = end.end() if end else len(text)
+
+        return modules, includes
+
+    def _parse_header(self, text: str, pos: int, module: HdlModule) -> int:
+        """Parse `#(parameters) (ports);`. Return position after the header."""
+        pos = self._skip_imports(text, pos)
+
+        params_text, pos = self._group(text, pos, "#")
+        if params_text is not None:
+            self._parse_parameters(params_text, module)
+
+        ports_text, pos = self._group(text, pos, "")
+        if ports_text is not None:
+            self._parse_ports(ports_text, module)
+
+        end = text.find(";", pos)
+        return len(text) if end < 0 else end + 1
+
+    def _skip_imports(self, text: str, pos: int) -> int:
+        """Skip package imports of the header (`module m import pkg::*; #(...)`)."""
+        while True:
+            match = self._IMPORT.match(text, pos)
+            if match is None:
+                return pos
+            pos = match.end()
+
+    @staticmethod
+    def _group(text: str, pos: int, prefix: str) -> tuple[str | None, int]:
+        """Get content of balanced parentheses after optional prefix. Return content and position after it."""
+        start = pos
+        while start < len(text) and text[start].isspace():
+            start += 1
+
+        if prefix:
+            if not text.startswith(prefix, start):
+                return None, pos
+            start += len(prefix)
+            while start < len(text) and text[start].isspace():
+                start += 1
+
+        if start >= len(text) or text[start] != "(":
+            return None, pos
+
+        depth = 0
+        for index in range(start, len(text)):
+            char = text[index]
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if not depth:
+                    return text[start + 1:index], index + 1
+
+        return text[start + 1:], len(text)
+
+    @staticmethod
+    def _split(text: str, sep: str = ",") -> list[str]:
+        """Split by separator outside of brackets."""
+        items = []
+        depth = 0
+        start = 0
+
+        for index, char in enumerate(text):
+            if char in "([{":
+                depth += 1
+            elif char in ")]}":
+                depth -= 1
+            elif char == sep and not depth:
+                items.append(text[start:index])
+                start = index + 1
+
+        items.append(text[start:])
+
+        return [item.strip() for item in items if item.strip()]
+
+    def _parse_parameters(self, text: str, module: HdlModule) -> None:
+        """
+        Parse list of parameter assignments.
+
+        Localparams can't be overridden by an instance, they are kept apart (widths of ports may use them). The
+        keyword applies to the following items until the next one: `#(parameter W = 8, localparam D = W * 2, E = 3)`
+        has the parameter W and localparams D and E.
+        """
+        known = {param.name for param in (*module.parameters, *module.localparams)}
+        local = False
+
+        for item in self._split(text):
+            name_part, _, default = item.partition("=")
+            idents = self._IDENT.findall(self._WIDTH.sub(" ", name_part))
+            if "localparam" in idents:
+                local = True
+            elif "parameter" in idents:
+                local = False
+            if not idents or idents[-1] in ("parameter", "localparam"):
+                continue
+
+            name = idents[-1]
+            if name not in known:
+                params = module.localparams if local else module.parameters
+                params.append(HdlParameter(name, " ".join(default.split())))
+                known.add(name)
+
+    def _parse_ports(self, text: str, module: HdlModule) -> None:
+        """Parse ANSI port list or list of names of non-ANSI ports."""
+        direction = ""
+        kind = ""
+        width = ""
+
+        for item in self._split(text):
+            words = item.split("=", 1)[0]
+
+            match = self._WIDTH.search(words)
+            item_width = " ".join(match.group(0).split()) if match and self._is_packed(words, match.end()) else ""
+            idents = self._IDENT.findall(self._WIDTH.sub(" ", words))
+            if not idents:
+                continue
+
+            name = idents[-1]
+            head = idents[:-1]
+
+            if head and head[0] in self.DIRECTIONS:
+                direction = head[0]
+                kind = " ".join(head[1:])
+                width = item_width
+            elif head and "." in words:
+                # interface port: `axi_if.master bus`
+                direction = ""
+                kind = words.rsplit(None, 1)[0].strip()
+                width = ""
+            elif head:
+                kind = " ".join(head)
+                width = item_width
+            elif item_width:
+                width = item_width
+
+            module.ports.append(HdlPort(name, direction, kind, width))
+
+    def _parse_body(self, text: str, module: HdlModule) -> None:
+        """Parse declarations of non-ANSI ports and parameters in the body."""
+        ports = {port.name: port for port in module.ports}
+
+        for match in self._BODY_PORTS.finditer(text):
+            declared = HdlModule(module.name, module.line)
+            self._parse_ports(match.group(1) + " " + match.group(2), declared)
+
+            for port in declared.ports:
+                if port.name in ports and not ports[port.name].direction:
+                    ports[port.name].direction = port.direction
+                    ports[port.name].kind = port.kind
+                    ports[port.name].width = port.width
+
+        for match in self._BODY_PARAMS.finditer(text):
+            self._parse_parameters(match.group(1), module)
+
+    @staticmethod
+    def _is_packed(words: str, pos: int) -> bool:
+        """Check that width ending at pos is before the name (packed), not after it (unpacked)."""
+        return bool(VerilogHeaderParser._IDENT.search(words, pos))
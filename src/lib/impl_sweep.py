@@ -0,0 +1,280 @@
+"""Parallel sweep of implementation strategies."""
+
+from __future__ import annotations
+
+import ctypes
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+try:
+    from Automatons.src.lib.build_runner import process_group_kwargs, terminate_tree
+    from Automatons.src.lib.vivado_reports import TimingSummary, parse_timing_summary
+except ImportError:
+    from src.lib.build_runner import process_group_kwargs, terminate_tree
+    from src.lib.vivado_reports import TimingSummary, parse_timing_summary
+
+
+def total_memory_mb() -> int:
+    """Get physical memory in MB, 0 if it is unknown."""
+    if os.name == "nt":
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [  # noqa: RUF012
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return 0
+        return status.ullTotalPhys // (1 << 20)
+
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1 << 20)
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+class SweepRun:
+    """Implementation run: directives of the steps and its result."""
+
+    __slots__ = ("name", "opt", "phys_opt", "place", "route", "run_dir", "status", "timing")
+
+    def __init__(
+        self,
+        name: str,
+        opt: str = "Default",
+        place: str = "Default",
+        phys_opt: str = "Default",
+        route: str = "Default",
+    ) -> None:
+        """Init."""
+        self.name = name
+        self.opt = opt
+        self.place = place
+        self.phys_opt = phys_opt
+        self.route = route
+
+        self.run_dir = ""
+        self.status = "pending"
+        self.timing: TimingSummary | None = None
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        return "SweepRun(" + self.name + ", " + self.status + ", " + repr(self.timing) + ")"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> SweepRun:
+        """Create run from project settings entry."""
+        return cls(
+            data["name"],
+            opt=data.get("opt", "Default"),
+            place=data.get("place", "Default"),
+            phys_opt=data.get("phys_opt", "Default"),
+            route=data.get("route", "Default"),
+        )
+
+    def to_dict(self) -> dict:
+        """Form summary entry."""
+        data = {"name": self.name, "opt": self.opt, "place": self.place, "phys_opt": self.phys_opt,
+                "route": self.route, "status": self.status}
+        if self.timing is not None:
+            data.update(wns=self.timing.wns, tns=self.timing.tns, whs=self.timing.whs, ths=self.timing.ths)
+
+        return data
+
+
+class ImplSweep:
+    """
+    Scheduler of implementation runs with different directives from the same post-synthesis checkpoint.
+
+    Synthesis runs once, then runs are executed by separate Vivado processes. Count of concurrent runs is bounded
+    by CPU cores (cpus_per_run each) and by memory budget (mem_per_run each); cores are split among concurrent runs
+    by general.maxThreads. The run with the best WNS (then TNS) gives best.bit and best_route.dcp.
+    """
+
+    SYNTH_SCRIPT = "sweep_synth.tcl"
+    IMPL_SCRIPT = "sweep_impl.tcl"
+    SUMMARY_NAME = "sweep.json"
+
+    DEFAULT_RUNS = (
+        ("default", "Default", "Default", "Default", "Default"),
+        ("explore", "Explore", "Explore", "Explore", "Explore"),
+        ("extra_net_delay", "Explore", "ExtraNetDelay_high", "AggressiveExplore", "NoTimingRelaxation"),
+        ("spread_logic", "Explore", "AltSpreadLogic_high", "AggressiveExplore", "AggressiveExplore"),
+        ("early_block", "Default", "EarlyBlockPlacement", "AlternateFlowWithRetiming", "MoreGlobalIterations"),
+    )
+
+    def __init__(
+        self,
+        path2prj: str,
+        runs: Iterable[SweepRun] | None = None,
+        vivado: str = "vivado",
+        dir_sweep: str = "build/sweep",
+        dir_script: str = "script",
+        path2constrain: str = "xdc/main.xdc",
+        cpus: int | None = None,
+        cpus_per_run: int = 2,
+        mem_budget: int | None = None,
+        mem_per_run: int = 4096,
+    ) -> None:
+        """Init. Memory is in MB, the budget is 3/4 of physical memory by default."""
+        self.runs = list(runs) if runs is not None else [SweepRun(*run) for run in self.DEFAULT_RUNS]
+
+        self.vivado = shutil.which(vivado) or vivado
+        self.path2script = os.path.join(path2prj, dir_script)
+        self.path2sweep = os.path.join(path2prj, dir_sweep)
+        self.path2constrain = os.path.join(path2prj, path2constrain)
+
+        self.cpus = cpus or os.cpu_count() or 1
+        self.cpus_per_run = max(1, cpus_per_run)
+        self.mem_budget = mem_budget if mem_budget is not None else total_memory_mb() * 3 // 4
+        self.mem_per_run = mem_per_run
+
+        self._cancel = threading.Event()
+        self._procs: set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def post_synth(self) -> str:
+        """Path to post-synthesis checkpoint shared by runs."""
+        return os.path.join(self.path2sweep, "post_synth.dcp")
+
+    def parallel(self) -> int:
+        """Get count of concurrent runs."""
+        limit = self.cpus // self.cpus_per_run
+        if self.mem_budget > 0 and self.mem_per_run > 0:
+            limit = min(limit, self.mem_budget // self.mem_per_run)
+
+        return max(1, min(limit, len(self.runs)))
+
+    def run(self, *, synth: bool = True) -> SweepRun | None:
+        """Run synthesis (if synth, or the checkpoint is absent) and the sweep. Return the best run."""
+        self._cancel.clear()
+        os.makedirs(self.path2sweep, exist_ok=True)
+
+        if (synth or not os.path.exists(self.post_synth)) and not self._synth():
+            msg = "Synthesis of the sweep failed, see " + os.path.join(self.path2sweep, "synth.log")
+            logger.error(msg)
+            return None
+
+        parallel = self.parallel()
+        jobs = max(1, self.cpus // parallel)
+        msg = "Implementation sweep: " + str(len(self.runs)) + " runs, " + str(parallel) + " in parallel"
+        logger.info(msg)
+
+        with ThreadPoolExecutor(max_workers=parallel) as pool:
+            list(pool.map(lambda run: self._impl(run, jobs), self.runs))
+
+        best = self.best()
+        if best is not None:
+            shutil.copyfile(os.path.join(best.run_dir, "impl.bit"), os.path.join(self.path2sweep, "best.bit"))
+            shutil.copyfile(os.path.join(best.run_dir, "post_route.dcp"),
+                            os.path.join(self.path2sweep, "best_route.dcp"))
+
+        self.save_summary(best)
+
+        return best
+
+    def cancel(self) -> None:
+        """Cancel the sweep: pending runs are skipped, running processes are terminated with their children."""
+        self._cancel.set()
+        with self._lock:
+            for proc in self._procs:
+                terminate_tree(proc)
+
+    def best(self) -> SweepRun | None:
+        """Get the run with the best WNS, then TNS."""
+        done = [run for run in self.runs if run.status == "done" and run.timing is not None]
+        if not done:
+            return None
+
+        return max(done, key=lambda run: (run.timing.wns, run.timing.tns))
+
+    def save_summary(self, best: SweepRun | None) -> None:
+        """Save summary of runs to json file."""
+        data = {"best": best.name if best else None, "runs": [run.to_dict() for run in self.runs]}
+
+        with open(os.path.join(self.path2sweep, self.SUMMARY_NAME), "w") as file:
+            json.dump(data, file, indent=4)
+
+    def _synth(self) -> bool:
+        """Synthesize design to the shared checkpoint."""
+        args = [self.path2script, self.post_synth, str(self.cpus)]
+
+        return self._vivado(self.SYNTH_SCRIPT, args, self.path2sweep, "synth.log") == 0
+
+    def _impl(self, run: SweepRun, jobs: int) -> None:
+        """Execute run and parse its timing summary."""
+        if self._cancel.is_set():
+            run.status = "cancelled"
+            return
+
+        run.run_dir = os.path.join(self.path2sweep, run.name)
+        os.makedirs(run.run_dir, exist_ok=True)
+        run.status = "running"
+
+        args = [self.post_synth, self.path2constrain, run.run_dir, str(jobs), run.opt, run.place, run.phys_opt,
+                run.route]
+        code = self._vivado(self.IMPL_SCRIPT, args, run.run_dir, "impl.log")
+
+        if self._cancel.is_set():
+            run.status = "cancelled"
+            return
+
+        try:
+            with open(os.path.join(run.run_dir, "timing_summary.rpt")) as file:
+                run.timing = parse_timing_summary(file.read())
+        except OSError:
+            run.timing = None
+
+        run.status = "done" if code == 0 and run.timing is not None else "failed"
+
+        msg = "Run " + run.name + ": " + run.status
+        if run.timing is not None:
+            msg += ", WNS " + str(run.timing.wns) + ", TNS " + str(run.timing.tns)
+        logger.info(msg)
+
+    def _vivado(self, script: str, args: list[str], cwd: str, log_name: str) -> int:
+        """Execute Vivado script in batch mode. Return exit code."""
+        command = [self.vivado, "-mode", "batch", "-nolog", "-nojournal", "-notrace",
+                   "-source", os.path.join(self.path2script, script), "-tclargs", *args]
+
+        with open(os.path.join(cwd, log_name), "w") as log:
+            try:
+                proc = subprocess.Popen(
+                    command, cwd=cwd, stdout=log, stderr=subprocess.STDOUT, **process_group_kwargs(),
+                )
+            except OSError:
+                msg = "Can't run Vivado: " + self.vivado
+                logger.exception(msg)
+                return -1
+
+            with self._lock:
+                self._procs.add(proc)
+                if self._cancel.is_set():
+                    terminate_tree(proc)
+            try:
+                return proc.wait()
+            finally:
+                with self._lock:
+                    self._procs.discard(proc)
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import posixpath
 import re
+import tempfile
+from typing import Iterable, Iterator
 
 try:
     from loguru import logger
@@ -11,32 +16,432 @@ except ImportError:
     logger = MockLogger()
 
 
-class SrcListGenerator:
-    """A class to generate TCL scripts for managing source file lists."""
+def normalize_path(file_path: str) -> str:
+    """Convert path to the form used in tcl scripts (forward slashes)."""
+    return file_path.replace("\\", "/")
+
+
+def tcl_quote(word: str) -> str:
+    """
+    Quote word as an element of tcl list if it contains spaces or special characters.
+
+    Braces keep the word as is, but only balanced braces without backslashes can be braced: otherwise special
+    characters are escaped by backslashes.
+    """
+    if word and not any(char in _TCL_SPECIAL for char in word) and not word.startswith("#"):
+        return word
+
+    if "\\" not in word and _balanced(word):
+        return "{" + word + "}"
+
+    escaped = "".join(_TCL_ESCAPES.get(char, "\\" + char if char in _TCL_SPECIAL else char) for char in word)
+
+    return "\\" + escaped if escaped.startswith("#") else escaped
+
+
+def write_if_changed(file_path: str, content: str) -> bool:
+    """Write file if its content differs, atomically (temp file + rename). Return True if the file was changed."""
+    try:
+        with open(file_path) as file:
+            old_digest = hashlib.sha256(file.read().encode()).digest()
+    except OSError:
+        old_digest = b""
+
+    if old_digest == hashlib.sha256(content.encode()).digest():
+        return False
+
+    dir_path = os.path.dirname(os.path.abspath(file_path))
+    try:
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=os.path.splitext(file_path)[1], dir=dir_path)
+    except FileNotFoundError:
+        msg = "Not found dir of file: " + file_path
+        logger.warning(msg)
+        return False
+
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(content)
+        os.chmod(tmp_path, _file_mode(file_path))
+        os.replace(tmp_path, file_path)
+    except OSError:
+        os.remove(tmp_path)
+        raise
+
+    return True
+
+
+def _file_mode(file_path: str) -> int:
+    """Get permissions for the replacing file: keep the old ones, mkstemp creates owner-only file."""
+    try:
+        return os.stat(file_path).st_mode & 0o777
+    except OSError:
+        return 0o644
+
+
+def _balanced(word: str) -> bool:
+    """Braces of the word are balanced."""
+    depth = 0
+    for char in word:
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth < 0:
+                return False
+
+    return depth == 0
+
+
+_TCL_SPECIAL = frozenset(' \t\n"{}[]$;\\')
+_TCL_ESCAPES = {"\n": "\\n", "\t": "\\t"}
+_TCL_UNESCAPES = {"n": "\n", "t": "\t"}
+_RETURN = re.compile(r"(?:^|[\s{;])return\s+\{")
+
+
+class TclListReader:
+    """
+    Single-pass reader of source lists from get_list_sources.tcl.
+
+    Lines are fed one by one, so memory is bound by the lists, not by the file. Elements of the list in
+    `return { ... }` of known procs are tokenized as tcl words: bare (with backslash escapes), braced ({a b}) or
+    quoted ("a b"). Lines started with # inside the list are comments.
+    """
+
+    PROC_USER = "get_user_src_list"
+    PROC_EXCLUDE = "get_exclude_src_list"
+    PROC_AUTO = "get_auto_src_list"
 
     def __init__(self) -> None:
+        """Init."""
+        self.lists: dict[str, list[str]] = {self.PROC_USER: [], self.PROC_EXCLUDE: [], self.PROC_AUTO: []}
+
+        self._proc: str | None = None
+        self._in_list = False
+
+        self._word: list[str] = []
+        self._has_word = False
+        self._depth = 0
+        self._quoted = False
+        self._escaped = False
+
+    def feed(self, line: str) -> None:
+        """Process next line of the script."""
+        if self._in_list:
+            self._feed_list(line)
+            return
+
+        words = line.split()
+        if not words:
+            return
+
+        if words[0] == "proc":
+            self._proc = words[1] if len(words) > 1 and words[1] in self.lists else None
+
+        # the body may start on the line of proc: proc get_auto_src_list {} { return {a.v b.v} }
+        match = _RETURN.search(line) if self._proc is not None else None
+        if match is not None:
+            self._in_list = True
+            self._feed_list(line[match.end():])
+
+    def _feed_list(self, text: str) -> None:
+        """Tokenize part of the list body."""
+        if not self._has_word and self._feed_line(text):
+            return
+
+        for char in text:
+            if not self._feed_char(char):
+                return
+
+    def _feed_line(self, text: str) -> bool:
+        """Take a comment or a single bare word (as generated by SrcListGenerator) at once. Return True if taken."""
+        stripped = text.strip()
+
+        if stripped.startswith("#"):
+            return True
+
+        if stripped and _TCL_SPECIAL.isdisjoint(stripped):
+            if self._proc is not None:
+                self.lists[self._proc].append(stripped)
+            return True
+
+        return False
+
+    def _feed_char(self, char: str) -> bool:
+        """Process next char of the list body. Return False at the end of the list."""
+        if self._escaped:
+            self._word.append(_TCL_UNESCAPES.get(char, char))
+            self._escaped = False
+        elif self._quoted:
+            self._feed_quoted(char)
+        elif self._depth:
+            self._feed_braced(char)
+        elif char == "}":
+            self._end_word()
+            self._in_list = False
+            self._proc = None
+            return False
+        else:
+            self._feed_bare(char)
+
+        return True
+
+    def _feed_quoted(self, char: str) -> None:
+        """Process char of "quoted" word."""
+        if char == "\\":
+            self._escaped = True
+        elif char == '"':
+            self._quoted = False
+            self._end_word()
+        else:
+            self._word.append(char)
+
+    def _feed_braced(self, char: str) -> None:
+        """Process char of {braced} word."""
+        if char == "{":
+            self._depth += 1
+        elif char == "}":
+            self._depth -= 1
+            if not self._depth:
+                self._end_word()
+                return
+
+        self._word.append(char)
+
+    def _feed_bare(self, char: str) -> None:
+        """Process char outside of braces and quotes."""
+        if char.isspace():
+            self._end_word()
+        elif char == "{" and not self._has_word:
+            self._depth = 1
+            self._has_word = True
+        elif char == '"' and not self._has_word:
+            self._quoted = True
+            self._has_word = True
+        else:
+            self._escaped = char == "\\"
+            if not self._escaped:
+                self._word.append(char)
+            self._has_word = True
+
+    def _end_word(self) -> None:
+        """Store collected word."""
+        if self._has_word and self._proc is not None:
+            self.lists[self._proc].append("".join(self._word))
+
+        self._word = []
+        self._has_word = False
+
+
+class SrcRegistry:
+    """Insertion-ordered set of source paths. Paths are normalized once on insert."""
+
+    def __init__(self, paths: Iterable[str] = ()) -> None:
+        """Init, fill registry from paths."""
+        self._index: dict[str, None] = {}
+
+        self.add_many(paths)
+
+    def __contains__(self, file_path: object) -> bool:
+        """Check that path is in registry."""
+        return isinstance(file_path, str) and normalize_path(file_path) in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over paths in insertion order."""
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        """Count of paths."""
+        return len(self._index)
+
+    def add(self, file_path: str) -> bool:
+        """Add path. Return True if path is new."""
+        file_path = normalize_path(file_path)
+
+        if file_path in self._index:
+            return False
+
+        self._index[file_path] = None
+        return True
+
+    def add_many(self, paths: Iterable[str]) -> int:
+        """Add paths. Return count of new paths."""
+        size = len(self._index)
+        self._index.update(dict.fromkeys(map(normalize_path, paths)))
+
+        return len(self._index) - size
+
+    def discard(self, file_path: str) -> bool:
+        """Remove path. Return True if path was present."""
+        file_path = normalize_path(file_path)
+
+        if file_path not in self._index:
+            return False
+
+        del self._index[file_path]
+        return True
+
+    def clear(self) -> None:
+        """Remove all paths."""
+        self._index.clear()
+
+    def to_list(self) -> list[str]:
+        """Get paths as list."""
+        return list(self._index)
+
+
+class SrcListGenerator:
+    """
+    A class to generate TCL scripts for managing source file lists.
+
+    In resolved mode the final list is computed here, not by Vivado: get_final_src_list returns the flat list and
+    get_final_src_digest returns its sha256, so build scripts can detect unchanged inputs cheaply.
+    """
+
+    def __init__(self, *, resolved: bool = False, case_insensitive: bool = os.name == "nt") -> None:
         """Initialize the SrcListGenerator with empty lists for user, exclude, and auto source files."""
-        self.user_src_list: list[str] = []
-        self.exclude_src_list: list[str] = []
-        self.auto_src_list: list[str] = []
+        self.user_src = SrcRegistry()
+        self.exclude_src = SrcRegistry()
+        self.auto_src = SrcRegistry()
+
+        self.resolved = resolved
+        self.case_insensitive = case_insensitive
+
+    @property
+    def user_src_list(self) -> list[str]:
+        """List of user sources."""
+        return self.user_src.to_list()
+
+    @user_src_list.setter
+    def user_src_list(self, paths: Iterable[str]) -> None:
+        self.user_src = SrcRegistry(paths)
+
+    @property
+    def exclude_src_list(self) -> list[str]:
+        """List of excluded sources."""
+        return self.exclude_src.to_list()
+
+    @exclude_src_list.setter
+    def exclude_src_list(self, paths: Iterable[str]) -> None:
+        self.exclude_src = SrcRegistry(paths)
+
+    @property
+    def auto_src_list(self) -> list[str]:
+        """List of automatically found sources."""
+        return self.auto_src.to_list()
+
+    @auto_src_list.setter
+    def auto_src_list(self, paths: Iterable[str]) -> None:
+        self.auto_src = SrcRegistry(paths)
 
     def add_user_src(self, file_path: str) -> None:
         """Add a file path to the user source list."""
-        if file_path not in self.user_src_list:
-            self.user_src_list.append(file_path)
+        self.user_src.add(file_path)
 
     def add_exclude_src(self, file_path: str) -> None:
         """Add a file path to the exclude source list."""
-        if file_path not in self.exclude_src_list:
-            self.exclude_src_list.append(file_path)
+        self.exclude_src.add(file_path)
 
     def add_auto_src(self, file_path: str) -> None:
         """Add a file path to the auto source list."""
-        if file_path not in self.auto_src_list:
-            self.auto_src_list.append(file_path)
+        self.auto_src.add(file_path)
+
+    def add_many_user_src(self, paths: Iterable[str]) -> int:
+        """Add file paths to the user source list. Return count of new paths."""
+        return self.user_src.add_many(paths)
+
+    def add_many_exclude_src(self, paths: Iterable[str]) -> int:
+        """Add file paths to the exclude source list. Return count of new paths."""
+        return self.exclude_src.add_many(paths)
+
+    def add_many_auto_src(self, paths: Iterable[str]) -> int:
+        """Add file paths to the auto source list. Return count of new paths."""
+        return self.auto_src.add_many(paths)
+
+    def sync_auto_src(self, paths: Iterable[str]) -> tuple[list[str], list[str]]:
+        """
+        Reconcile the auto source list with found files. Return lists of added and removed paths.
+
+        Kept paths stay in their order, new paths are appended.
+        """
+        found = SrcRegistry(paths)
+
+        removed = [path for path in self.auto_src if path not in found]
+        added = [path for path in found if path not in self.auto_src]
+
+        for path in removed:
+            self.auto_src.discard(path)
+        self.auto_src.add_many(added)
+
+        return added, removed
+
+    def canonical_path(self, file_path: str) -> str:
+        """Get key to compare paths: forward slashes, no `.` and `..`, lower case on case-insensitive systems."""
+        file_path = posixpath.normpath(normalize_path(file_path))
+
+        return file_path.lower() if self.case_insensitive else file_path
+
+    def resolve_src_list(self) -> list[str]:
+        """Get final list: user and auto sources without excluded ones, deduplicated and sorted by canonical path."""
+        excluded = {self.canonical_path(path) for path in self.exclude_src}
+        resolved: dict[str, str] = {}
+
+        for paths in (self.user_src, self.auto_src):
+            for path in paths:
+                key = self.canonical_path(path)
+                if key not in excluded and key not in resolved:
+                    resolved[key] = posixpath.normpath(path)
+
+        return [resolved[key] for key in sorted(resolved)]
+
+    def src_list_digest(self, src_list: list[str] | None = None) -> str:
+        """Get sha256 of the final list."""
+        if src_list is None:
+            src_list = self.resolve_src_list()
+
+        return hashlib.sha256("\n".join(src_list).encode()).hexdigest()
 
     def generate_tcl_script(self) -> str:
         """Generate a TCL script based on the current lists of source files."""
+        return self._generate_src_lists() + (self._generate_resolved() if self.resolved else self._generate_final())
+
+    def _generate_resolved(self) -> str:
+        """Generate final list computed in python."""
+        src_list = self.resolve_src_list()
+
+        return """
+proc get_final_src_list {{}} {{
+    return {{
+        {}
+    }}
+}}
+
+proc get_final_src_digest {{}} {{
+    return {}
+}}
+""".format("\n        ".join(map(tcl_quote, src_list)), self.src_list_digest(src_list))
+
+    def _generate_final(self) -> str:
+        """Generate final list computed by Vivado."""
+        return """
+proc get_final_src_list {} {
+    set user_src_list [get_user_src_list]
+    set exclude_src_list [get_exclude_src_list]
+    set auto_src_list [get_auto_src_list]
+
+    array set unique_paths {}
+
+    foreach path $user_src_list { set unique_paths($path) 1 }
+    foreach path $auto_src_list { set unique_paths($path) 1 }
+    foreach path $exclude_src_list {
+        if {[info exists unique_paths($path)]} { unset unique_paths($path) }
+    }
+
+    return [lsort [array names unique_paths]]
+}
+"""
+
+    def _generate_src_lists(self) -> str:
+        """Generate procs of user, exclude and auto lists."""
         return """proc get_user_src_list {{}} {{
     return {{
         {}
@@ -54,59 +459,34 @@ proc get_auto_src_list {{}} {{
         {}
     }}
 }}
-
-proc get_final_src_list {{}} {{
-    set user_src_list [get_user_src_list]
-    set exclude_src_list [get_exclude_src_list]
-    set auto_src_list [get_auto_src_list]
-
-    array set unique_paths {{}}
-
-    foreach path $user_src_list {{ set unique_paths($path) 1 }}
-    foreach path $auto_src_list {{ set unique_paths($path) 1 }}
-    foreach path $exclude_src_list {{ unset unique_paths($path) }}
-
-    return [lsort [array names unique_paths]]
-}}
 """.format(
-            "\n        ".join(self.user_src_list),
-            "\n        ".join(self.exclude_src_list),
-            "\n        ".join(self.auto_src_list),
+            "\n        ".join(map(tcl_quote, self.user_src)),
+            "\n        ".join(map(tcl_quote, self.exclude_src)),
+            "\n        ".join(map(tcl_quote, self.auto_src)),
         )
 
-    def write_tcl_script(self, file_path: str) -> None:
-        """Write tcl script."""
-        self.converted_slash()
+    def write_tcl_script(self, file_path: str) -> bool:
+        """
+        Write tcl script. Return True if the file was changed.
 
-        try:
-            with open(file_path, "w") as file:
-                file.write(self.generate_tcl_script())
-        except FileNotFoundError:
-            msg = "Not found tcl script: " + file_path
-            logger.warning(msg)
-            return
+        The file is not touched when its content is the same, so its mtime stays and Vivado doesn't see a
+        changed project.
+        """
+        return write_if_changed(file_path, self.generate_tcl_script())
 
     def read_tcl_script(self, file_path: str) -> None:
-        """Read an existing TCL script and extract the file lists."""
+        """Read an existing TCL script and extract the file lists. Missing procs give empty lists."""
+        reader = TclListReader()
+
         try:
             with open(file_path) as file:
-                content = file.read()
+                for line in file:
+                    reader.feed(line)
         except FileNotFoundError:
             msg = "Not found tcl script: " + file_path
             logger.warning(msg)
             return
 
-        self.user_src_list = re.findall(r"get_user_src_list.*?return \{(.*?)\}", content, re.DOTALL)
-        self.exclude_src_list = re.findall(r"get_exclude_src_list.*?return \{(.*?)\}", content, re.DOTALL)
-
-        self.user_src_list = self.user_src_list[0].strip().split("\n")
-        self.exclude_src_list = self.exclude_src_list[0].strip().split("\n")
-
-        self.user_src_list = [item.strip() for item in self.user_src_list if item.strip()]
-        self.exclude_src_list = [item.strip() for item in self.exclude_src_list if item.strip()]
-
-    def converted_slash(self) -> None:
-        """Replace slash."""
-        self.user_src_list = [path.replace("\\", "/") for path in self.user_src_list]
-        self.exclude_src_list = [path.replace("\\", "/") for path in self.exclude_src_list]
-        self.auto_src_list = [path.replace("\\", "/") for path in self.auto_src_list]
+        self.user_src_list = reader.lists[TclListReader.PROC_USER]
+        self.exclude_src_list = reader.lists[TclListReader.PROC_EXCLUDE]
+        self.auto_src_list = reader.lists[TclListReader.PROC_AUTO]
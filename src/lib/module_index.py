@@ -0,0 +1,252 @@
+"""Index of HDL modules and their instances."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import TYPE_CHECKING, Iterable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.dep_index import DependencyIndex
+    except ImportError:
+        from src.lib.dep_index import DependencyIndex
+
+
+class HdlScanner:
+    """
+    Lightweight scanner of HDL sources. It is not a parser: it finds definitions and references by patterns.
+
+    Definitions are modules, interfaces, programs and packages (entities and packages for VHDL). References are
+    instances and package imports. A false reference is harmless while it doesn't match a defined name.
+    Includes are `include targets as written.
+    """
+
+    VHDL_EXTENSIONS = (".vhd", ".vhdl")
+
+    _V_COMMENTS = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"', re.DOTALL)
+    _V_DEFS = re.compile(r"\b(?:module|macromodule|interface|program|package)\s+(?:(?:automatic|static)\s+)?(\w+)")
+    _V_INCLUDE = re.compile(r'`include\s+"([^"]+)"')
+    _V_IMPORTS = re.compile(r"\b(\w+)\s*::")
+    _V_INSTANCES = re.compile(
+        r"\b([A-Za-z_]\w*)(?:\s*#\s*\((?:[^()]|\((?:[^()]|\([^()]*\))*\))*\)\s*|\s+)"
+        r"([A-Za-z_]\w*)\s*(?:\[[^\]]*\]\s*)?\(",
+    )
+    _V_KEYWORDS = frozenset((
+        "module", "macromodule", "interface", "program", "package", "function", "task", "if", "else", "for",
+        "while", "case", "casex", "casez", "begin", "end", "assign", "always", "always_ff", "always_comb",
+        "always_latch", "initial", "input", "output", "inout", "wire", "reg", "logic", "return", "assert",
+        "property", "sequence", "class", "new", "foreach", "repeat", "forever", "localparam", "parameter",
+        "generate", "genvar", "import", "export", "typedef", "struct", "union", "enum", "bit", "byte", "int",
+        "integer", "signed", "unsigned", "posedge", "negedge", "or", "and", "not", "wait", "disable", "default",
+        "void", "static", "automatic", "virtual", "extern", "covergroup", "constraint", "modport", "clocking",
+    ))
+
+    _VHDL_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+    _VHDL_DEFS = re.compile(r"\b(?:entity|package)\s+(\w+)\s+is\b")
+    _VHDL_REFS = re.compile(
+        r"\bentity\s+\w+\.(\w+)|:\s*(?:component\s+)?(\w+)\s+(?:generic|port)\s+map\b|\buse\s+\w+\.(\w+)\.",
+    )
+
+    def scan(self, file_path: str) -> tuple[list[str], list[str]]:
+        """Scan file. Return sorted definitions and references."""
+        defs, refs, _ = self.scan_all(file_path)
+
+        return defs, refs
+
+    def scan_all(self, file_path: str) -> tuple[list[str], list[str], list[str]]:
+        """Scan file. Return sorted definitions, references and includes."""
+        with open(file_path, encoding="utf-8", errors="replace") as file:
+            text = file.read()
+
+        if file_path.lower().endswith(self.VHDL_EXTENSIONS):
+            return (*self.scan_vhdl(text), [])
+
+        return (*self.scan_verilog(text), sorted(set(self._V_INCLUDE.findall(text))))
+
+    def scan_verilog(self, text: str) -> tuple[list[str], list[str]]:
+        """Scan Verilog/SystemVerilog text."""
+        text = self._V_COMMENTS.sub(" ", text)
+
+        defs = set(self._V_DEFS.findall(text))
+
+        refs = set(self._V_IMPORTS.findall(text))
+        refs.update(
+            name for name, inst in self._V_INSTANCES.findall(text)
+            if name not in self._V_KEYWORDS and inst not in self._V_KEYWORDS
+        )
+
+        return sorted(defs), sorted(refs - defs)
+
+    def scan_vhdl(self, text: str) -> tuple[list[str], list[str]]:
+        """Scan VHDL text. VHDL is case insensitive, names are lowered."""
+        text = self._VHDL_COMMENTS.sub(" ", text).lower()
+
+        defs = set(self._VHDL_DEFS.findall(text))
+        refs = {name for groups in self._VHDL_REFS.findall(text) for name in groups if name}
+
+        return sorted(defs), sorted(refs - defs)
+
+
+class ModuleIndex:
+    """
+    Index module -> files and the instantiation graph of source files.
+
+    Scan results are cached per file by mtime and size and stored in json file, so re-indexing is incremental.
+    """
+
+    VERSION = 2
+    FILE_NAME = ".module_index.json"
+
+    def __init__(self, scanner: HdlScanner | None = None) -> None:
+        """Init empty index."""
+        self.scanner = scanner or HdlScanner()
+
+        # file path -> (mtime_ns, size, definitions, references, includes)
+        self.files: dict[str, tuple[int, int, list[str], list[str], list[str]]] = {}
+        self._defs: dict[str, list[str]] | None = None
+
+    def load(self, file_path: str) -> bool:
+        """Load index from json file. Return False if the file is absent or not compatible."""
+        try:
+            with open(file_path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError):
+            msg = "Broken module index, full re-index: " + file_path
+            logger.warning(msg)
+            return False
+
+        if data.get("version") != self.VERSION:
+            return False
+
+        self.files = {path: tuple(entry) for path, entry in data["files"].items()}
+        self._defs = None
+
+        return True
+
+    def save(self, file_path: str) -> None:
+        """Save index to json file."""
+        data = {"version": self.VERSION, "files": {path: list(entry) for path, entry in self.files.items()}}
+
+        tmp_path = file_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(data, file, separators=(",", ":"))
+            os.replace(tmp_path, file_path)
+        except OSError:
+            msg = "Can't save module index: " + file_path
+            logger.warning(msg)
+
+    def update(self, paths: Iterable[str]) -> int:
+        """Index files, drop files not in paths. Return count of (re)scanned files."""
+        files: dict[str, tuple[int, int, list[str], list[str], list[str]]] = {}
+        scanned = 0
+
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            entry = self.files.get(path)
+            if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+                try:
+                    defs, refs, includes = self.scanner.scan_all(path)
+                except OSError:
+                    continue
+
+                entry = (stat.st_mtime_ns, stat.st_size, defs, refs, includes)
+                scanned += 1
+
+            files[path] = entry
+
+        self.files = files
+        self._defs = None
+
+        return scanned
+
+    def modules(self) -> dict[str, list[str]]:
+        """Get index: defined name -> files."""
+        if self._defs is None:
+            self._defs = {}
+            for path, (_, _, defs, _, _) in self.files.items():
+                for name in defs:
+                    self._defs.setdefault(name, []).append(path)
+
+        return self._defs
+
+    def find(self, name: str) -> list[str]:
+        """Get files defining the name. VHDL names are lowered, so the lowered name is tried as well."""
+        modules = self.modules()
+
+        return modules.get(name) or modules.get(name.lower(), [])
+
+    def graph(self) -> dict[str, list[str]]:
+        """Get instantiation graph: file -> files defining names referenced by it."""
+        return {
+            path: sorted({dep for name in refs for dep in self.find(name) if dep != path})
+            for path, (_, _, _, refs, _) in self.files.items()
+        }
+
+    def reachable(self, top: str, deps: DependencyIndex | None = None) -> list[str] | None:
+        """
+        Get sorted files reachable from the top module. Return None if the top is not defined.
+
+        Files without any definitions (headers, unsupported constructs) can't be pruned by instances: they are kept
+        if reachable files include them. Includes are resolved by the dependency index if given (include dirs
+        are known to it), otherwise relative to the including file or by the tail of the path.
+        """
+        stack = list(self.find(top))
+        if not stack:
+            return None
+
+        headers = self._headers()
+        found = set(stack)
+        while stack:
+            path = stack.pop()
+
+            deps_of_path = [dep for name in self.files[path][3] for dep in self.find(name)]
+            if headers:
+                deps_of_path.extend(self._included(path, headers, deps))
+
+            for dep in deps_of_path:
+                if dep not in found:
+                    found.add(dep)
+                    stack.append(dep)
+
+        return sorted(found)
+
+    def _headers(self) -> dict[str, str]:
+        """Get files without definitions: normalized path -> path."""
+        return {
+            os.path.normpath(path).replace("\\", "/"): path
+            for path, (_, _, defs, _, _) in self.files.items() if not defs
+        }
+
+    def _included(self, path: str, headers: dict[str, str], deps: DependencyIndex | None) -> list[str]:
+        """Get headers included by the file."""
+        if deps is not None:
+            targets = [os.path.normpath(dep).replace("\\", "/") for dep in deps.dependencies(path)]
+            return [headers[target] for target in targets if target in headers]
+
+        included = []
+        dir_path = os.path.dirname(path)
+        for target in self.files[path][4]:
+            resolved = os.path.normpath(os.path.join(dir_path, target)).replace("\\", "/")
+            if resolved in headers:
+                included.append(headers[resolved])
+                continue
+
+            tail = "/" + "/".join(part for part in target.replace("\\", "/").split("/") if part not in ("", ".", ".."))
+            included.extend(header for key, header in headers.items() if key.endswith(tail))
+
+        return included
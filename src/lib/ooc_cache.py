@@ -0,0 +1,223 @@
+"""Cache of out-of-context synthesis checkpoints of modules."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Iterable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+try:
+    from Automatons.src.lib.manager_src import normalize_path, tcl_quote, write_if_changed
+except ImportError:
+    from src.lib.manager_src import normalize_path, tcl_quote, write_if_changed
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.dep_index import DependencyIndex
+        from Automatons.src.lib.manager_src import SrcListGenerator
+        from Automatons.src.lib.module_index import ModuleIndex
+    except ImportError:
+        from src.lib.dep_index import DependencyIndex
+        from src.lib.manager_src import SrcListGenerator
+        from src.lib.module_index import ModuleIndex
+
+
+class FileHasher:
+    """sha256 of file contents, cached by mtime and size."""
+
+    def __init__(self) -> None:
+        """Init empty cache."""
+        # file path -> (mtime_ns, size, hex digest)
+        self.files: dict[str, tuple[int, int, str]] = {}
+
+    def load(self, file_path: str) -> None:
+        """Load cache from json file."""
+        try:
+            with open(file_path) as file:
+                self.files = {path: tuple(entry) for path, entry in json.load(file).items()}
+        except (OSError, ValueError):
+            self.files = {}
+
+    def save(self, file_path: str) -> None:
+        """Save cache to json file."""
+        tmp_path = file_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump({path: list(entry) for path, entry in self.files.items()}, file, separators=(",", ":"))
+            os.replace(tmp_path, file_path)
+        except OSError:
+            msg = "Can't save file hashes: " + file_path
+            logger.warning(msg)
+
+    def digest(self, path: str) -> str:
+        """Get sha256 of file. Absent file has empty digest."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return ""
+
+        entry = self.files.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                sha.update(chunk)
+
+        self.files[path] = (stat.st_mtime_ns, stat.st_size, sha.hexdigest())
+
+        return self.files[path][2]
+
+
+class OocCache:
+    """
+    Plan of out-of-context synthesis of selected modules and cache of their checkpoints.
+
+    A module is keyed by sha256 of its transitive sources (instances, included headers, imported packages), so
+    it is re-synthesized only when one of them changes. Build script stores checkpoints as
+    <cache>/<module>/<key>_<part>.dcp and touches reused ones, the cache keeps `keep` newest checkpoints per module.
+    """
+
+    FILE_NAME = "ooc_modules.tcl"
+    HASHES_NAME = ".hashes.json"
+
+    def __init__(self, dir_cache: str, index: ModuleIndex, deps: DependencyIndex | None = None, keep: int = 3) -> None:
+        """Init."""
+        self.dir_cache = dir_cache
+        self.index = index
+        self.deps = deps
+        self.keep = keep
+
+        self.hasher = FileHasher()
+
+    def module_sources(self, module: str) -> list[str]:
+        """
+        Get sorted transitive sources of module. Return empty list if the module is not found.
+
+        Headers are only those the sources include, so an unrelated header doesn't change the key of the module.
+        """
+        sources = sorted({os.path.normpath(path) for path in self.index.reachable(module, self.deps) or []})
+
+        if self.deps is not None:
+            found = set(sources)
+            stack = list(sources)
+            while stack:
+                for dep in self.deps.dependencies(stack.pop()):
+                    if dep not in found:
+                        found.add(dep)
+                        stack.append(dep)
+            sources = sorted(found)
+
+        return sources
+
+    def module_key(self, module: str, sources: list[str]) -> str:
+        """Get key of module: sha256 of the name and contents of its sources."""
+        sha = hashlib.sha256(module.encode())
+        for path in sources:
+            sha.update(b"\0" + os.path.basename(path).encode() + b"\0" + self.hasher.digest(path).encode())
+
+        return sha.hexdigest()
+
+    def plan(self, modules: Iterable[str]) -> list[tuple[str, str, list[str]]]:
+        """Form plan: (module, key, sources) for every module found in the index."""
+        os.makedirs(self.dir_cache, exist_ok=True)
+        path2hashes = os.path.join(self.dir_cache, self.HASHES_NAME)
+        self.hasher.load(path2hashes)
+
+        plan = []
+        for module in modules:
+            sources = self.module_sources(module)
+            if not sources:
+                msg = "OOC module is not found: " + module
+                logger.warning(msg)
+                continue
+
+            plan.append((module, self.module_key(module, sources), sources))
+
+        self.hasher.save(path2hashes)
+
+        return plan
+
+    def top_sources(self, src_list: Iterable[str], plan: list[tuple[str, str, list[str]]]) -> list[str]:
+        """Get sources of top synthesis: files defining OOC modules are replaced by stubs."""
+        ooc_files = {normalize_path(path) for module, _, _ in plan for path in self.index.find(module)}
+
+        return [path for path in src_list if normalize_path(path) not in ooc_files]
+
+    def generate_tcl_script(self, src_list: Iterable[str], plan: list[tuple[str, str, list[str]]]) -> str:
+        """Generate ooc_modules.tcl: cache dir, modules with keys and sources, sources of the top synthesis."""
+        modules = []
+        for module, key, sources in plan:
+            files = " ".join(tcl_quote(normalize_path(path)) for path in sources)
+            modules.append("{" + module + " " + key + " {" + files + "}}")
+
+        return """proc get_ooc_cache_dir {{}} {{
+    return {}
+}}
+
+proc get_ooc_modules {{}} {{
+    return {{
+        {}
+    }}
+}}
+
+proc get_ooc_top_src_list {{}} {{
+    return {{
+        {}
+    }}
+}}
+""".format(
+            tcl_quote(normalize_path(self.dir_cache)),
+            "\n        ".join(modules),
+            "\n        ".join(map(tcl_quote, self.top_sources(src_list, plan))),
+        )
+
+    def write_tcl_script(self, file_path: str, src_list_script: SrcListGenerator, modules: Iterable[str]) -> bool:
+        """Plan modules and write ooc_modules.tcl. Return True if the file was changed (see write_if_changed)."""
+        plan = self.plan(modules)
+
+        changed = write_if_changed(file_path, self.generate_tcl_script(src_list_script.resolve_src_list(), plan))
+
+        self.evict()
+
+        return changed
+
+    def evict(self) -> int:
+        """Remove checkpoints beyond `keep` newest (by mtime) of every module. Return count of removed files."""
+        removed = 0
+
+        try:
+            dirs = [entry.path for entry in os.scandir(self.dir_cache) if entry.is_dir()]
+        except OSError:
+            return 0
+
+        for dir_path in dirs:
+            checkpoints = sorted(
+                (entry for entry in os.scandir(dir_path) if entry.name.endswith(".dcp")),
+                key=lambda entry: entry.stat().st_mtime,
+                reverse=True,
+            )
+
+            for entry in checkpoints[self.keep:]:
+                stub = entry.path[:-len(".dcp")] + "_stub.v"
+                removed += _remove(entry.path) + _remove(stub)
+
+        return removed
+
+
+def _remove(path: str) -> int:
+    """Remove file. Return count of removed files."""
+    try:
+        os.remove(path)
+    except OSError:
+        return 0
+
+    return 1
@@ -0,0 +1,153 @@
+"""Teardown of the project: entries are moved to a trash dir at once, then deleted in parallel."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+
+class ProjectTrash:
+    """
+    Trash of the project dir.
+
+    Entries are renamed into a trash dir inside the project (the same file system, so the rename is atomic and
+    instant even for a build dir of Vivado runs), then the trash is deleted by parallel workers. A trash left by an
+    interrupted deletion is deleted by the next purge.
+    """
+
+    PREFIX = ".automatons_trash_"
+
+    def __init__(self, path2prj: str, exclude: tuple[str, ...] = (), workers: int = 0) -> None:
+        """Init. Files with names ending with exclude are kept (dirs are always deleted)."""
+        self.path2prj = path2prj
+        self.exclude = exclude
+        self.workers = workers or min(16, (os.cpu_count() or 1) * 2)
+
+    def doomed(self) -> list[str]:
+        """Get names of entries to delete, sorted."""
+        doomed = []
+        with os.scandir(self.path2prj) as entries:
+            for entry in entries:
+                if entry.name.startswith(self.PREFIX):
+                    continue
+                if entry.is_dir(follow_symlinks=False) or not entry.name.endswith(self.exclude):
+                    doomed.append(entry.name)
+
+        return sorted(doomed)
+
+    def trashes(self) -> list[str]:
+        """Get paths of trash dirs of the project."""
+        return sorted(
+            os.path.join(self.path2prj, name) for name in os.listdir(self.path2prj) if name.startswith(self.PREFIX)
+        )
+
+    def move(self, names: list[str]) -> tuple[str, list[str]]:
+        """
+        Move entries to a new trash dir. Return the trash dir and entries that can't be moved (e.g. opened files).
+
+        The project dir is left without the moved entries at once, their deletion is up to purge().
+        """
+        path2trash = os.path.join(self.path2prj, self.PREFIX + str(time.time_ns()))
+        os.mkdir(path2trash)
+
+        failed = [name for name in names if not _move(self.path2prj, path2trash, name)]
+
+        return path2trash, failed
+
+    def purge(self, on_progress: Callable[[int, int], None] | None = None) -> int:
+        """
+        Delete all trash dirs of the project by parallel workers. Return number of deleted units (files, subtrees).
+
+        Trees are split into subtrees until every worker gets work; on_progress(done, total) is called after each
+        unit (in the calling thread). An exception of on_progress (e.g. cancellation) stops the purge, the rest is left
+        in the trash.
+        """
+        trashes = self.trashes()
+        units = _split(trashes, self.workers * 4)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(_remove, path) for path in units]
+            try:
+                for done, future in enumerate(futures, 1):
+                    future.result()
+                    if on_progress is not None:
+                        on_progress(done, len(units))
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        # skeletons of split trees
+        for path2trash in trashes:
+            _remove(path2trash)
+
+        return len(units)
+
+
+def _split(paths: list[str], count: int) -> list[str]:
+    """Split dirs into their entries breadth-first until there are count units to delete (or nothing to split)."""
+    units: list[str] = []
+    dirs = list(paths)
+
+    while dirs and len(units) + len(dirs) < count:
+        expanded = []
+        for path in dirs:
+            for entry in _scandir(path):
+                (expanded if entry.is_dir(follow_symlinks=False) else units).append(entry.path)
+        dirs = expanded
+
+    return units + dirs
+
+
+def _move(src_dir: str, dst_dir: str, name: str) -> bool:
+    """Move entry between dirs. Return False if it can't be moved."""
+    try:
+        os.rename(os.path.join(src_dir, name), os.path.join(dst_dir, name))
+    except OSError as err:
+        msg = "Can't move to trash: " + name + ": " + str(err)
+        logger.warning(msg)
+        return False
+
+    return True
+
+
+def _scandir(path: str) -> list[os.DirEntry]:
+    """Get entries of dir, none if it can't be read."""
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except OSError:
+        return []
+
+
+def _remove(path: str) -> None:
+    """Remove file, link or tree (read-only files too)."""
+    if os.path.islink(path) or not os.path.isdir(path):
+        try:
+            os.remove(path)
+        except PermissionError:
+            os.chmod(path, stat.S_IWRITE)
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return
+
+    shutil.rmtree(path, onerror=_on_rmtree_error)
+
+
+def _on_rmtree_error(func: Callable[[str], None], path: str, _: tuple) -> None:
+    """Clear read-only flag (objects of git on Windows) and retry."""
+    if not os.path.lexists(path):
+        return
+
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
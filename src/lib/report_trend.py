@@ -0,0 +1,135 @@
+"""Per-build records of timing and utilization reports."""
+
+from __future__ import annotations
+
+import datetime
+import os
+import sqlite3
+
+try:
+    from Automatons.src.lib.vivado_reports import read_timing_summary, read_utilization
+except ImportError:
+    from src.lib.vivado_reports import read_timing_summary, read_utilization
+
+
+class ReportTrend:
+    """
+    SQLite store of compact records of builds: timing summary and used resources.
+
+    Reports are parsed once after the build, so comparing builds never reads multi-MB reports again. Records are
+    numbered in order of builds; the last ones are taken by the primary key (per script by its index).
+    """
+
+    VERSION = 1
+    FILE_NAME = ".report_trend.db"
+
+    DIR_REPORTS = "reports"
+    TIMING_SUMMARY = "timing_summary.rpt"
+    UTILIZATION = "utilization.rpt"
+
+    COLUMNS = (
+        "time", "commit_id", "script", "wns", "tns", "tns_failing", "whs", "ths", "ths_failing", "lut", "ff", "bram",
+        "dsp",
+    )
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS builds (
+            id INTEGER PRIMARY KEY,
+            time TEXT NOT NULL,
+            commit_id TEXT NOT NULL,
+            script TEXT NOT NULL,
+            wns REAL,
+            tns REAL,
+            tns_failing INTEGER,
+            whs REAL,
+            ths REAL,
+            ths_failing INTEGER,
+            lut INTEGER,
+            ff INTEGER,
+            bram REAL,
+            dsp INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS builds_script ON builds(script, id);
+    """
+
+    # columns in the order of COLUMNS
+    _INSERT = (
+        "INSERT INTO builds (time, commit_id, script, wns, tns, tns_failing, whs, ths, ths_failing, lut, ff, bram, dsp)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    _SELECT_LAST = (
+        "SELECT id, time, commit_id, script, wns, tns, tns_failing, whs, ths, ths_failing, lut, ff, bram, dsp"
+        " FROM builds ORDER BY id DESC LIMIT ?"
+    )
+    _SELECT_LAST_OF_SCRIPT = (
+        "SELECT id, time, commit_id, script, wns, tns, tns_failing, whs, ths, ths_failing, lut, ff, bram, dsp"
+        " FROM builds WHERE script = ? ORDER BY id DESC LIMIT ?"
+    )
+
+    def __init__(self, file_path: str) -> None:
+        """Open (create) database."""
+        self.file_path = file_path
+
+        self._db = sqlite3.connect(file_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self._db.execute("DROP TABLE IF EXISTS builds")
+            self._db.execute("PRAGMA user_version=" + str(self.VERSION))
+
+        self._db.executescript(self._SCHEMA)
+
+    def close(self) -> None:
+        """Close database."""
+        self._db.close()
+
+    def add(self, record: dict) -> int:
+        """Add record of the build. Return its number."""
+        with self._db:
+            return self._db.execute(self._INSERT, [record.get(column) for column in self.COLUMNS]).lastrowid
+
+    def last(self, count: int = 10, script: str | None = None) -> list[dict]:
+        """Get the last records (of script if given), the oldest first."""
+        if script is None:
+            rows = self._db.execute(self._SELECT_LAST, (count,)).fetchall()
+        else:
+            rows = self._db.execute(self._SELECT_LAST_OF_SCRIPT, (script, count)).fetchall()
+
+        return [dict(zip(("id", *self.COLUMNS), row)) for row in reversed(rows)]
+
+    @classmethod
+    def collect(cls, path2build: str, script: str, commit_id: str = "", since: float = 0.0) -> dict | None:
+        """
+        Form record of the build from reports of the build dir.
+
+        Reports older than since (time of the build start) are stale and ignored. Return None if no report is found.
+        """
+        dir_reports = os.path.join(path2build, cls.DIR_REPORTS)
+        record: dict = {
+            "time": datetime.datetime.now(datetime.timezone.utc).astimezone().isoformat(timespec="seconds"),
+            "commit_id": commit_id,
+            "script": script,
+        }
+
+        path2timing = os.path.join(dir_reports, cls.TIMING_SUMMARY)
+        timing = read_timing_summary(path2timing) if _is_fresh(path2timing, since) else None
+        if timing is not None:
+            record.update({slot: getattr(timing, slot) for slot in timing.__slots__})
+
+        path2utilization = os.path.join(dir_reports, cls.UTILIZATION)
+        utilization = read_utilization(path2utilization) if _is_fresh(path2utilization, since) else None
+        if utilization is not None:
+            record.update({slot: getattr(utilization, slot) for slot in utilization.__slots__})
+
+        if timing is None and utilization is None:
+            return None
+
+        return record
+
+
+def _is_fresh(file_path: str, since: float) -> bool:
+    """File exists and is modified after since."""
+    try:
+        return os.path.getmtime(file_path) >= since
+    except OSError:
+        return False
@@ -0,0 +1,141 @@
+"""Parallel discovery of HDL sources."""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Tuple
+
+# dir path -> (mtime, subdirs names, matched files names)
+DirEntry = Tuple[float, List[str], List[str]]
+DirTree = Dict[str, DirEntry]
+
+
+class SrcDiscovery:
+    """
+    Walker of source tree based on os.scandir.
+
+    Directory listing is fanned out across a thread pool: the walk is bound by filesystem latency (network
+    shares), not by CPU. Globs are matched against the path relative to the root with forward slashes,
+    exclude globs prune directories as well as files.
+    """
+
+    EXTENSIONS = (".v", ".sv", ".vhd")
+
+    def __init__(
+        self,
+        extensions: Iterable[str] = EXTENSIONS,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        workers: int = 0,
+    ) -> None:
+        """Init."""
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+
+    def key(self) -> list[list[str]]:
+        """Get configuration key. The results of walks with different keys are not comparable."""
+        return [list(self.extensions), list(self.include), list(self.exclude)]
+
+    def find(self, root: str) -> list[str]:
+        """Get sorted full paths of all matched files under the root."""
+        tree = self.walk(root)
+
+        return sorted(os.path.join(path, name) for path, (_, _, names) in tree.items() for name in names)
+
+    def walk(self, root: str, cache: DirTree | None = None) -> DirTree:
+        """
+        Walk the tree under the root.
+
+        Directories from cache with unchanged mtime are not listed again, their cached entries are reused.
+        """
+        cache = cache or {}
+        tree: DirTree = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending: set[Future] = {pool.submit(self._visit, root, root, cache.get(root))}
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    result = future.result()
+                    if result is None:
+                        continue
+
+                    path, entry = result
+                    tree[path] = entry
+
+                    for name in entry[1]:
+                        sub_path = os.path.join(path, name)
+                        pending.add(pool.submit(self._visit, root, sub_path, cache.get(sub_path)))
+
+        return tree
+
+    def match_dir(self, rel_path: str) -> bool:
+        """Check that directory must be walked."""
+        return not self._match_any(rel_path, self.exclude)
+
+    def match_file(self, rel_path: str) -> bool:
+        """Check that file is a source."""
+        if not rel_path.lower().endswith(self.extensions):
+            return False
+        if self.include and not self._match_any(rel_path, self.include):
+            return False
+
+        return not self._match_any(rel_path, self.exclude)
+
+    def _visit(self, root: str, path: str, cached: DirEntry | None) -> tuple[str, DirEntry] | None:
+        """Stat directory and list it if it was changed."""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+
+        if cached is not None and cached[0] == mtime:
+            return path, cached
+
+        entry = self._list_dir(root, path, mtime)
+        if entry is None:
+            return None
+
+        return path, entry
+
+    def _list_dir(self, root: str, path: str, mtime: float) -> DirEntry | None:
+        """Read directory entries."""
+        rel_dir = os.path.relpath(path, root).replace("\\", "/")
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+
+        subdirs: list[str] = []
+        files: list[str] = []
+
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    rel_path = rel_dir + entry.name
+
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.match_dir(rel_path):
+                            subdirs.append(entry.name)
+                    elif self.match_file(rel_path):
+                        files.append(entry.name)
+        except OSError:
+            return None
+
+        subdirs.sort()
+        files.sort()
+
+        return mtime, subdirs, files
+
+    @staticmethod
+    def _match_any(rel_path: str, patterns: tuple[str, ...]) -> bool:
+        """Check path against globs. Glob without slash is matched against the base name as well."""
+        name = rel_path.rsplit("/", 1)[-1]
+
+        return any(
+            fnmatch.fnmatchcase(rel_path, pattern) or ("/" not in pattern and fnmatch.fnmatchcase(name, pattern))
+            for pattern in patterns
+        )
@@ -0,0 +1,119 @@
+"""Persistent snapshot of the source tree for incremental rescan."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+try:
+    from Automatons.src.lib.src_discovery import DirTree, SrcDiscovery
+except ImportError:
+    from src.lib.src_discovery import DirTree, SrcDiscovery
+
+
+class DirSnapshot:
+    """
+    Snapshot of directory tree: per-directory mtime, subdirectories and matched files.
+
+    Rescan lists only directories whose mtime changed since the previous scan, other directories are only
+    stat'ed. Creating or deleting a file changes the mtime of its parent directory only, so every known
+    directory is still checked, but none of the unchanged ones is read.
+    """
+
+    VERSION = 2
+    FILE_NAME = ".src_snapshot.json"
+
+    # Directory modified so recently can be modified again within the same mtime tick, don't trust it.
+    RACY_WINDOW = 2.0
+
+    def __init__(self, discovery: SrcDiscovery | None = None) -> None:
+        """Init empty snapshot."""
+        self.discovery = discovery or SrcDiscovery()
+        self.root = ""
+
+        self.dirs: DirTree = {}
+
+    def load(self, file_path: str) -> bool:
+        """Load snapshot from json file. Return False if the file is absent or not compatible."""
+        try:
+            with open(file_path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError):
+            msg = "Broken source snapshot, full rescan: " + file_path
+            logger.warning(msg)
+            return False
+
+        if data.get("version") != self.VERSION or data.get("key") != self.discovery.key():
+            return False
+
+        self.root = data["root"]
+        self.dirs = {path: (entry[0], entry[1], entry[2]) for path, entry in data["dirs"].items()}
+
+        return True
+
+    def save(self, file_path: str) -> None:
+        """Save snapshot to json file."""
+        data = {
+            "version": self.VERSION,
+            "key": self.discovery.key(),
+            "root": self.root,
+            "dirs": {path: list(entry) for path, entry in self.dirs.items()},
+        }
+
+        tmp_path = file_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(data, file, separators=(",", ":"))
+            os.replace(tmp_path, file_path)
+        except OSError:
+            msg = "Can't save source snapshot: " + file_path
+            logger.warning(msg)
+
+    def files(self) -> list[str]:
+        """Get sorted full paths of all matched files in the snapshot."""
+        return sorted(os.path.join(path, name) for path, (_, _, names) in self.dirs.items() for name in names)
+
+    def rescan(self, root: str) -> tuple[list[str], list[str]]:
+        """Update snapshot from the filesystem. Return sorted lists of added and removed files."""
+        if root != self.root:
+            self.root = root
+            self.dirs = {}
+
+        old_dirs = self.dirs
+        new_dirs = self.discovery.walk(root, cache=old_dirs)
+
+        added: list[str] = []
+        removed: list[str] = []
+
+        for path, entry in new_dirs.items():
+            old = old_dirs.get(path)
+            if old is entry:
+                continue
+
+            old_files = set(old[2]) if old is not None else set()
+            new_files = set(entry[2])
+
+            added.extend(os.path.join(path, name) for name in new_files - old_files)
+            removed.extend(os.path.join(path, name) for name in old_files - new_files)
+
+        for path, (_, _, names) in old_dirs.items():
+            if path not in new_dirs:
+                removed.extend(os.path.join(path, name) for name in names)
+
+        now = time.time()
+        for path, entry in new_dirs.items():
+            if now - entry[0] < self.RACY_WINDOW:
+                new_dirs[path] = (-1.0, entry[1], entry[2])
+
+        self.dirs = new_dirs
+
+        return sorted(added), sorted(removed)
@@ -0,0 +1,159 @@
+"""Update of the project source list."""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+try:
+    from Automatons.src.lib.dep_index import DependencyIndex
+    from Automatons.src.lib.manager_src import SrcListGenerator
+    from Automatons.src.lib.module_index import ModuleIndex
+    from Automatons.src.lib.ooc_cache import OocCache
+    from Automatons.src.lib.src_snapshot import DirSnapshot
+    from Automatons.src.lib.symbol_index import SymbolIndex
+except ImportError:
+    from src.lib.dep_index import DependencyIndex
+    from src.lib.manager_src import SrcListGenerator
+    from src.lib.module_index import ModuleIndex
+    from src.lib.ooc_cache import OocCache
+    from src.lib.src_snapshot import DirSnapshot
+    from src.lib.symbol_index import SymbolIndex
+
+if TYPE_CHECKING:
+    try:
+        from Automatons.src.lib.src_discovery import SrcDiscovery
+    except ImportError:
+        from src.lib.src_discovery import SrcDiscovery
+
+
+class SrcUpdater:
+    """
+    Rescan sources of the project and reconcile script/get_list_sources.tcl with them.
+
+    If top is set, only files reachable from the top module by instances, imports and includes are kept.
+    If symbols is set, the symbol index of all found sources is updated too.
+    If resolved is set, the final list is resolved in python (see SrcListGenerator).
+    If ooc_modules is set, script/ooc_modules.tcl is written for out-of-context synthesis of these modules with
+    checkpoints cached in dir_ooc_cache (relative to the project).
+    If include_dirs is not None, the dependency index (includes and imports) is updated, includes are searched in
+    include_dirs (relative to the project) after the dir of the including file.
+    """
+
+    # Command and watcher may update the same project from different threads.
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        path2prj: str,
+        discovery: SrcDiscovery | None = None,
+        dir_src: str = "src",
+        dir_script: str = "script",
+        top: str | None = None,
+        *,
+        symbols: bool = False,
+        include_dirs: list[str] | None = None,
+        resolved: bool = False,
+        ooc_modules: list[str] | None = None,
+        dir_ooc_cache: str = "ooc_cache",
+    ) -> None:
+        """Init."""
+        self.path2src = os.path.join(path2prj, dir_src)
+        self.path2script = os.path.join(path2prj, dir_script, "get_list_sources.tcl")
+        self.path2snapshot = os.path.join(path2prj, dir_script, DirSnapshot.FILE_NAME)
+        self.path2index = os.path.join(path2prj, dir_script, ModuleIndex.FILE_NAME)
+        self.path2symbols = os.path.join(path2prj, dir_script, SymbolIndex.FILE_NAME)
+        self.path2deps = os.path.join(path2prj, dir_script, DependencyIndex.FILE_NAME)
+        self.path2ooc = os.path.join(path2prj, dir_script, OocCache.FILE_NAME)
+
+        self.top = top
+        self.symbols = symbols
+        self.resolved = resolved
+        self.ooc_modules = ooc_modules or []
+
+        self.snapshot = DirSnapshot(discovery)
+        self.index = ModuleIndex()
+        self.deps = None
+        if include_dirs is not None:
+            self.deps = DependencyIndex(os.path.join(path2prj, path) for path in include_dirs)
+        self.ooc = OocCache(os.path.join(path2prj, dir_ooc_cache), self.index, self.deps)
+        self._loaded = False
+
+    @property
+    def indexes_content(self) -> bool:
+        """Content of sources is indexed (hierarchy, symbols, dependencies), so saves of files must update it."""
+        return bool(self.top or self.symbols or self.deps is not None or self.ooc_modules)
+
+    def update(self) -> tuple[list[str], list[str], bool]:
+        """Update source list. Return added and removed sources, and flag that the script was rewritten."""
+        with self._lock:
+            if not self._loaded:
+                self.snapshot.load(self.path2snapshot)
+                self.index.load(self.path2index)
+                if self.deps is not None:
+                    self.deps.load(self.path2deps)
+                self._loaded = True
+
+            self.snapshot.rescan(self.path2src)
+            self.snapshot.save(self.path2snapshot)
+
+            files = self.snapshot.files()
+            if self.symbols:
+                self._update_symbols(files)
+            if self.deps is not None:
+                self.deps.update(files)
+                self.deps.save(self.path2deps)
+            if self.top or self.ooc_modules:
+                self.index.update(files)
+                self.index.save(self.path2index)
+            if self.top:
+                files = self._prune(files)
+
+            src_list_script = SrcListGenerator(resolved=self.resolved)
+            src_list_script.read_tcl_script(self.path2script)
+
+            added, removed = src_list_script.sync_auto_src(files)
+
+            if self.ooc_modules:
+                self.ooc.write_tcl_script(self.path2ooc, src_list_script, self.ooc_modules)
+
+            return added, removed, src_list_script.write_tcl_script(self.path2script)
+
+    def register(self, files: list[str]) -> bool:
+        """
+        Add new sources to the auto source list in one update of the script. Return True if the script was rewritten.
+
+        The next update reconciles the list with the source tree as usual (e.g. prunes files out of the hierarchy).
+        """
+        with self._lock:
+            src_list_script = SrcListGenerator(resolved=self.resolved)
+            src_list_script.read_tcl_script(self.path2script)
+            if not src_list_script.add_many_auto_src(files):
+                return False
+
+            return src_list_script.write_tcl_script(self.path2script)
+
+    def _prune(self, files: list[str]) -> list[str]:
+        """Keep files reachable from the top module."""
+        reachable = self.index.reachable(self.top, self.deps)
+        if reachable is None:
+            msg = "Top module is not found, sources are not pruned: " + self.top
+            logger.warning(msg)
+            return files
+
+        return reachable
+
+    def _update_symbols(self, files: list[str]) -> None:
+        """Update symbol index."""
+        index = SymbolIndex(self.path2symbols)
+        try:
+            index.update(files)
+        finally:
+            index.close()
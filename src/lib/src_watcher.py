@@ -0,0 +1,248 @@
+"""Background watcher of the source tree."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+try:
+    from Automatons.src.lib.src_discovery import SrcDiscovery
+except ImportError:
+    from src.lib.src_discovery import SrcDiscovery
+
+
+class PollingBackend:
+    """Fallback backend: reports a possible change every interval, the rescan itself finds out what changed."""
+
+    # the interval already batches changes
+    DEBOUNCE = False
+
+    def __init__(self, stop: threading.Event, interval: float = 2.0) -> None:
+        """Init."""
+        self.stop = stop
+        self.interval = interval
+
+        self._last_poll = time.monotonic()
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for changes up to timeout. Return True if changes may have happened."""
+        self.stop.wait(timeout)
+
+        now = time.monotonic()
+        if now - self._last_poll < self.interval:
+            return False
+
+        self._last_poll = now
+        return True
+
+    def close(self) -> None:
+        """Release resources."""
+
+
+class InotifyBackend:
+    """Linux backend: inotify watches on every directory of the tree, new directories are watched on creation."""
+
+    DEBOUNCE = True
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, root: str, discovery: SrcDiscovery, *, content: bool = False) -> None:
+        """
+        Init inotify and watch the tree. Raise OSError if inotify is not available.
+
+        With content saved files are reported too, not only created, deleted and moved ones.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is available on Linux only")
+
+        self.root = root
+        self.discovery = discovery
+        self.mask = self.MASK | (self.IN_CLOSE_WRITE if content else 0)
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+        self._watches: dict[int, str] = {}
+
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, timeout: float) -> bool:
+        """Wait for changes up to timeout. Return True if changes happened."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].split(b"\0", 1)[0]
+            offset += length
+
+            try:
+                if mask & self.IN_Q_OVERFLOW:
+                    self._watch_tree(self.root)
+                elif mask & self.IN_IGNORED:
+                    self._watches.pop(wd, None)
+                elif mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO) and wd in self._watches:
+                    self._watch_tree(os.path.join(self._watches[wd], os.fsdecode(name)))
+            except OSError:
+                # e.g. out of max_user_watches: changes in that directory are picked up by the next rescan only
+                logger.exception("Can't watch new directory")
+
+        return True
+
+    def close(self) -> None:
+        """Release inotify descriptor."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _watch_tree(self, path: str) -> None:
+        """Add watches for the directory and all its walked subdirectories."""
+        for dir_path in self.discovery.walk(path):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dir_path), self.mask)
+            if wd < 0:
+                code = ctypes.get_errno()
+                if code == errno.ENOENT:
+                    continue
+                raise OSError(code, os.strerror(code), dir_path)
+
+            self._watches[wd] = dir_path
+
+
+class SrcWatcher(threading.Thread):
+    """
+    Thread that watches the source tree and calls back after a burst of changes.
+
+    Changes are debounced: the callback runs when the tree was quiet for `debounce` seconds, but not later than
+    `max_delay` seconds after the first change of a burst (long checkouts). The callback runs in this thread.
+    With content saves of files are changes too (indexes of their content must be refreshed), otherwise only
+    created, deleted and moved files are.
+    """
+
+    TICK = 0.5
+
+    def __init__(
+        self,
+        root: str,
+        callback: Callable[[], None],
+        discovery: SrcDiscovery | None = None,
+        debounce: float = 0.5,
+        max_delay: float = 10.0,
+        poll_interval: float = 2.0,
+        *,
+        content: bool = False,
+    ) -> None:
+        """Init."""
+        super().__init__(name="automatons-src-watcher", daemon=True)
+
+        self.root = root
+        self.callback = callback
+        self.discovery = discovery or SrcDiscovery()
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.content = content
+
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        """Ask thread to stop."""
+        self._stop_event.set()
+
+    def run(self) -> None:
+        """Thread body."""
+        backend = self._create_backend()
+
+        try:
+            # changes made before the watch was set up
+            self._call()
+
+            while not self._stop_event.is_set():
+                if not backend.wait(self.TICK):
+                    continue
+
+                if backend.DEBOUNCE:
+                    self._wait_quiet(backend)
+                if self._stop_event.is_set():
+                    break
+
+                self._call()
+        finally:
+            backend.close()
+
+    def _call(self) -> None:
+        """Run callback, the thread must survive its errors."""
+        try:
+            self.callback()
+        except Exception:
+            logger.exception("Source watcher callback failed")
+
+    def _create_backend(self) -> InotifyBackend | PollingBackend:
+        """Create inotify backend, fall back to polling."""
+        try:
+            return InotifyBackend(self.root, self.discovery, content=self.content)
+        except (OSError, AttributeError):
+            # AttributeError: libc without inotify symbols
+            msg = "inotify is not available, poll sources every " + str(self.poll_interval) + " s"
+            logger.info(msg)
+
+            return PollingBackend(self._stop_event, self.poll_interval)
+
+    def _wait_quiet(self, backend: InotifyBackend | PollingBackend) -> None:
+        """Wait until the burst of changes is over."""
+        now = time.monotonic()
+        deadline = now + self.debounce
+        hard_deadline = now + self.max_delay
+
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            remaining = min(deadline, hard_deadline) - now
+            if remaining <= 0:
+                return
+
+            if backend.wait(remaining):
+                deadline = time.monotonic() + self.debounce
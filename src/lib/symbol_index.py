@@ -0,0 +1,187 @@
+"""Persistent index of HDL symbols: modules, ports, parameters and includes."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import Iterable
+
+try:
+    from Automatons.src.lib.hdl_parser import HdlModule, VerilogHeaderParser
+    from Automatons.src.lib.module_index import HdlScanner
+except ImportError:
+    from src.lib.hdl_parser import HdlModule, VerilogHeaderParser
+    from src.lib.module_index import HdlScanner
+
+
+class SymbolIndex:
+    """
+    SQLite index of symbols of the source tree, updated incrementally by mtime and size of files.
+
+    Every symbol row has a kind (module, port, parameter, include), a name, the module it belongs to, the file and
+    the line. Lookups go through indexes on name and module, no source file is read on query.
+    """
+
+    VERSION = 2
+    FILE_NAME = ".symbol_index.db"
+
+    MODULE = "module"
+    PORT = "port"
+    PARAMETER = "parameter"
+    INCLUDE = "include"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            path TEXT UNIQUE NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS symbols (
+            file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            module TEXT NOT NULL,
+            line INTEGER NOT NULL,
+            detail TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS symbols_name ON symbols(kind, name);
+        CREATE INDEX IF NOT EXISTS symbols_module ON symbols(module, kind);
+        CREATE INDEX IF NOT EXISTS symbols_file ON symbols(file_id);
+    """
+
+    _QUERY_EXACT = (
+        "SELECT s.name, f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id "
+        "WHERE kind = ? AND name = ? ORDER BY s.name LIMIT ?"
+    )
+    _QUERY_PREFIX = (
+        "SELECT s.name, f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id "
+        "WHERE kind = ? AND name >= ? AND name < ? ORDER BY s.name LIMIT ?"
+    )
+    _QUERY_ALL = (
+        "SELECT s.name, f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id "
+        "WHERE kind = ? ORDER BY s.name LIMIT ?"
+    )
+
+    def __init__(self, file_path: str) -> None:
+        """Open (create) index database."""
+        self.file_path = file_path
+        self.parser = VerilogHeaderParser()
+        self.scanner = HdlScanner()
+
+        self._db = sqlite3.connect(file_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self._db.executescript("DROP TABLE IF EXISTS symbols; DROP TABLE IF EXISTS files;")
+            self._db.execute("PRAGMA user_version=" + str(self.VERSION))
+
+        self._db.executescript(self._SCHEMA)
+
+    def close(self) -> None:
+        """Close database."""
+        self._db.close()
+
+    def update(self, paths: Iterable[str]) -> int:
+        """Index files, drop files not in paths. Return count of (re)indexed files."""
+        known = {path: (file_id, mtime_ns, size) for file_id, path, mtime_ns, size in
+                 self._db.execute("SELECT id, path, mtime_ns, size FROM files")}
+        indexed = 0
+
+        with self._db:
+            for path in paths:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                entry = known.pop(path, None)
+                if entry is not None and entry[1] == stat.st_mtime_ns and entry[2] == stat.st_size:
+                    continue
+
+                try:
+                    symbols = self._scan(path)
+                except OSError:
+                    continue
+
+                if entry is not None:
+                    self._db.execute("DELETE FROM files WHERE id = ?", (entry[0],))
+
+                file_id = self._db.execute(
+                    "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                    (path, stat.st_mtime_ns, stat.st_size),
+                ).lastrowid
+                self._db.executemany(
+                    "INSERT INTO symbols (file_id, kind, name, module, line, detail) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(file_id, *symbol) for symbol in symbols],
+                )
+                indexed += 1
+
+            self._db.executemany("DELETE FROM files WHERE id = ?", [(entry[0],) for entry in known.values()])
+
+        return indexed
+
+    def modules(self, prefix: str = "", limit: int = -1) -> list[tuple[str, str, int]]:
+        """Get modules (name, file, line) with name started by prefix."""
+        return self._query(self.MODULE, prefix, limit)
+
+    def includes(self, prefix: str = "", limit: int = -1) -> list[tuple[str, str, int]]:
+        """Get include targets (name, including file, line) started by prefix."""
+        return self._query(self.INCLUDE, prefix, limit)
+
+    def find_module(self, name: str) -> list[tuple[str, int]]:
+        """Get locations (file, line) of module declarations."""
+        return [(path, line) for _, path, line in self._query(self.MODULE, name, -1, exact=True)]
+
+    def ports(self, module: str) -> list[tuple[str, str]]:
+        """Get ports (name, declaration) of module in declaration order."""
+        return self._members(module, self.PORT)
+
+    def parameters(self, module: str) -> list[tuple[str, str]]:
+        """Get parameters (name, default) of module in declaration order."""
+        return self._members(module, self.PARAMETER)
+
+    def _scan(self, path: str) -> list[tuple[str, str, str, int, str]]:
+        """Scan file. Return symbols (kind, name, module, line, detail)."""
+        if path.lower().endswith(HdlScanner.VHDL_EXTENSIONS):
+            # entities only, VHDL ports are not parsed
+            defs, _ = self.scanner.scan(path)
+            return [(self.MODULE, name, name, 1, "") for name in defs]
+
+        with open(path, encoding="utf-8", errors="replace") as file:
+            modules, includes = self.parser.parse(file.read())
+
+        symbols = [(self.INCLUDE, target, "", line, "") for target, line in includes]
+        for module in modules:
+            symbols.extend(self._module_symbols(module))
+
+        return symbols
+
+    def _module_symbols(self, module: HdlModule) -> list[tuple[str, str, str, int, str]]:
+        """Form rows of module symbols."""
+        symbols = [(self.MODULE, module.name, module.name, module.line, "")]
+        symbols.extend((self.PARAMETER, param.name, module.name, module.line, param.default)
+                       for param in module.parameters)
+        symbols.extend((self.PORT, port.name, module.name, module.line,
+                        " ".join(filter(None, (port.direction, port.kind, port.width))))
+                       for port in module.ports)
+
+        return symbols
+
+    def _query(self, kind: str, prefix: str, limit: int, *, exact: bool = False) -> list[tuple[str, str, int]]:
+        """Query symbols by kind and name prefix. Prefix is a range on the index, not LIKE, to use the index."""
+        if exact:
+            query, args = self._QUERY_EXACT, (prefix,)
+        elif prefix:
+            query, args = self._QUERY_PREFIX, (prefix, prefix + "\U0010ffff")
+        else:
+            query, args = self._QUERY_ALL, ()
+
+        return self._db.execute(query, (kind, *args, limit)).fetchall()
+
+    def _members(self, module: str, kind: str) -> list[tuple[str, str]]:
+        """Get members of module by kind in declaration order."""
+        return self._db.execute(
+            "SELECT name, detail FROM symbols WHERE module = ? AND kind = ? ORDER BY rowid", (module, kind),
+        ).fetchall()
@@ -0,0 +1,188 @@
+"""Pool of worker threads running queued tasks with progress and cancellation."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Callable, Hashable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+
+class TaskCancelledError(Exception):
+    """Task is cancelled: raised by Task.check inside the task body."""
+
+
+class Task:
+    """
+    Task of the pool: the body is called with the task itself to report progress and check cancellation.
+
+    Cancellation is cooperative: a queued task is skipped, a running one stops at its next check().
+    """
+
+    __slots__ = ("_cancel", "done", "func", "key", "name", "on_done", "on_error", "state", "total")
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Task], Any],
+        on_done: Callable[[Any], None] | None = None,
+        on_error: Callable[[BaseException], None] | None = None,
+        key: Hashable | None = None,
+    ) -> None:
+        """Init."""
+        self.name = name
+        self.key = key
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+
+        self.state = self.QUEUED
+        self.done = 0
+        self.total = 0
+        self._cancel = threading.Event()
+
+    def __repr__(self) -> str:
+        """Represent task."""
+        return "Task(" + self.name + ", " + self.state + ", " + self.progress + ")"
+
+    @property
+    def cancelled(self) -> bool:
+        """Task is cancelled."""
+        return self._cancel.is_set()
+
+    @property
+    def progress(self) -> str:
+        """Progress as text: done/total, done if total is unknown."""
+        if not self.total:
+            return str(self.done) if self.done else ""
+
+        return str(self.done) + "/" + str(self.total)
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._cancel.set()
+
+    def check(self) -> None:
+        """Stop the task body if cancellation is requested."""
+        if self._cancel.is_set():
+            raise TaskCancelledError(self.name)
+
+    def advance(self, step: int = 1, total: int | None = None) -> None:
+        """Report progress (and total amount of work if it is known), then check cancellation."""
+        self.done += step
+        if total is not None:
+            self.total = total
+        self.check()
+
+
+class TaskPool:
+    """
+    Worker threads taking tasks from one queue.
+
+    Results and errors are passed to callbacks of the task through dispatch (e.g. sublime.set_timeout, so they run
+    in the UI thread); without dispatch callbacks are called by the worker. Workers are started on demand up to the
+    limit and stay idle waiting for the queue.
+    """
+
+    def __init__(self, workers: int = 4, dispatch: Callable[[Callable[[], None]], None] | None = None) -> None:
+        """Init."""
+        self.workers = workers
+        self.dispatch = dispatch or (lambda callback: callback())
+
+        self._queue: queue.Queue[Task | None] = queue.Queue()
+        self._tasks: list[Task] = []
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        name: str,
+        func: Callable[[Task], Any],
+        on_done: Callable[[Any], None] | None = None,
+        on_error: Callable[[BaseException], None] | None = None,
+        key: Hashable | None = None,
+    ) -> Task:
+        """Queue task. key groups tasks to list and cancel them together (e.g. id of the window)."""
+        task = Task(name, func, on_done, on_error, key)
+
+        with self._lock:
+            self._tasks.append(task)
+            # every worker is busy with a task
+            if len(self._tasks) > len(self._threads) and len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name="automatons-worker", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+        self._queue.put(task)
+
+        return task
+
+    def tasks(self, key: Hashable | None = None) -> list[Task]:
+        """Get queued and running tasks (of key if given)."""
+        with self._lock:
+            return [task for task in self._tasks if key is None or task.key == key]
+
+    def cancel(self, key: Hashable | None = None) -> list[Task]:
+        """Cancel queued and running tasks (of key if given). Return them."""
+        tasks = self.tasks(key)
+        for task in tasks:
+            task.cancel()
+
+        return tasks
+
+    def shutdown(self) -> None:
+        """Cancel all tasks and stop workers after their current tasks."""
+        self.cancel()
+
+        with self._lock:
+            threads, self._threads = self._threads, []
+
+        for _ in threads:
+            self._queue.put(None)
+
+    def _work(self) -> None:
+        """Worker loop."""
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+
+            try:
+                self._run(task)
+            finally:
+                with self._lock:
+                    self._tasks.remove(task)
+
+    def _run(self, task: Task) -> None:
+        """Run task and pass its result or error to callbacks."""
+        task.state = Task.RUNNING
+        try:
+            task.check()
+            result = task.func(task)
+        except TaskCancelledError as err:
+            msg = "Task is cancelled: " + task.name
+            logger.info(msg)
+            error: BaseException | None = err
+        except Exception as err:
+            msg = "Task is failed: " + task.name + ": " + repr(err)
+            logger.exception(msg)
+            error = err
+        else:
+            error = None
+        finally:
+            task.state = Task.FINISHED
+
+        if error is None:
+            if task.on_done is not None:
+                self.dispatch(lambda: task.on_done(result))
+        elif task.on_error is not None:
+            self.dispatch(lambda: task.on_error(error))
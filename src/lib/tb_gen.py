@@ -0,0 +1,235 @@
+"""Generation of port-aware testbenches of existing modules."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+try:
+    from Automatons.src.lib.bulk_gen import write_batch
+    from Automatons.src.lib.gen_template import TbTemplate
+    from Automatons.src.lib.hdl_parser import HdlModule, HdlParameter, HdlPort, VerilogHeaderParser
+except ImportError:
+    from src.lib.bulk_gen import write_batch
+    from src.lib.gen_template import TbTemplate
+    from src.lib.hdl_parser import HdlModule, HdlParameter, HdlPort, VerilogHeaderParser
+
+
+def parse_source(path: str) -> tuple[str, list]:
+    """Parse module headers of the file (worker of the pool). Return sha256 of the file and modules as lists."""
+    with open(path, "rb") as file:
+        data = file.read()
+
+    modules, _ = VerilogHeaderParser().parse(data.decode("utf-8", errors="replace"))
+
+    return hashlib.sha256(data).hexdigest(), [module_to_list(module) for module in modules]
+
+
+def module_to_list(module: HdlModule) -> list:
+    """Pack module to plain lists (picklable, json)."""
+    return [
+        module.name,
+        module.line,
+        [[parameter.name, parameter.default] for parameter in module.parameters],
+        [[port.name, port.direction, port.kind, port.width] for port in module.ports],
+        [[parameter.name, parameter.default] for parameter in module.localparams],
+    ]
+
+
+def module_from_list(data: list) -> HdlModule:
+    """Unpack module."""
+    module = HdlModule(data[0], data[1])
+    module.parameters = [HdlParameter(*parameter) for parameter in data[2]]
+    module.ports = [HdlPort(*port) for port in data[3]]
+    module.localparams = [HdlParameter(*parameter) for parameter in data[4]]
+
+    return module
+
+
+def render_tb(module: HdlModule) -> str:
+    """Render testbench of module."""
+    tb = TbTemplate()
+    tb.name = module.name
+    tb.set_uut(module.parameters, module.ports, module.localparams)
+
+    return tb.insert()
+
+
+class ParseCache:
+    """
+    Module headers of sources cached by sha256 of files.
+
+    A file is hashed again only if its mtime or size is changed, a file with known hash is not parsed again (also
+    after checkout of a branch and back).
+    """
+
+    VERSION = 2
+    FILE_NAME = ".tb_parse_cache.json"
+
+    def __init__(self) -> None:
+        """Init empty cache."""
+        # file path -> (mtime_ns, size, hex digest)
+        self.files: dict[str, tuple[int, int, str]] = {}
+        # hex digest -> modules as lists
+        self.modules: dict[str, list] = {}
+
+    def load(self, file_path: str) -> None:
+        """Load cache from json file."""
+        try:
+            with open(file_path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if data.get("version") != self.VERSION:
+            return
+
+        self.files = {path: tuple(entry) for path, entry in data["files"].items()}
+        self.modules = data["modules"]
+
+    def save(self, file_path: str) -> None:
+        """Save cache to json file, drop entries of absent files."""
+        digests = {entry[2] for entry in self.files.values()}
+        data = {
+            "version": self.VERSION,
+            "files": {path: list(entry) for path, entry in self.files.items()},
+            "modules": {digest: modules for digest, modules in self.modules.items() if digest in digests},
+        }
+
+        tmp_path = file_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(data, file, separators=(",", ":"))
+            os.replace(tmp_path, file_path)
+        except OSError:
+            msg = "Can't save parse cache: " + file_path
+            logger.warning(msg)
+
+    def cached(self, path: str, stat: os.stat_result) -> list | None:
+        """Get modules of the file if it is not changed."""
+        entry = self.files.get(path)
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            return None
+
+        return self.modules.get(entry[2])
+
+    def put(self, path: str, stat: os.stat_result, digest: str, modules: list) -> None:
+        """Put parsed file."""
+        self.files[path] = (stat.st_mtime_ns, stat.st_size, digest)
+        self.modules[digest] = modules
+
+
+class TbGenerator:
+    """
+    Generator of testbenches missing for modules of the source tree.
+
+    Sources not found in the parse cache are parsed by a pool of processes: a python executable for the workers is
+    required inside Sublime Text (its plugin host can't be spawned), without it threads are used. A module has a
+    testbench if a file `<module>_tb.*` exists anywhere in the testbench dir; new ones mirror subdirs and
+    extensions of sources.
+    """
+
+    def __init__(
+        self,
+        path2prj: str,
+        dir_src: str = "src",
+        dir_tb: str = "tb",
+        dir_script: str = "script",
+        python: str | None = None,
+        workers: int = 0,
+    ) -> None:
+        """Init."""
+        self.path2src = os.path.join(path2prj, dir_src)
+        self.path2tb = os.path.join(path2prj, dir_tb)
+        self.path2cache = os.path.join(path2prj, dir_script, ParseCache.FILE_NAME)
+        self.python = python
+        self.workers = workers or os.cpu_count() or 1
+
+        self.cache = ParseCache()
+
+    def parse(self, files: list[str]) -> dict[str, list[HdlModule]]:
+        """Get modules of files, parse changed files in the pool."""
+        self.cache.load(self.path2cache)
+        known = set(files)
+        self.cache.files = {path: entry for path, entry in self.cache.files.items() if path in known}
+
+        parsed: dict[str, list[HdlModule]] = {}
+        missing: dict[str, os.stat_result] = {}
+        for path in files:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            modules = self.cache.cached(path, stat)
+            if modules is None:
+                missing[path] = stat
+            else:
+                parsed[path] = [module_from_list(module) for module in modules]
+
+        for path, (digest, modules) in zip(missing, self._parse_all(list(missing))):
+            self.cache.put(path, missing[path], digest, modules)
+            parsed[path] = [module_from_list(module) for module in modules]
+
+        self.cache.save(self.path2cache)
+
+        msg = "Parsed sources: " + str(len(missing)) + ", cached: " + str(len(parsed) - len(missing))
+        logger.info(msg)
+
+        return parsed
+
+    def missing(self, parsed: dict[str, list[HdlModule]]) -> list[tuple[str, HdlModule]]:
+        """Get modules without testbenches and paths of their new testbenches."""
+        existing = set()
+        for _, _, names in os.walk(self.path2tb):
+            existing.update(os.path.splitext(name)[0] for name in names)
+
+        missing = []
+        for path, modules in sorted(parsed.items()):
+            subdir = os.path.relpath(os.path.dirname(path), self.path2src)
+            ext = os.path.splitext(path)[1]
+            for module in modules:
+                name = module.name + "_tb"
+                if module.name.endswith("_tb") or name in existing:
+                    continue
+
+                existing.add(name)
+                missing.append((os.path.normpath(os.path.join(self.path2tb, subdir, name + ext)), module))
+
+        return missing
+
+    def generate(self, files: list[str]) -> list[str]:
+        """Generate missing testbenches of modules of files. Return written paths."""
+        missing = self.missing(self.parse(files))
+
+        return write_batch([(path, render_tb(module)) for path, module in missing])
+
+    def _parse_all(self, files: list[str]) -> list[tuple[str, list]]:
+        """Parse files by the pool of processes, by threads if the pool can't be started."""
+        if not files:
+            return []
+
+        workers = min(self.workers, len(files))
+        # starting processes costs more than parsing of a few files
+        if self.python is not None and len(files) >= 4 * workers:
+            context = multiprocessing.get_context("spawn")
+            context.set_executable(self.python)
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                    return list(pool.map(parse_source, files, chunksize=16))
+            except (OSError, BrokenProcessPool):
+                msg = "Can't start parsing processes by " + self.python + ", threads are used"
+                logger.warning(msg)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(parse_source, files))
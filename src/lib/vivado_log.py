@@ -0,0 +1,197 @@
+"""Streaming analyzer of Vivado logs."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import threading
+from typing import Iterator
+
+SEVERITIES = ("ERROR", "CRITICAL WARNING", "WARNING", "INFO")
+
+# `WARNING: [Synth 8-327] inferring latch for variable 'x' [/path/top.v:12]`, the ID is optional
+_MESSAGE = re.compile(rb"^(INFO|WARNING|CRITICAL WARNING|ERROR): (?:\[([^\]\r\n]+)\] ?)?([^\r\n]*)", re.MULTILINE)
+_LOCATION = re.compile(r"\[([^\[\]]+):(\d+)\]\s*$")
+
+
+class LogMessage:
+    """Group of messages of the log with the same severity and message ID."""
+
+    __slots__ = ("count", "msg_id", "offset", "severity", "text")
+
+    def __init__(self, severity: str, msg_id: str, offset: int, text: str) -> None:
+        """Init. offset and text are of the first occurrence."""
+        self.severity = severity
+        self.msg_id = msg_id
+        self.offset = offset
+        self.text = text
+        self.count = 0
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        return self.severity + ": [" + self.msg_id + "] x" + str(self.count) + " at " + str(self.offset)
+
+
+class LogIssue:
+    """Single error or critical warning of the log."""
+
+    __slots__ = ("msg_id", "offset", "severity", "text")
+
+    def __init__(self, severity: str, msg_id: str, offset: int, text: str) -> None:
+        """Init."""
+        self.severity = severity
+        self.msg_id = msg_id
+        self.offset = offset
+        self.text = text
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        return self.severity + ": [" + self.msg_id + "] at " + str(self.offset)
+
+    @property
+    def location(self) -> tuple[str, int] | None:
+        """Source file and line referenced by the message: `... [/path/top.v:12]`."""
+        match = _LOCATION.search(self.text)
+        if match is None:
+            return None
+
+        return match.group(1), int(match.group(2))
+
+
+class LogAnalyzer:
+    """
+    Single-pass analyzer of a Vivado log mapped to memory.
+
+    Messages are grouped by severity and message ID with counts and offsets of the first occurrence, errors and
+    critical warnings are kept one by one (critical warnings up to max_issues). The log is never read as a whole:
+    regex runs over the mapped file. update() continues from the end of the last complete line, so a log growing
+    during a build is tailed incrementally; a log that became shorter (rewritten by a new build) is analyzed from
+    the start.
+    """
+
+    def __init__(self, file_path: str, max_issues: int = 10000) -> None:
+        """Init."""
+        self.file_path = file_path
+        self.max_issues = max_issues
+
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the analyzed part of the log."""
+        self.offset = 0
+        self.size = 0
+        self.messages: dict[tuple[str, str], LogMessage] = {}
+        self.counts = dict.fromkeys(SEVERITIES, 0)
+        self.issues: list[LogIssue] = []
+        self._groups: dict[tuple[bytes, bytes | None], LogMessage] = {}
+
+    def update(self) -> int:
+        """Analyze complete lines appended since the last call. Return count of new messages."""
+        try:
+            size = os.path.getsize(self.file_path)
+        except OSError:
+            return 0
+
+        with self.lock:
+            if size < self.offset:
+                self.reset()
+            self.size = size
+            if size == self.offset:
+                return 0
+
+            with open(self.file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                end = data.rfind(b"\n", self.offset) + 1
+                if end <= 0:
+                    return 0
+
+                count = self._scan(data, self.offset, end)
+                self.offset = end
+
+        return count
+
+    def follow(self, interval: float = 1.0, stop: threading.Event | None = None) -> Iterator[int]:
+        """Tail the log: update it every interval seconds until stop is set, yield counts of new messages."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            count = self.update()
+            if count:
+                yield count
+            stop.wait(interval)
+
+    def sorted_messages(self) -> list[LogMessage]:
+        """Return groups of messages by severity (errors first), then by count."""
+        order = {severity: index for index, severity in enumerate(SEVERITIES)}
+        with self.lock:
+            messages = list(self.messages.values())
+
+        return sorted(messages, key=lambda message: (order[message.severity], -message.count, message.msg_id))
+
+    def _scan(self, data: mmap.mmap, start: int, end: int) -> int:
+        """Analyze region of the mapped log."""
+        # groups are looked up by raw bytes: only new groups and issues are decoded
+        groups = self._groups
+        issues = self.issues
+        total = sum(self.counts.values())
+
+        for match in _MESSAGE.finditer(data, start, end):
+            key = match.group(1, 2)
+            message = groups.get(key)
+            if message is None:
+                severity, msg_id, text = (_decode(part) for part in match.groups())
+                message = groups[key] = self.messages[(severity, msg_id)] = LogMessage(
+                    severity, msg_id, match.start(), text,
+                )
+            message.count += 1
+
+            if key[0] == b"ERROR" or (key[0] == b"CRITICAL WARNING" and len(issues) < self.max_issues):
+                issues.append(LogIssue(message.severity, message.msg_id, match.start(), _decode(match.group(3))))
+
+        self.counts = dict.fromkeys(SEVERITIES, 0)
+        for message in self.messages.values():
+            self.counts[message.severity] += message.count
+
+        return sum(self.counts.values()) - total
+
+
+def _decode(data: bytes | None) -> str:
+    """Decode part of the log."""
+    return data.decode("utf-8", errors="replace") if data else ""
+
+
+def analyze_log(file_path: str) -> LogAnalyzer:
+    """Analyze the whole log."""
+    analyzer = LogAnalyzer(file_path)
+    analyzer.update()
+
+    return analyzer
+
+
+def read_region(file_path: str, offset: int, before: int = 50, after: int = 200) -> tuple[int, str, int]:
+    """
+    Read lines of the log around offset without reading the rest of it.
+
+    Return offset of the region, its text and position of the line at offset in the text (in characters).
+    """
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = min(max(offset, 0), len(data))
+
+        start = data.rfind(b"\n", 0, offset) + 1
+        for _ in range(before):
+            if start == 0:
+                break
+            start = data.rfind(b"\n", 0, start - 1) + 1
+
+        end = offset
+        for _ in range(after):
+            end = data.find(b"\n", end) + 1
+            if end == 0:
+                end = len(data)
+                break
+
+        line_start = data.rfind(b"\n", 0, offset) + 1
+        text = _decode(data[start:end])
+        position = len(_decode(data[start:line_start]))
+
+    return start, text, position
@@ -0,0 +1,170 @@
+"""Parsers of Vivado text reports."""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import ClassVar, Iterable
+
+
+class TimingSummary:
+    """Design timing summary of report_timing_summary."""
+
+    __slots__ = ("ths", "ths_failing", "tns", "tns_failing", "whs", "wns")
+
+    def __init__(
+        self,
+        wns: float,
+        tns: float,
+        tns_failing: int = 0,
+        whs: float = 0.0,
+        ths: float = 0.0,
+        ths_failing: int = 0,
+    ) -> None:
+        """Init."""
+        self.wns = wns
+        self.tns = tns
+        self.tns_failing = tns_failing
+        self.whs = whs
+        self.ths = ths
+        self.ths_failing = ths_failing
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        return "TimingSummary(wns=" + str(self.wns) + ", tns=" + str(self.tns) + ", whs=" + str(self.whs) + ")"
+
+    @property
+    def met(self) -> bool:
+        """Setup and hold requirements are met."""
+        return self.wns >= 0 and self.whs >= 0
+
+
+class Utilization:
+    """Used resources of report_utilization: LUTs, registers, block RAM tiles and DSPs."""
+
+    __slots__ = ("bram", "dsp", "ff", "lut")
+
+    # row names of the first tables of the report by device families (synthesized designs mark LUTs by "*")
+    ROWS: ClassVar[dict[str, str]] = {
+        "Slice LUTs": "lut",
+        "CLB LUTs": "lut",
+        "Slice Registers": "ff",
+        "CLB Registers": "ff",
+        "Block RAM Tile": "bram",
+        "DSPs": "dsp",
+    }
+
+    def __init__(self, lut: int = 0, ff: int = 0, bram: float = 0.0, dsp: int = 0) -> None:
+        """Init."""
+        self.lut = lut
+        self.ff = ff
+        self.bram = bram
+        self.dsp = dsp
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        txt = "Utilization(lut=" + str(self.lut) + ", ff=" + str(self.ff)
+        return txt + ", bram=" + str(self.bram) + ", dsp=" + str(self.dsp) + ")"
+
+
+_HEADER_SEP = re.compile(r"\s{2,}")
+
+
+def parse_timing_summary(text: str) -> TimingSummary | None:
+    """
+    Parse "Design Timing Summary" table of report_timing_summary. Return None if the table is not found.
+
+    The table is a header line (columns separated by 2+ spaces), a dash line and a line of values.
+    """
+    return _timing_summary(text.splitlines())
+
+
+def read_timing_summary(file_path: str) -> TimingSummary | None:
+    """Parse timing summary report file, reading stops at the table."""
+    try:
+        with open(file_path, encoding="utf-8", errors="replace") as file:
+            return _timing_summary(file)
+    except OSError:
+        return None
+
+
+def _timing_summary(lines: Iterable[str]) -> TimingSummary | None:
+    """Find the table in lines."""
+    # header, dash line, values
+    window = deque(maxlen=3)
+
+    for line in lines:
+        window.append(line)
+        if len(window) < window.maxlen or "WNS(ns)" not in window[0]:
+            continue
+
+        header = _HEADER_SEP.split(window[0].strip())
+        values = window[2].split()
+        if len(values) != len(header):
+            continue
+
+        try:
+            columns = {name: float(value) for name, value in zip(header, values)}
+        except ValueError:
+            continue
+
+        return TimingSummary(
+            wns=columns["WNS(ns)"],
+            tns=columns.get("TNS(ns)", 0.0),
+            tns_failing=int(columns.get("TNS Failing Endpoints", 0)),
+            whs=columns.get("WHS(ns)", 0.0),
+            ths=columns.get("THS(ns)", 0.0),
+            ths_failing=int(columns.get("THS Failing Endpoints", 0)),
+        )
+
+    return None
+
+
+def parse_utilization(text: str) -> Utilization | None:
+    """Parse used resources of report_utilization. Return None if no resource is found."""
+    return _utilization(text.splitlines())
+
+
+def read_utilization(file_path: str) -> Utilization | None:
+    """Parse utilization report file, reading stops when all resources are found."""
+    try:
+        with open(file_path, encoding="utf-8", errors="replace") as file:
+            return _utilization(file)
+    except OSError:
+        return None
+
+
+def _utilization(lines: Iterable[str]) -> Utilization | None:
+    """
+    Find resources in lines: the first rows of tables `| Site Type | Used | Fixed | ... |` with known site types.
+
+    Later tables of the report repeat the types in details, so only the first row of a resource is taken.
+    """
+    utilization = Utilization()
+    found = set()
+    used = -1
+
+    for line in lines:
+        if not line.startswith("|"):
+            continue
+
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if "Used" in cells:
+            used = cells.index("Used")
+            continue
+
+        name = Utilization.ROWS.get(cells[0].rstrip("*").strip())
+        if name is None or name in found or used < 0 or used >= len(cells):
+            continue
+
+        try:
+            value = float(cells[used])
+        except ValueError:
+            continue
+
+        setattr(utilization, name, value if name == "bram" else int(value))
+        found.add(name)
+        if len(found) == len(set(Utilization.ROWS.values())):
+            break
+
+    return utilization if found else None
@@ -0,0 +1,257 @@
+"""Long-lived Vivado process in Tcl mode serving a queue of requests."""
+
+from __future__ import annotations
+
+import itertools
+import queue
+import subprocess
+import threading
+from typing import Callable
+
+try:
+    from loguru import logger
+except ImportError:
+    from Automatons.src.mocks.mock_loguru import MockLogger
+    logger = MockLogger()
+
+try:
+    from Automatons.src.lib.build_runner import process_group_kwargs, terminate_tree
+    from Automatons.src.lib.manager_src import normalize_path, tcl_quote
+except ImportError:
+    from src.lib.build_runner import process_group_kwargs, terminate_tree
+    from src.lib.manager_src import normalize_path, tcl_quote
+
+
+class VivadoRequest:
+    """Request to Vivado: Tcl script, its output, return code (0 ok, 1 Tcl error, -1 process failure) and result."""
+
+    __slots__ = ("_done", "on_output", "output", "rc", "result", "script")
+
+    def __init__(self, script: str, on_output: Callable[[str], None] | None = None) -> None:
+        """Init."""
+        self.script = script
+        self.on_output = on_output
+
+        self.output: list[str] = []
+        self.rc: int | None = None
+        self.result = ""
+        self._done = threading.Event()
+
+    def __repr__(self) -> str:
+        """Representation for debug."""
+        return "VivadoRequest(rc=" + str(self.rc) + ", result=" + repr(self.result) + ")"
+
+    @property
+    def done(self) -> bool:
+        """Request is finished (or cancelled)."""
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the request. Return False on timeout."""
+        return self._done.wait(timeout)
+
+    def finish(self, rc: int | None, result: str = "") -> None:
+        """Set result and wake up waiters."""
+        self.rc = rc
+        self.result = result
+        self._done.set()
+
+
+class VivadoServer:
+    """
+    Vivado process in Tcl mode (`vivado -mode tcl`) kept alive between requests.
+
+    Requests are queued and executed one by one by a worker thread. A request is sent as a single line that
+    evaluates the script at global level under catch and prints a marker line with id, return code and result,
+    so the end of the request is found without relying on the prompt. Prompts in output are stripped. A dead
+    process is restarted on the next request. Any Tcl shell with the same stdin/stdout behavior may stand in for
+    Vivado, e.g. src/mocks/mock_vivado.py.
+    """
+
+    PROMPT = "Vivado% "
+    MARKER = "@@automatons@@"
+    COMMAND = ("vivado", "-mode", "tcl", "-nolog", "-nojournal", "-notrace")
+
+    def __init__(self, command: list[str] | tuple[str, ...] = COMMAND, cwd: str | None = None) -> None:
+        """Init. Process is started by the first request or by start()."""
+        self.command = list(command)
+        self.cwd = cwd
+
+        self._proc: subprocess.Popen | None = None
+        self._queue: queue.Queue[VivadoRequest | None] = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        """Process is running."""
+        return self._proc is not None and self._proc.poll() is None
+
+    @property
+    def pending(self) -> int:
+        """Count of queued requests."""
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        """Start worker thread (process is started by the worker)."""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._serve, daemon=True)
+                self._worker.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Cancel queued requests, exit the process (kill it if it doesn't exit in timeout) and stop worker."""
+        self.cancel_pending()
+        self._queue.put(None)
+
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.stdin.write("exit\n")
+                proc.stdin.flush()
+                proc.wait(timeout)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                terminate_tree(proc, force=True)
+
+        if self._worker is not None:
+            self._worker.join(timeout)
+        self._worker = None
+
+    def kill(self) -> None:
+        """
+        Kill the process tree: the running request fails, the process is restarted by the next request.
+
+        Vivado runs behind the wrapper script, its output pipe is closed only when the whole tree is killed.
+        """
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            terminate_tree(proc, force=True)
+
+    def cancel_pending(self) -> int:
+        """Cancel queued requests. Return count of cancelled requests."""
+        cancelled = 0
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return cancelled
+
+            if request is not None:
+                request.finish(None, "cancelled")
+                cancelled += 1
+
+    def submit(self, script: str, on_output: Callable[[str], None] | None = None) -> VivadoRequest:
+        """Queue Tcl script. on_output is called (in the worker thread) for every line of output."""
+        request = VivadoRequest(script, on_output)
+        self.start()
+        self._queue.put(request)
+
+        return request
+
+    def execute(self, script: str, timeout: float | None = None) -> VivadoRequest:
+        """Queue Tcl script and wait for it."""
+        request = self.submit(script)
+        request.wait(timeout)
+
+        return request
+
+    def source(self, path2script: str, cwd: str, on_output: Callable[[str], None] | None = None) -> VivadoRequest:
+        """Queue build script: change dir, close project of the previous build and source the script."""
+        script = "cd " + tcl_quote(normalize_path(cwd)) + "\n"
+        script += "close_project -quiet\n"
+        script += "source " + tcl_quote(normalize_path(path2script))
+
+        return self.submit(script, on_output)
+
+    @staticmethod
+    def tcl_string(text: str) -> str:
+        """Quote text as a Tcl string literal on a single line."""
+        for char, escaped in (("\\", "\\\\"), ('"', '\\"'), ("$", "\\$"), ("[", "\\["), ("]", "\\]"),
+                              ("\r", ""), ("\n", "\\n")):
+            text = text.replace(char, escaped)
+
+        return '"' + text + '"'
+
+    def _serve(self) -> None:
+        """Worker: execute queued requests."""
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+
+            if not self.alive and not self._spawn():
+                request.finish(-1, "can't start Vivado")
+                continue
+
+            self._send(request)
+
+    def _spawn(self) -> bool:
+        """Start the process and wait for it to be ready. Return False on failure."""
+        try:
+            self._proc = subprocess.Popen(
+                self.command,
+                cwd=self.cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                bufsize=1,
+                **process_group_kwargs(),
+            )
+        except OSError:
+            msg = "Can't start Vivado: " + " ".join(self.command)
+            logger.exception(msg)
+            return False
+
+        msg = "Vivado server is started: " + " ".join(self.command)
+        logger.info(msg)
+
+        # startup banner is the output of the first request
+        ready = VivadoRequest("", logger.debug)
+        self._send(ready)
+
+        return ready.rc == 0
+
+    def _send(self, request: VivadoRequest) -> None:
+        """Send request and read output up to its marker."""
+        request_id = str(next(self._ids))
+        line = "set ::_automatons_rc [catch {uplevel #0 " + self.tcl_string(request.script) + "} ::_automatons_res]; "
+        line += 'puts "\\n' + self.MARKER + " " + request_id + " $::_automatons_rc "
+        line += '[string map {\\n \\\\n} $::_automatons_res]"; flush stdout\n'
+
+        try:
+            self._proc.stdin.write(line)
+            self._proc.stdin.flush()
+        except (OSError, ValueError):
+            request.finish(-1, "Vivado process is not running")
+            return
+
+        marker = self.MARKER + " " + request_id + " "
+        # the marker is preceded by a line break, the empty line is held until it is known to be output
+        blank = False
+        for raw in iter(self._proc.stdout.readline, ""):
+            output = raw.rstrip("\r\n")
+            while output.startswith(self.PROMPT):
+                output = output[len(self.PROMPT):]
+
+            if output.startswith(marker):
+                rc, _, result = output[len(marker):].partition(" ")
+                # TCL_RETURN (2) of `return` in the script is a normal completion
+                request.finish(0 if rc == "2" else int(rc), result.replace("\\n", "\n"))
+                return
+
+            if blank:
+                self._output(request, "")
+            blank = not output
+            if not blank:
+                self._output(request, output)
+
+        request.finish(-1, "Vivado process is terminated")
+
+    @staticmethod
+    def _output(request: VivadoRequest, line: str) -> None:
+        """Store output line of request."""
+        request.output.append(line)
+        if request.on_output is not None:
+            request.on_output(line)
@@ -0,0 +1,93 @@
+"""
+Stand-in for Vivado executable, run as a separate process by system python with tkinter (Tcl interpreter).
+
+Tcl mode (`-mode tcl`): prints "Vivado% " prompt and evaluates complete commands read from stdin.
+Batch mode (`-mode batch -source script.tcl -tclargs ...`): sources the script, exit code 1 on error.
+Vivado commands are not implemented: any unknown command prints `Command:` and INFO lines with its arguments.
+"""
+
+from __future__ import annotations
+
+import sys
+import tkinter as tk
+
+PROMPT = "Vivado% "
+
+UNKNOWN = """
+proc unknown {args} {
+    puts "Command: $args"
+    puts "INFO: \\[Mock 0-0\\] $args"
+    flush stdout
+    return ""
+}
+"""
+
+
+def option(argv: list[str], name: str, default: str = "") -> str:
+    """Get value of command line option."""
+    if name in argv and argv.index(name) + 1 < len(argv):
+        return argv[argv.index(name) + 1]
+
+    return default
+
+
+def write(tcl: tk.Tcl, text: str) -> None:
+    """Write text through Tcl stdout channel to keep the order with Tcl output."""
+    tcl.call("puts", "-nonewline", text)
+    tcl.call("flush", "stdout")
+
+
+def run_tcl_mode(tcl: tk.Tcl) -> int:
+    """Evaluate commands from stdin."""
+    write(tcl, "****** Mock Vivado\n" + PROMPT)
+
+    command = ""
+    for line in sys.stdin:
+        command += line
+        if not tcl.call("info", "complete", command):
+            continue
+
+        if command.strip() == "exit":
+            return 0
+
+        try:
+            result = tcl.eval(command)
+        except tk.TclError as err:
+            result = "ERROR: " + str(err)
+
+        command = ""
+        write(tcl, (result + "\n" if result else "") + PROMPT)
+
+    return 0
+
+
+def run_batch_mode(tcl: tk.Tcl, argv: list[str]) -> int:
+    """Source the script."""
+    args = argv[argv.index("-tclargs") + 1:] if "-tclargs" in argv else []
+    tcl.call("set", "argv", tuple(args))
+    tcl.call("set", "argc", len(args))
+
+    try:
+        tcl.call("source", option(argv, "-source"))
+    except tk.TclError as err:
+        write(tcl, "ERROR: " + str(err) + "\n")
+        return 1
+
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    """Run stand-in."""
+    tcl = tk.Tcl()
+    tcl.eval(UNKNOWN)
+    tcl.call("set", "argv", ())
+    tcl.call("set", "argc", 0)
+
+    if option(argv, "-mode", "gui") == "batch":
+        return run_batch_mode(tcl, argv)
+
+    return run_tcl_mode(tcl)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -10,23 +10,95 @@ import sublime
 import sublime_plugin
 
 try:
+    from Automatons.src.commands.artifact_cache import ClearArtifactCacheCommand
+    from Automatons.src.commands.background import CancelBackgroundTasksCommand, stop_background_tasks
+    from Automatons.src.commands.build_history import ShowBuildRegressionsCommand
+    from Automatons.src.commands.bulk_gen import GenerateFromSpecCommand
     from Automatons.src.commands.create_struct_project import CreateStructProjectCommand
     from Automatons.src.commands.delete_struct_project import DeleteStructProjectCommand
+    from Automatons.src.commands.deps import ShowAffectedSourcesCommand
+    from Automatons.src.commands.impl_sweep import RunImplSweepCommand
+    from Automatons.src.commands.report_trend import ShowReportTrendCommand
+    from Automatons.src.commands.run_build import RunBuildCommand
+    from Automatons.src.commands.symbols import GotoHdlModuleCommand, HdlCompletionListener, close_symbol_indexes
+    from Automatons.src.commands.tb_gen import GenerateMissingTbsCommand, GenerateTbCommand
     from Automatons.src.commands.update_src import UpdateSrcCommand
+    from Automatons.src.commands.vivado_log import ShowVivadoLogCommand, ShowVivadoLogRegionCommand
+    from Automatons.src.commands.vivado_server import VivadoServerBuildCommand, stop_vivado_servers
+    from Automatons.src.commands.watch_src import (
+        SrcWatcherListener,
+        ToggleSrcWatcherCommand,
+        start_src_watchers,
+        stop_src_watchers,
+    )
     from Automatons.src.lib.gen_template import (
         SrcTemplate,
         TbTemplate,
     )
 except ImportError:
+    from src.commands.artifact_cache import ClearArtifactCacheCommand
+    from src.commands.background import CancelBackgroundTasksCommand, stop_background_tasks
+    from src.commands.build_history import ShowBuildRegressionsCommand
+    from src.commands.bulk_gen import GenerateFromSpecCommand
     from src.commands.create_struct_project import CreateStructProjectCommand
     from src.commands.delete_struct_project import DeleteStructProjectCommand
+    from src.commands.deps import ShowAffectedSourcesCommand
+    from src.commands.impl_sweep import RunImplSweepCommand
+    from src.commands.report_trend import ShowReportTrendCommand
+    from src.commands.run_build import RunBuildCommand
+    from src.commands.symbols import GotoHdlModuleCommand, HdlCompletionListener, close_symbol_indexes
+    from src.commands.tb_gen import GenerateMissingTbsCommand, GenerateTbCommand
     from src.commands.update_src import UpdateSrcCommand
+    from src.commands.vivado_log import ShowVivadoLogCommand, ShowVivadoLogRegionCommand
+    from src.commands.vivado_server import VivadoServerBuildCommand, stop_vivado_servers
+    from src.commands.watch_src import (
+        SrcWatcherListener,
+        ToggleSrcWatcherCommand,
+        start_src_watchers,
+        stop_src_watchers,
+    )
     from src.lib.gen_template import (
         SrcTemplate,
         TbTemplate,
     )
 
-__all__ = ["CreateStructProjectCommand", "DeleteStructProjectCommand", "UpdateSrcCommand"]
+__all__ = [
+    "CancelBackgroundTasksCommand",
+    "ClearArtifactCacheCommand",
+    "CreateStructProjectCommand",
+    "DeleteStructProjectCommand",
+    "GenerateFromSpecCommand",
+    "GenerateMissingTbsCommand",
+    "GenerateTbCommand",
+    "GotoHdlModuleCommand",
+    "HdlCompletionListener",
+    "RunBuildCommand",
+    "RunImplSweepCommand",
+    "ShowAffectedSourcesCommand",
+    "ShowBuildRegressionsCommand",
+    "ShowReportTrendCommand",
+    "ShowVivadoLogCommand",
+    "ShowVivadoLogRegionCommand",
+    "SrcWatcherListener",
+    "ToggleSrcWatcherCommand",
+    "UpdateSrcCommand",
+    "VivadoServerBuildCommand",
+    "plugin_loaded",
+    "plugin_unloaded",
+]
+
+
+def plugin_loaded() -> None:
+    """Plugin is loaded by Sublime Text."""
+    start_src_watchers()
+
+
+def plugin_unloaded() -> None:
+    """Plugin is unloaded by Sublime Text."""
+    stop_src_watchers()
+    stop_vivado_servers()
+    close_symbol_indexes()
+    stop_background_tasks()
 
 
 class SrcTemplateCommand(sublime_plugin.TextCommand):